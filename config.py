@@ -88,6 +88,9 @@ class Config:
     DEBUG_LOG_HEIGHT = 12
     PROCESSING_LOG_HEIGHT = 6
     
+    # Set to False to drop [DEBUG] messages (and skip building them) during long runs
+    DEBUG_LOGGING = True
+    
     # File Types
     SUPPORTED_AUDIO_EXTENSIONS = [".mp3", ".flac", ".m4a", ".mp4", ".wma", ".ogg", ".wav"]
     FILE_TYPE_DESCRIPTION = "Audio Files"
@@ -173,6 +176,19 @@ class Config:
         }
     }
 
+    # Folder Scanning
+    FILE_SCAN = {
+        "PARALLEL_WALK": False,  # Read folders on a thread pool (mostly helps slow or network drives)
+        "SEEK_ORDERED_WALK": False,  # Visit folders in inode order (hard drives only; overrides PARALLEL_WALK)
+        "MAX_WORKERS": min(32, (os.cpu_count() or 1) * 4)
+    }
+
+    # Persistent tag cache (keyed by path, size and modification time)
+    METADATA_CACHE_FILE = _USER_DATA_ROOT / "metadata_cache.sqlite"
+
+    # Downloaded cover art, one file per image URL (named by the URL's SHA-256)
+    COVER_CACHE_DIR = _USER_DATA_ROOT / "cover_cache"
+
     # Folder Structure Settings
     FOLDER_STRUCTURE = {
         "DEFAULT_FORMAT": DEFAULT_FOLDER_FORMAT,
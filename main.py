@@ -1,6 +1,7 @@
 from tkinter import filedialog, ttk, StringVar, IntVar, font, BooleanVar, messagebox
 import os
-import shutil
+import re
+import json
 import mutagen
 import requests
 import tkinter as tk
@@ -8,24 +9,30 @@ import subprocess
 import platform
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import Config, folder_format, DEFAULT_FOLDER_FORMAT
-from utils.logging import logger, log_message, autohide_scrollbar
+from utils.logging import logger, log_message, batched_logging, autohide_scrollbar
 from utils.file_operations import (resource_path, select_files as file_ops_select_files, 
                                  select_folder as file_ops_select_folder, handle_drop as file_ops_handle_drop, 
-                                 get_audio_file, sanitize_filename)
+                                 get_audio_file, sanitize_filename, save_audio_file, iter_audio_files,
+                                 move_files_to_destinations, cancel_file_scan, clear_mkdir_cache)
 from utils.image_handling import (copy_image_to_clipboard, 
                                 load_default_album_art as image_load_default_album_art,
                                 update_album_art_display as image_update_album_art_display,
                                 paste_image_from_clipboard as image_paste_from_clipboard,
-                                extract_album_art_from_file)
+                                load_audio_and_art, sniff_image_mime)
 from utils.metadata import (
-    get_tag_value, set_tag_value,
+    get_tag_value, set_tags_bulk,
     fetch_metadata as metadata_fetch_metadata, update_album_metadata,
-    album_catalog_cache, cache_lock, update_mp3_metadata as metadata_update_mp3_metadata
+    album_catalog_cache, cache_lock, update_mp3_metadata as metadata_update_mp3_metadata,
+    wait_for_pending_writes, existing_cover_matches, clear_cover_cache,
+    schedule_cover_download, _MP4_COVER_FORMATS
 )
-from services.api_client import save_api_key
-import hashlib
+from services.api_client import (save_api_key, update_api_progress as api_update_progress,
+                                 enforce_api_limit as api_enforce_limit,
+                                 update_rate_limits_from_headers as api_update_rate_limits)
 from ui.dialogs import show_folder_format_dialog, show_move_confirmation_dialog
+from utils.metadata_store import metadata_store, read_file_metadata, CACHED_TAGS
 from utils.table_operations import (
     auto_adjust_column_widths, 
     treeview_sort_column, 
@@ -33,6 +40,7 @@ from utils.table_operations import (
     file_table_selection_callback,
     update_table as table_ops_update_table,  # This matches the actual function name
     apply_filter as table_apply_filter,
+    insert_file_rows as table_insert_file_rows,
     remove_selected_items as table_ops_remove_items  # Add this import
 )
 from ui.styles import (configure_styles, style_button, style_label, style_checkbutton, configure_context_menu,
@@ -50,6 +58,9 @@ file_metadata_cache = {}  # Cache for file metadata
 # Track selected folders for refresh functionality
 selected_folders = set()  # Store paths of selected folders
 
+# Precomputed once so extension checks don't rebuild the tuple per file
+SUPPORTED_EXTENSIONS_TUPLE = tuple(Config.SUPPORTED_AUDIO_EXTENSIONS)
+
 # Sorting variables
 sort_column = None  # Track which column we're sorting by
 sort_reverse = False  # Track sort direction
@@ -248,7 +259,14 @@ for button_text, command in [
         updated_files=updated_files,
         selected_folders_var=selected_folders,
         supported_extensions=Config.SUPPORTED_AUDIO_EXTENSIONS,
-        count_var=file_count_var
+        count_var=file_count_var,
+        stream_callbacks={
+            'schedule': app.after,
+            'prepare_file': prefetch_file_metadata,
+            'store_prepared': store_file_metadata,
+            'append_rows': append_scanned_rows,
+            'finish': finish_folder_scan
+        }
     )),
     ("LEAVE", app.quit)
 ]:
@@ -422,7 +440,7 @@ def copy_album_art_to_clipboard():
                 
             # If multiple items are selected, verify they all have the same album art
             if len(selected_items) > 1:
-                art_hashes = set()
+                first_art = None
                 for item in selected_items:
                     # Get the file path from the values array
                     values = file_table.item(item)['values']
@@ -440,19 +458,19 @@ def copy_album_art_to_clipboard():
                         continue
                     
                     # Only process audio files
-                    ext = os.path.splitext(file_path)[1].lower()
-                    if ext in ['.mp3', '.flac', '.m4a', '.mp4', '.ogg', '.wma', '.wav']:
-                                audio = get_audio_file(file_path)
-                                if audio:
-                                    art_data = extract_album_art_from_file(file_path, audio)
+                    art_data = None
+                    if file_path.lower().endswith(SUPPORTED_EXTENSIONS_TUPLE):
+                        art_data = load_audio_and_art(file_path)[1]
                     if art_data:
-                        art_hash = hashlib.md5(art_data).hexdigest()
-                        art_hashes.add(art_hash)
+                        # Direct bytes comparison: bails out on the length check or
+                        # the first differing byte, no need to hash whole images
+                        if first_art is None:
+                            first_art = art_data
+                        elif art_data != first_art:
+                            log_message("[COVER] Selected files have different album art", log_type="processing")
+                            return
                                         
-                if len(art_hashes) > 1:
-                    log_message("[COVER] Selected files have different album art", log_type="processing")
-                    return
-                elif len(art_hashes) == 0:
+                if first_art is None:
                     log_message("[COVER] No album art found in selected files", log_type="processing")
                     return
             
@@ -474,13 +492,11 @@ def copy_album_art_to_clipboard():
                 
             # Check if the file is a supported audio format
             ext = os.path.splitext(file_path)[1].lower()
-            if ext not in ['.mp3', '.flac', '.m4a', '.mp4', '.ogg', '.wma', '.wav']:
+            if ext not in SUPPORTED_EXTENSIONS_TUPLE:
                 log_message(f"[COVER] File type not supported for album art: {ext}", log_type="processing")
                 return
             
-            audio = get_audio_file(file_path)
-            if audio:
-                image_data = extract_album_art_from_file(file_path, audio)
+            image_data = load_audio_and_art(file_path)[1]
         
         if not image_data:
             log_message("[COVER] No album art to copy", log_type="processing")
@@ -577,6 +593,7 @@ table_container = ttk.Frame(middle_frame)
 table_container.pack(fill="both", expand=True)
 
 columns = ("Artist", "Title", "Album", "Catalog Number", "Album Artist", "Year", "Track", "Genre", "File Path")
+COL_INDEX = {name: i for i, name in enumerate(columns)}  # Column name -> position in a row's values
 
 # Create a frame with a border for the table
 table_border_frame = ttk.Frame(table_container, relief="solid", borderwidth=1)  # Use ttk.Frame with system border style
@@ -828,17 +845,14 @@ def update_api_progress(state=None, verbose=False):  # Changed default to False
         verbose: Whether to output detailed debug messages
     """
     # Use the imported function but pass our local update_progress_bar as the callback
-    from services.api_client import update_api_progress as api_progress
-    api_progress(state, verbose, update_progress_bar)
+    api_update_progress(state, verbose, update_progress_bar)
 
 def enforce_api_limit():
     """Wrapper for API client's enforce_api_limit function."""
-    from services.api_client import enforce_api_limit as api_enforce_limit
     return api_enforce_limit(app.update)
 
 def update_rate_limits_from_headers(headers, update_progress=True, verbose=False):
     """Wrapper for API client's update_rate_limits_from_headers function."""
-    from services.api_client import update_rate_limits_from_headers as api_update_rate_limits
     return api_update_rate_limits(headers, update_progress, verbose, update_progress_bar)
 
 def update_file_metadata(file_path, metadata):
@@ -862,7 +876,81 @@ def update_file_metadata(file_path, metadata):
         metadata['api_token'] = DISCOGS_API_TOKEN
     
     # Call the utility function
-    return update_album_metadata(file_path, metadata, options=options, callbacks=callbacks)
+    result = update_album_metadata(file_path, metadata, options=options, callbacks=callbacks)
+    if result:
+        mirror_written_tags(file_path, metadata)
+    return result
+
+def mirror_written_tags(file_path, metadata):
+    """Mirror the written tags in the cache so later exports can skip re-reading the file."""
+    cached = file_metadata_cache.get(file_path)
+    if cached is None:
+        return
+    if save_catalog_var.get() and metadata.get("catalog_number"):
+        cached["catalognumber"] = metadata["catalog_number"]
+    if save_year_var.get() and metadata.get("year"):
+        cached["date"] = str(metadata["year"])
+
+def _metadata_match_key(artist, title, album, albumartist):
+    """Normalize the four identifying fields into a hashable lookup key."""
+    return (str(artist).strip(), str(title).strip(), str(album).strip(), str(albumartist).strip())
+
+def build_metadata_index():
+    """Build a reverse index from cached metadata to file paths.
+    
+    Returns:
+        dict: (artist, title, album, albumartist) key -> list of file paths
+    """
+    index = {}
+    for file_path, metadata in file_metadata_cache.items():
+        key = _metadata_match_key(
+            metadata.get("artist", ""),
+            metadata.get("title", ""),
+            metadata.get("album", ""),
+            metadata.get("albumartist", "")
+        )
+        index.setdefault(key, []).append(file_path)
+    return index
+
+def _field_matches(cached, row):
+    """Compare two pre-stripped field values, accepting numerically equal ones (e.g. '07' vs '7')."""
+    if cached == row:
+        return True
+    if not cached or not row:
+        return False
+    try:
+        return float(cached) == float(row)
+    except ValueError:
+        return False
+
+def _scan_index_numeric(row_key, metadata_index):
+    """Slow path: find an index entry matching row_key field by field, numerically if needed."""
+    row_artist, row_title, row_album, row_albumartist = row_key
+    for (artist, title, album, albumartist), paths in metadata_index.items():
+        # Keys are stripped once when the index is built, so this is four direct comparisons
+        if (_field_matches(artist, row_artist) and _field_matches(title, row_title)
+                and _field_matches(album, row_album) and _field_matches(albumartist, row_albumartist)):
+            return paths[0]
+    return None
+
+def find_matching_file(values, metadata_index):
+    """Find the cached file behind a table row.
+    
+    Args:
+        values: Table row values
+        metadata_index: Index returned by build_metadata_index()
+        
+    Returns:
+        str: Matching file path, or None if no cached file matches
+    """
+    row_key = _metadata_match_key(values[0], values[1], values[2], values[4])  # Artist, Title, Album, Album Artist
+    candidates = metadata_index.get(row_key)
+    if candidates:
+        # Prefer the row's own path when several files share the same tags
+        if len(candidates) > 1 and len(values) >= 9 and values[8] in candidates:
+            return values[8]
+        return candidates[0]
+    return _scan_index_numeric(row_key, metadata_index)
 
 def stop_processing_files():
     """Stop the file processing thread if it's running."""
@@ -898,34 +986,28 @@ def process_files():
     
     # First, collect all file paths from selected items
     selected_files = []
-    for item in selected_items:
-        values = file_table.item(item)['values']
+    path_to_item = {}  # File path -> table item, used to tag rows as they are processed
+    _item = file_table.item
+    selected_rows = [(item, _item(item, 'values')) for item in selected_items]
+    for item, values in selected_rows:
         if len(values) >= 9:  # Ensure there's a file path
             file_path = values[8]  # File path is in position 8
             if file_path and os.path.exists(file_path):
                 selected_files.append(file_path)
+                path_to_item[file_path] = item
                 
-                # Build the cache directly from files
-                audio = get_audio_file(file_path)
-                if audio:
-                    file_metadata_cache[file_path] = {
-                        "artist": get_tag_value(audio, "artist"),
-                        "title": get_tag_value(audio, "title"),
-                        "album": get_tag_value(audio, "album"),
-                        "albumartist": get_tag_value(audio, "albumartist")
-                    }
+                # Build the cache from the persistent store, reading files only on a miss
+                metadata = read_file_metadata(file_path, CACHED_TAGS, get_audio_file, get_tag_value)
+                if metadata:
+                    file_metadata_cache[file_path] = metadata
     
     # Also cache remaining files that aren't selected
     for file_path in file_list:
         if file_path not in selected_files and os.path.exists(file_path):
-            audio = get_audio_file(file_path)
-            if audio:
-                file_metadata_cache[file_path] = {
-                    "artist": get_tag_value(audio, "artist"),
-                    "title": get_tag_value(audio, "title"),
-                    "album": get_tag_value(audio, "album"),
-                    "albumartist": get_tag_value(audio, "albumartist")
-                }
+            metadata = read_file_metadata(file_path, CACHED_TAGS, get_audio_file, get_tag_value)
+            if metadata:
+                file_metadata_cache[file_path] = metadata
+    metadata_store.commit()
     
     # Thread-safe access to unprocessed files
     with processed_lock:
@@ -967,143 +1049,178 @@ def process_files():
     total_files = len(unprocessed_files)
     processed_so_far = 0
     
-    for album_key, album_files in album_groups.items():
-        if stop_processing:
-            log_message("[INFO] Processing stopped by user.", log_type="processing")
-            update_progress_bar(0, "file")  # Reset progress bar
-            return
-            
-        # Get metadata for the first file to use as reference
-        first_file = album_files[0]
-        metadata = file_metadata_cache.get(first_file)
-        
-        artist = metadata.get("artist", "")
-        title = metadata.get("title", "")
-        album = metadata.get("album", "")
-        albumartist = metadata.get("albumartist", "")
-        
-        log_message(f"[INFO] Processing album: {album} by {artist or albumartist}", log_type="debug")
-        
-        # Check if we already have cached metadata for this album
-        cached_metadata = None
-        cache_key = album_key  # Use the same key we created for grouping
-        
-        with cache_lock:
-            if cache_key in album_catalog_cache:
-                cached_metadata = album_catalog_cache[cache_key]
-                log_message(f"[INFO] Using cached metadata for '{artist} - {album}'", log_type="debug")
-        
-        # If we don't have cached metadata, fetch it now
-        if not cached_metadata:
-            log_message(f"[INFO] No cached metadata found for '{artist} - {album}' - Making API call", log_type="debug")
-            
-            # Only enforce API limits and update progress if we're actually making an API call
-            if not enforce_api_limit():
-                log_message("[WARNING] API rate limit reached. Pausing processing.", log_type="processing")
-                break
-                
-            # Update API progress before call
-            update_api_progress("start", verbose=False)
-            
-            # Make the actual API call to fetch metadata
-            metadata_result = metadata_fetch_metadata(artist, album, title, api_token=DISCOGS_API_TOKEN, search_url=Config.DISCOGS_SEARCH_URL)
-            
-            # Handle the new return format (metadata, headers)
-            if isinstance(metadata_result, tuple):
-                cached_metadata, response_headers = metadata_result
-                # Update rate limits from the headers if available
-                if response_headers:
-                    update_rate_limits_from_headers(response_headers, update_progress=True, verbose=False)
-            else:
-                # Backwards compatibility with older versions
-                cached_metadata = metadata_result
-                # In this case, we still need to update the API progress manually
-                update_api_progress("complete", verbose=False)
-            
-            # Store in cache for future use including other files in the same album
-            if cached_metadata:
-                with cache_lock:
-                    album_catalog_cache[cache_key] = cached_metadata
-                    log_message(f"[INFO] Cached metadata for '{artist} - {album}'", log_type="debug")
-        
-        # Now process all files in this album group using the cached metadata
+    # Per-run release lookups keyed by normalized (artist, album); release data
+    # is identical for every track, and misses are remembered too so a failed
+    # album is not searched again for another group during this run
+    release_cache = {}
+    
+    # Bind hot lookups to locals for the per-file loop
+    _normpath = os.path.normpath
+    _cache_get = file_metadata_cache.get
+    _processed_add = processed_files.add
+    _log = log_message
+    _update = update_file_metadata
+    _update_idletasks = app.update_idletasks
+    _set_item = file_table.item
+    
+    def write_album(album_files, cached_metadata):
+        """Write an album's resolved metadata to its files; returns False if stopped."""
+        global processed_count
+        nonlocal processed_so_far
         for file_path in album_files:
             if stop_processing:
                 log_message("[INFO] Processing stopped by user.", log_type="processing")
                 update_progress_bar(0, "file")  # Reset progress bar
-                return
-                
+                return False
+            
             # Update progress bar
             processed_so_far += 1
             progress = int((processed_so_far / total_files) * 100)
             update_progress_bar(progress, "file")
-            app.update_idletasks()  # Update UI without blocking
-            
+            _update_idletasks()  # Update UI without blocking
+        
             # Use cached metadata to update the file
+            file_updated = False
+            save_queued = False
             if cached_metadata:
                 # Update all selected metadata in one go
-                if update_file_metadata(file_path, cached_metadata):
+                file_updated = _update(file_path, cached_metadata)
+                save_queued = file_updated is None
+                if save_queued:
+                    # Reported once the background writer has saved it
+                    queued_files.append((file_path, cached_metadata))
+                elif file_updated:
                     # Get current file's metadata for logging
-                    current_metadata = file_metadata_cache.get(file_path, {})
+                    current_metadata = _cache_get(file_path, {})
                     current_artist = current_metadata.get("artist", "Unknown Artist")
                     current_title = current_metadata.get("title", "Unknown Title")
                     current_album = current_metadata.get("album", "Unknown Album")
-                    
+                
                     # Use log_message function for consistency
-                    log_message(f"[OK] {current_artist} - {current_title} [{current_album}]", log_type="processing")
+                    _log(f"[OK] {current_artist} - {current_title} [{current_album}]", log_type="processing")
                 else:
                     # Use log_message function for consistency
-                    log_message(f"[NOK] {os.path.basename(file_path)}", log_type="processing")
-            
+                    _log(f"[NOK] {os.path.basename(file_path)}", log_type="processing")
+        
             # Thread-safe update of processed files
+            normalized_path = _normpath(file_path)
             with processed_lock:
-                processed_files.add(os.path.normpath(file_path))
+                _processed_add(normalized_path)
                 processed_count += 1
+        
+            # Tag the row right away (tags are configured once in configure_table_tags)
+            item_iid = path_to_item.get(file_path)
+            if item_iid and not save_queued:
+                _set_item(item_iid, tags=("updated",) if file_updated else ("failed",))
+        
+        return True
     
-    # Update visual state using cached metadata
-    for item in file_table.get_children():
-        values = file_table.item(item)['values']
-        table_metadata = [values[0], values[1], values[2], values[4]]  # Artist, Title, Album, Album Artist
+    def report_queued_files():
+        """Wait for the queued cover saves, then log and tag their rows."""
+        if not queued_files:
+            return
+        wait_for_pending_writes()
+        for file_path, cached_metadata in queued_files:
+            saved = _normpath(file_path) in updated_files  # Added by the writer's on_saved
+            if saved:
+                mirror_written_tags(file_path, cached_metadata)
+                current_metadata = _cache_get(file_path, {})
+                _log(f"[OK] {current_metadata.get('artist', 'Unknown Artist')} - "
+                     f"{current_metadata.get('title', 'Unknown Title')} "
+                     f"[{current_metadata.get('album', 'Unknown Album')}]", log_type="processing")
+            else:
+                _log(f"[NOK] {os.path.basename(file_path)}", log_type="processing")
+            item_iid = path_to_item.get(file_path)
+            if item_iid:
+                _set_item(item_iid, tags=("updated",) if saved else ("failed",))
+        queued_files.clear()
+    
+    queued_files = []  # (file path, release) whose save is still on the background writer
+    with batched_logging():
+        pending_album = None  # Resolved album whose files are written on the next pass
+        for album_key, album_files in album_groups.items():
+            if stop_processing:
+                log_message("[INFO] Processing stopped by user.", log_type="processing")
+                update_progress_bar(0, "file")  # Reset progress bar
+                report_queued_files()
+                return
+            
+            # Get metadata for the first file to use as reference
+            first_file = album_files[0]
+            metadata = file_metadata_cache.get(first_file)
+        
+            artist = metadata.get("artist", "")
+            title = metadata.get("title", "")
+            album = metadata.get("album", "")
+            albumartist = metadata.get("albumartist", "")
+        
+            log_message(f"[INFO] Processing album: {album} by {artist or albumartist}", log_type="debug")
+        
+            # Check if we already have cached metadata for this album
+            cached_metadata = None
+            cache_key = album_key  # Use the same key we created for grouping
         
-        # Find matching file using cached metadata - with improved numeric matching
-        for file_path, metadata in file_metadata_cache.items():
-            current_metadata = [
-                metadata.get("artist", ""),
-                metadata.get("title", ""),
-                metadata.get("album", ""),
-                metadata.get("albumartist", "")
-            ]
+            release_key = (artist.lower().strip(), album.lower().strip())
+            fetched_this_run = release_key in release_cache
+        
+            cached_metadata = album_catalog_cache.get(cache_key)  # Lock-free read; writes hold cache_lock
+            if cached_metadata is not None:
+                log_message(f"[INFO] Using cached metadata for '{artist} - {album}'", log_type="debug")
+        
+            if not cached_metadata and fetched_this_run:
+                cached_metadata = release_cache[release_key]
+                log_message(f"[INFO] Reusing release lookup from this run for '{artist} - {album}'", log_type="debug")
+        
+            # If we don't have cached metadata, fetch it now
+            if not cached_metadata and not fetched_this_run:
+                log_message(f"[INFO] No cached metadata found for '{artist} - {album}' - Making API call", log_type="debug")
             
-            # Check if all values match, with special handling for numeric values
-            is_match = True
-            for a, b in zip(current_metadata, table_metadata):
-                a_str = str(a).strip()
-                b_str = str(b).strip()
-                
-                # If strings are equal, they match
-                if a_str == b_str:
-                    continue
+                # Only enforce API limits and update progress if we're actually making an API call
+                if not enforce_api_limit():
+                    log_message("[WARNING] API rate limit reached. Pausing processing.", log_type="processing")
+                    break
                 
-                # Try numeric comparison if both can be converted to numbers
-                try:
-                    if a_str and b_str and float(a_str) == float(b_str):
-                        continue
-                except ValueError:
-                    pass
-                
-                # If we reach here, values don't match
-                is_match = False
-                break
+                # Update API progress before call
+                update_api_progress("start", verbose=False)
+            
+                # Make the actual API call to fetch metadata
+                metadata_result = metadata_fetch_metadata(artist, album, title, api_token=DISCOGS_API_TOKEN, search_url=Config.DISCOGS_SEARCH_URL)
+            
+                # Handle the new return format (metadata, headers)
+                if isinstance(metadata_result, tuple):
+                    cached_metadata, response_headers = metadata_result
+                    # Update rate limits from the headers if available
+                    if response_headers:
+                        update_rate_limits_from_headers(response_headers, update_progress=True, verbose=False)
+                else:
+                    # Backwards compatibility with older versions
+                    cached_metadata = metadata_result
+                    # In this case, we still need to update the API progress manually
+                    update_api_progress("complete", verbose=False)
+            
+                release_cache[release_key] = cached_metadata
             
-            if is_match:
-                normalized_path = os.path.normpath(file_path)
-                if normalized_path in updated_files:
-                    file_table.tag_configure("updated", background=Config.COLORS["UPDATED_ROW"])
-                    file_table.item(item, tags=("updated",))
-                elif normalized_path in processed_files:
-                    file_table.tag_configure("failed", background=Config.COLORS["FAILED_ROW"])
-                    file_table.item(item, tags=("failed",))
-                break
+                # Store in cache for future use including other files in the same album
+                if cached_metadata:
+                    with cache_lock:
+                        album_catalog_cache[cache_key] = cached_metadata
+                    log_message(f"[INFO] Cached metadata for '{artist} - {album}'", log_type="debug")
+        
+            # Start this album's cover download, then write the previous album
+            # while it runs: the network and the disk work overlap, and at most
+            # one album's metadata is held ahead of its writes
+            if cached_metadata and save_art_var.get():
+                cover_url = cached_metadata.get("cover_image") or cached_metadata.get("thumb")
+                if cover_url:
+                    schedule_cover_download(cover_url, DISCOGS_API_TOKEN)
+            if pending_album and not write_album(*pending_album):
+                report_queued_files()
+                return
+            pending_album = (album_files, cached_metadata)
+        
+        if pending_album:
+            write_album(*pending_album)
+        report_queued_files()
     
     log_message("[DEBUG] Finished processing selected files.", log_type="debug")
 
@@ -1217,6 +1334,9 @@ def finish_editing(event):
     
     if not editing_entry or not editing_item or not editing_column:
         return
+    
+    # A queued cover save may still be writing the file this edit rewrites
+    wait_for_pending_writes()
         
     # Get the new value and ensure it's a clean string
     try:
@@ -1230,8 +1350,8 @@ def finish_editing(event):
     # Get the current values BEFORE updating them
     try:
         current_values = list(file_table.item(editing_item)['values'])
-        # Store original metadata for matching BEFORE updating the value
-        original_metadata = [current_values[0], current_values[1], current_values[2], current_values[4]]  # Artist, Title, Album, Album Artist
+        # Store original values for matching BEFORE updating the value
+        original_values = tuple(current_values)
         
         # Now update the value in the table
         current_values[column_num] = new_value
@@ -1241,53 +1361,14 @@ def finish_editing(event):
         return
     
     # Find matching file using the ORIGINAL metadata - with improved numeric matching
-    matching_file = None
-    for file_path, metadata in file_metadata_cache.items():
-        current_metadata = [
-            metadata.get("artist", ""),
-            metadata.get("title", ""),
-            metadata.get("album", ""),
-            metadata.get("albumartist", "")
-        ]
-        
-        # Check if all values match, with special handling for numeric values
-        is_match = True
-        for a, b in zip(current_metadata, original_metadata):
-            a_str = str(a).strip()
-            b_str = str(b).strip()
-            
-            # If strings are equal, they match
-            if a_str == b_str:
-                continue
-            
-            # Try numeric comparison if both can be converted to numbers
-            try:
-                if a_str and b_str and float(a_str) == float(b_str):
-                    continue
-            except ValueError:
-                pass
-            
-            # If we reach here, values don't match
-            is_match = False
-            break
-        
-        if is_match:
-            matching_file = file_path
-            break
+    matching_file = find_matching_file(original_values, build_metadata_index())
     
     if matching_file:
         # Update the MP3 file
         update_mp3_metadata(matching_file, column_num, new_value)
         # Update the cache with the new value
-        if matching_file in file_metadata_cache:
-            if column_num == 0:  # Artist
-                file_metadata_cache[matching_file]["artist"] = new_value
-            elif column_num == 1:  # Title
-                file_metadata_cache[matching_file]["title"] = new_value
-            elif column_num == 2:  # Album
-                file_metadata_cache[matching_file]["album"] = new_value
-            elif column_num == 4:  # Album Artist
-                file_metadata_cache[matching_file]["albumartist"] = new_value
+        if matching_file in file_metadata_cache and column_num < len(CACHED_TAGS):
+            file_metadata_cache[matching_file][CACHED_TAGS[column_num]] = new_value
     else:
         log_message("[ERROR] Could not find matching file to update metadata")
     
@@ -1326,10 +1407,24 @@ def remove_selected_items():
     # Force UI update
     app.update_idletasks()
 
+def _scan_audio_files_recursive(folder):
+    """Recursively collect supported audio files below a folder using os.scandir.
+    
+    Args:
+        folder: Root folder to scan
+        
+    Returns:
+        list: Paths of all supported audio files found
+    """
+    return list(iter_audio_files(folder, SUPPORTED_EXTENSIONS_TUPLE))
+
 def refresh_file_list():
     """Refresh the file list by re-scanning selected folders and keeping individual files."""
     global file_list, processed_files, updated_files, file_metadata_cache
     
+    # The re-scan below replaces the list, so a streamed scan still running must stop
+    cancel_file_scan()
+    
     log_message(f"[DEBUG] Starting refresh. Current selected folders: {list(selected_folders)}")
     log_message(f"[DEBUG] Current file list has {len(file_list)} files")
     
@@ -1361,22 +1456,19 @@ def refresh_file_list():
             # Only scan the selected folder itself, not recursively through subfolders
             # This prevents loading the entire collection when refreshing a subfolder
             try:
-                files_in_folder = os.listdir(folder)
                 new_files = []
-                for file in files_in_folder:
-                    file_path = os.path.join(folder, file)
-                    if os.path.isfile(file_path) and file.lower().endswith(tuple(Config.SUPPORTED_AUDIO_EXTENSIONS)):
-                        new_files.append(file_path)
-                    elif os.path.isdir(file_path):
-                        # If it's a subdirectory, only scan it if it was explicitly selected
-                        # This maintains the current behavior for explicitly selected subfolders
-                        if file_path in selected_folders:
-                            log_message(f"[DEBUG] Found explicitly selected subfolder: {file_path}")
-                            subfolder_files = [os.path.join(root, f) 
-                                            for root, _, files in os.walk(file_path) 
-                                            for f in files if f.lower().endswith(tuple(Config.SUPPORTED_AUDIO_EXTENSIONS))]
-                            new_files.extend(subfolder_files)
-                            log_message(f"[DEBUG] Added {len(subfolder_files)} files from subfolder")
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS_TUPLE):
+                            new_files.append(entry.path)
+                        elif entry.is_dir():
+                            # If it's a subdirectory, only scan it if it was explicitly selected
+                            # This maintains the current behavior for explicitly selected subfolders
+                            if entry.path in selected_folders:
+                                log_message(f"[DEBUG] Found explicitly selected subfolder: {entry.path}")
+                                subfolder_files = _scan_audio_files_recursive(entry.path)
+                                new_files.extend(subfolder_files)
+                                log_message(f"[DEBUG] Added {len(subfolder_files)} files from subfolder")
                 folder_files.extend(new_files)
                 log_message(f"[DEBUG] Added {len(new_files)} files from folder {folder}")
             except PermissionError:
@@ -1389,20 +1481,8 @@ def refresh_file_list():
     log_message(f"[DEBUG] Total folder files found: {len(folder_files)}")
     
     # Create new file list while preserving order and removing duplicates
-    seen = set()
-    new_file_list = []
-    
-    # First add individual files while preserving their order
-    for f in individual_files:
-        if f not in seen:
-            seen.add(f)
-            new_file_list.append(f)
-    
-    # Then add folder files while preserving their order
-    for f in folder_files:
-        if f not in seen:
-            seen.add(f)
-            new_file_list.append(f)
+    # (individual files first, then folder files)
+    new_file_list = list(dict.fromkeys(individual_files + folder_files))
     
     log_message(f"[DEBUG] New file list created with {len(new_file_list)} files (removed {len(folder_files) + len(individual_files) - len(new_file_list)} duplicates)")
     
@@ -1462,6 +1542,10 @@ def update_basic_fields(event=None):
         current_album_art_bytes = None
         return
     
+    # Read each selected row's values once; both passes below reuse them
+    _item = file_table.item
+    selected_values = [_item(item, 'values') for item in selected_items]
+    
     # Get values for all selected items
     values_by_field = {field: [] for field in basic_field_vars.keys()}
     
@@ -1478,7 +1562,7 @@ def update_basic_fields(event=None):
         current_album_art = photo
         
         # Process metadata fields
-        process_metadata_fields(selected_items, values_by_field)
+        process_metadata_fields(selected_values, values_by_field)
         return
         
     # For album art, we need to check if all files have the same art
@@ -1488,9 +1572,11 @@ def update_basic_fields(event=None):
     
     log_message(f"[DEBUG] Checking album art for {len(selected_items)} selected items", log_type="debug")
     
+    # Bind hot lookups to locals for the selection loop
+    _load_audio_and_art = load_audio_and_art
+    
     # Check for album art in selected files
-    for item in selected_items:
-        values = file_table.item(item)['values']
+    for values in selected_values:
         
         # Check if the values array has enough elements
         if len(values) < 9:
@@ -1510,9 +1596,8 @@ def update_basic_fields(event=None):
         log_message(f"[DEBUG] Processing file for album art: {file_path}", log_type="debug")
             
         # Get album art
-        audio = get_audio_file(file_path)
+        audio, current_art = _load_audio_and_art(file_path)
         if audio:
-            current_art = extract_album_art_from_file(file_path, audio)
             if current_art:
                 log_message(f"[DEBUG] Found album art in file: {file_path} ({len(current_art)} bytes)", log_type="debug")
                 if not found_album_art:
@@ -1550,19 +1635,21 @@ def update_basic_fields(event=None):
         current_album_art_bytes = None
     
     # Process metadata fields
-    process_metadata_fields(selected_items, values_by_field)
+    process_metadata_fields(selected_values, values_by_field)
 
-def process_metadata_fields(selected_items, values_by_field):
-    """Process metadata fields for the selected items."""
+def process_metadata_fields(selected_values, values_by_field):
+    """Process metadata fields for the selected rows' table values."""
+    
+    _exists = os.path.exists
+    _get_audio = get_audio_file
     
     # Get the original values directly from file metadata instead of the table
-    for item in selected_items:
-        values = file_table.item(item)['values']
+    for values in selected_values:
         file_path = values[8]  # File path is the last column
         
-        if file_path and os.path.exists(file_path):
+        if file_path and _exists(file_path):
             # Get metadata directly from file instead of table values
-            audio = get_audio_file(file_path)
+            audio = _get_audio(file_path)
             if audio:
                 field_mapping = {
                     "Artist": get_tag_value(audio, "artist", ""),
@@ -1620,6 +1707,55 @@ def process_metadata_fields(selected_items, values_by_field):
             # Different values
             var.set("<different values>")
 
+def _remove_art_mp3(audio):
+    """Remove the APIC frames from an MP3; returns True if tags were touched."""
+    if audio.tags:
+        audio.tags.delall("APIC")
+        return True
+    return False
+
+def _remove_art_flac(audio):
+    """Remove the embedded pictures from a FLAC file."""
+    audio.clear_pictures()
+    return True
+
+def _remove_art_mp4(audio):
+    """Remove the 'covr' atom from an MP4 file if present."""
+    if "covr" in audio:
+        del audio["covr"]
+        return True
+    return False
+
+def _set_art_mp3(audio, apic):
+    """Replace an MP3's APIC frames with the given frame."""
+    if audio.tags:
+        audio.tags.delall("APIC")
+    else:
+        audio.tags = mutagen.id3.ID3()
+    audio.tags.add(apic)
+
+def _set_art_flac(audio, picture):
+    """Replace a FLAC file's pictures with the given picture."""
+    audio.clear_pictures()
+    audio.add_picture(picture)
+
+def _set_art_mp4(audio, cover):
+    """Replace an MP4 file's 'covr' atom with the given cover."""
+    audio['covr'] = [cover]
+
+# Album art handlers keyed by the exact mutagen type get_audio_file returns,
+# so each file needs a single dict lookup instead of a chain of isinstance checks
+_ART_REMOVERS = {
+    mutagen.mp3.MP3: _remove_art_mp3,
+    mutagen.flac.FLAC: _remove_art_flac,
+    mutagen.mp4.MP4: _remove_art_mp4,
+}
+_ART_SETTERS = {
+    mutagen.mp3.MP3: _set_art_mp3,
+    mutagen.flac.FLAC: _set_art_flac,
+    mutagen.mp4.MP4: _set_art_mp4,
+}
+
 def apply_basic_fields():
     """Apply metadata from basic fields to selected files."""
     global pending_album_art
@@ -1629,6 +1765,9 @@ def apply_basic_fields():
         log_message("[ERROR] No files selected for updating", log_type="processing")
         return
     
+    # Queued cover saves must finish before these files are read and saved again
+    wait_for_pending_writes()
+    
     # Get values from basic fields (strip to remove Excel paste artifacts like CR/LF)
     new_metadata = {field: str(var.get()).strip() for field, var in basic_field_vars.items()}
     
@@ -1651,179 +1790,169 @@ def apply_basic_fields():
         "Genre": "genre"
     }
     
+    # The pending art is the same for every file, so build its per-format
+    # payloads (ID3 frame, FLAC picture, MP4 cover) once up front
+    if isinstance(pending_album_art, bytes):
+        art_mime_type = sniff_image_mime(pending_album_art)
+        art_apic = mutagen.id3.APIC(
+            encoding=3,  # UTF-8
+            mime=art_mime_type,
+            type=3,  # Front cover
+            desc='Front Cover',
+            data=pending_album_art
+        )
+        art_flac_picture = mutagen.flac.Picture()
+        art_flac_picture.type = 3  # Front cover
+        art_flac_picture.mime = art_mime_type
+        art_flac_picture.desc = 'Front Cover'
+        art_flac_picture.data = pending_album_art
+        art_mp4_cover = mutagen.mp4.MP4Cover(
+            pending_album_art,
+            _MP4_COVER_FORMATS.get(art_mime_type, mutagen.mp4.MP4Cover.FORMAT_JPEG)
+        )
+        art_payloads = {
+            mutagen.mp3.MP3: art_apic,
+            mutagen.flac.FLAC: art_flac_picture,
+            mutagen.mp4.MP4: art_mp4_cover,
+        }
+    
     # Process each selected item
     updated_count = 0
+    up_to_date_count = 0  # Files that already held every value (and cover) being applied
+    metadata_index = build_metadata_index()
     
-    for item in selected_items:
-        values = file_table.item(item)['values']
-        table_metadata = [values[0], values[1], values[2], values[4]]  # Artist, Title, Album, Album Artist
+    # Fetch only the 'values' option of every selected row in one pass up front
+    _item = file_table.item
+    selected_rows = [(item, _item(item, 'values')) for item in selected_items]
+    
+    def apply_to_file(matching_file):
+        """Write the new tags/art to one file; runs on a worker thread.
         
-        # Find matching file using cached metadata - with improved numeric matching
-        matching_file = None
-        for file_path, metadata in file_metadata_cache.items():
-            current_metadata = [
-                metadata.get("artist", ""),
-                metadata.get("title", ""),
-                metadata.get("album", ""),
-                metadata.get("albumartist", "")
-            ]
+        Returns:
+            tuple: (updated flag, up-to-date flag, list of log messages to emit
+            on the UI thread); up to date means nothing needed writing
+        """
+        messages = []
+        name = os.path.basename(matching_file)
+        try:
+            audio = get_audio_file(matching_file)
+            if not audio:
+                return False, False, messages
             
-            # Check if all values match, with special handling for numeric values
-            is_match = True
-            for a, b in zip(current_metadata, table_metadata):
-                a_str = str(a).strip()
-                b_str = str(b).strip()
-                
-                # If strings are equal, they match
-                if a_str == b_str:
+            # Apply the metadata fields that actually change, in one pass
+            updated = False
+            unapplied = False  # Something was requested but could not be written
+            cached = file_metadata_cache.get(matching_file) or {}
+            tag_updates = {}
+            for field, value in new_metadata.items():
+                tag = field_to_tag[field]
+                if tag in cached and str(cached[tag]) == value:
                     continue
-                
-                # Try numeric comparison if both can be converted to numbers
-                try:
-                    if a_str and b_str and float(a_str) == float(b_str):
-                        continue
-                except ValueError:
-                    pass
-                
-                # If we reach here, values don't match
-                is_match = False
-                break
+                # Even if value is empty, it should be set (to clear existing value)
+                tag_updates[tag] = value
+            if tag_updates and set_tags_bulk(audio, tag_updates):
+                updated = True
             
-            if is_match:
-                matching_file = file_path
-                break
-        
-        if matching_file:
-            try:
-                audio = get_audio_file(matching_file)
-                if not audio:
-                    continue
-                
-                # Apply each metadata field
-                updated = False
-                for field, value in new_metadata.items():
-                    tag = field_to_tag[field]
-                    # Even if value is empty, it should be set (to clear existing value)
-                    if set_tag_value(audio, tag, value):
+            # Handle album art if there's a pending change
+            if pending_album_art is not None:
+                if pending_album_art == "REMOVE":
+                    # Remove the album art
+                    remover = _ART_REMOVERS.get(type(audio))
+                    if remover and remover(audio):
                         updated = True
-                
-                # Handle album art if there's a pending change
-                if pending_album_art is not None:
-                    if pending_album_art == "REMOVE":
-                        # Remove the album art
-                        if isinstance(audio, mutagen.mp3.MP3):
-                            if audio.tags:
-                                audio.tags.delall("APIC")
-                                updated = True
-                                log_message(f"[SUCCESS] Removed album art from {os.path.basename(matching_file)}")
-                        elif isinstance(audio, mutagen.flac.FLAC):
-                            audio.clear_pictures()
+                        messages.append(f"[SUCCESS] Removed album art from {name}")
+                elif isinstance(pending_album_art, bytes) and existing_cover_matches(audio, pending_album_art):
+                    messages.append(f"[COVER] Album art already matches for {name}, not rewriting")
+                elif isinstance(pending_album_art, bytes):
+                    # Add the new album art using the payload prebuilt for this file type
+                    try:
+                        setter = _ART_SETTERS.get(type(audio))
+                        if setter:
+                            setter(audio, art_payloads[type(audio)])
                             updated = True
-                            log_message(f"[SUCCESS] Removed album art from {os.path.basename(matching_file)}")
-                        elif isinstance(audio, mutagen.mp4.MP4):
-                            if "covr" in audio:
-                                del audio["covr"]
-                                updated = True
-                                log_message(f"[SUCCESS] Removed album art from {os.path.basename(matching_file)}")
-                    elif isinstance(pending_album_art, bytes):
-                        # Add the new album art
-                        try:
-                            from PIL import Image
-                            import io
-                            
-                            # Determine the image format
-                            img_buffer = io.BytesIO(pending_album_art)
-                            img = Image.open(img_buffer)
-                            mime_type = f"image/{img.format.lower()}"
-                            
-                            # Apply based on file type
-                            if isinstance(audio, mutagen.mp3.MP3):
-                                # Remove existing album art
-                                if audio.tags:
-                                    audio.tags.delall("APIC")
-                                else:
-                                    audio.tags = mutagen.id3.ID3()
-                                
-                                # Add new album art
-                                audio.tags.add(
-                                    mutagen.id3.APIC(
-                                        encoding=3,  # UTF-8
-                                        mime=mime_type,
-                                        type=3,  # Front cover
-                                        desc='Front Cover',
-                                        data=pending_album_art
-                                    )
-                                )
-                                updated = True
-                                log_message(f"[SUCCESS] Updated album art for {os.path.basename(matching_file)}")
-                            elif isinstance(audio, mutagen.flac.FLAC):
-                                # Clear existing pictures
-                                audio.clear_pictures()
-                                
-                                # Create new picture
-                                picture = mutagen.flac.Picture()
-                                picture.type = 3  # Front cover
-                                picture.mime = mime_type
-                                picture.desc = 'Front Cover'
-                                picture.data = pending_album_art
-                                
-                                # Add picture to FLAC file
-                                audio.add_picture(picture)
-                                updated = True
-                                log_message(f"[SUCCESS] Updated album art for {os.path.basename(matching_file)}")
-                            elif isinstance(audio, mutagen.mp4.MP4):
-                                # MP4 requires special handling
-                                from mutagen.mp4 import MP4Cover
-                                
-                                # Determine correct cover format based on mime type
-                                if mime_type.endswith('png'):
-                                    cover_format = MP4Cover.FORMAT_PNG
-                                else:
-                                    cover_format = MP4Cover.FORMAT_JPEG
-                                    
-                                # Create MP4Cover object and set it
-                                cover = MP4Cover(pending_album_art, cover_format)
-                                audio['covr'] = [cover]
-                                updated = True
-                                log_message(f"[SUCCESS] Updated album art for {os.path.basename(matching_file)}")
-                            else:
-                                log_message(f"[WARNING] Album art update not supported for this file type: {type(audio).__name__}")
-                        except Exception as e:
-                            log_message(f"[ERROR] Failed to update album art: {str(e)}")
-                
-                if updated:
-                    # Save the file
-                    audio.save()
-                    
-                    # Update cache
-                    for field, value in new_metadata.items():
-                        if field in ["Artist", "Title", "Album", "Album Artist"]:
-                            file_metadata_cache[matching_file][field_to_tag[field]] = value
-                    
-                    # Update table display
-                    current_values = list(values)
+                            messages.append(f"[SUCCESS] Updated album art for {name}")
+                        else:
+                            unapplied = True
+                            messages.append(f"[WARNING] Album art update not supported for this file type: {type(audio).__name__}")
+                    except Exception as e:
+                        unapplied = True
+                        messages.append(f"[ERROR] Failed to update album art: {str(e)}")
+            
+            if updated:
+                # Save the file
+                save_audio_file(audio, matching_file)
+            return updated, not updated and not unapplied, messages
+        except Exception as e:
+            messages.append(f"[ERROR] Failed to update {name}: {str(e)}")
+            return False, False, messages
+    
+    # Resolve every row to its file, then write the files in parallel - each
+    # save is independent disk I/O, during which mutagen releases the GIL
+    row_matches = [(item, values, find_matching_file(values, metadata_index)) for item, values in selected_rows]
+    files_to_write = list(dict.fromkeys(matching_file for _, _, matching_file in row_matches if matching_file))
+    
+    # Cache, table and log updates stay on the UI thread; log lines are
+    # batched so the Text widget is not relaid out once per file. The batch
+    # is opened before the pool starts: helpers called by the workers
+    # (get_audio_file, set_tags_bulk, ...) log too, and while a batch is open
+    # their messages are only queued, to be written by this (UI) thread
+    row_updates = []  # (item, new row values), applied to the table in one sweep below
+    with batched_logging():
+        if len(files_to_write) > 1:
+            max_workers = min(8, (os.cpu_count() or 1) * 2, len(files_to_write))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = dict(zip(files_to_write, executor.map(apply_to_file, files_to_write)))
+        else:
+            results = {matching_file: apply_to_file(matching_file) for matching_file in files_to_write}
+        
+        for item, values, matching_file in row_matches:
+            if not matching_file:
+                continue
+        
+            updated, up_to_date, messages = results[matching_file]
+            for message in messages:
+                log_message(message)
+            messages.clear()  # Log once even if several rows point at the same file
+            
+            if up_to_date:
+                # Same outcome as a write, as process_files reports it
+                row_updates.append((item, list(values)))
+                updated_files.add(os.path.normpath(matching_file))
+                up_to_date_count += 1
+                log_message(f"[INFO] Metadata already up to date for {os.path.basename(matching_file)}")
+        
+            if updated:
+                # Update cache
+                cached = file_metadata_cache.get(matching_file)
+                if cached is not None:
                     for field, value in new_metadata.items():
-                        col_idx = list(columns).index(field)
-                        current_values[col_idx] = value
-                    file_table.item(item, values=current_values)
-                    
-                    # Mark as updated
-                    normalized_path = os.path.normpath(matching_file)
-                    updated_files.add(normalized_path)
-                    file_table.tag_configure("updated", background=Config.COLORS["UPDATED_ROW"])
-                    file_table.item(item, tags=("updated",))
-                    updated_count += 1
-                    
-                    log_message(f"[SUCCESS] Updated metadata for {os.path.basename(matching_file)}")
-            except Exception as e:
-                log_message(f"[ERROR] Failed to update {os.path.basename(matching_file)}: {str(e)}")
+                        cached[field_to_tag[field]] = value
+            
+                # Update table display
+                current_values = list(values)
+                for field, value in new_metadata.items():
+                    current_values[COL_INDEX[field]] = value
+                row_updates.append((item, current_values))
+            
+                # Mark as updated
+                normalized_path = os.path.normpath(matching_file)
+                updated_files.add(normalized_path)
+                updated_count += 1
+            
+                log_message(f"[SUCCESS] Updated metadata for {os.path.basename(matching_file)}")
+    
+    # Values and the "updated" tag go in a single item() call per row
+    for item, current_values in row_updates:
+        file_table.item(item, values=current_values, tags=("updated",))
     
     # Reset pending album art only if we've successfully applied all updates
     pending_album_art = None
     
     if updated_count > 0:
         log_message(f"[INFO] Successfully updated {updated_count} files")
-    else:
+    if up_to_date_count > 0:
+        log_message(f"[INFO] {up_to_date_count} files were already up to date")
+    if updated_count == 0 and up_to_date_count == 0:
         log_message("[WARNING] No files were updated")
 
 # Add save button below album art
@@ -1865,6 +1994,9 @@ processing_scrollbar.pack(side="right", fill="y")
 # Update the logger with the processing widget
 logger.set_processing_widget(processing_listbox)
 
+# Messages logged from worker threads are written by the UI thread from here on
+logger.start_pump(app)
+
 def load_default_album_art():
     """Load the default album art image when no art is available."""
     global current_album_art, current_album_art_bytes
@@ -1899,13 +2031,34 @@ def organize_to_collection():
     # Immediately reload the folder_format from config to get the freshest value
     show_folder_format_dialog(app, custom_font, organize_files_with_format)
 
+# Placeholders supported in the export folder format
+FOLDER_FORMAT_PLACEHOLDERS = ("genre", "year", "catalognumber", "albumartist", "album", "artist", "title")
+_PLACEHOLDER_RE = re.compile(r"%(" + "|".join(FOLDER_FORMAT_PLACEHOLDERS) + r")%")
+
+def build_folder_format_template(folder_format_string):
+    """Turn a %placeholder% folder format into a str.format_map template.
+    
+    Args:
+        folder_format_string: Folder format such as '%genre%/%year%/%album%'
+        
+    Returns:
+        tuple: (template with literal braces escaped and placeholders as {fields},
+                tuple of the placeholder names the format actually uses)
+    """
+    escaped = folder_format_string.replace("{", "{{").replace("}", "}}")
+    template = _PLACEHOLDER_RE.sub(r"{\1}", escaped)
+    used_placeholders = tuple(dict.fromkeys(_PLACEHOLDER_RE.findall(folder_format_string)))
+    return template, used_placeholders
+
 def organize_files_with_format():
     """
     Organize selected files to collection folder using metadata.
     Uses the configured folder format.
     """
+    # Folders may have been deleted outside the app since the last run
+    clear_mkdir_cache()
+    
     # Always reload the latest folder format from the settings file
-    import json
     try:
         with open(Config.FOLDER_STRUCTURE["SETTINGS_FILE"], 'r') as f:
             settings = json.load(f)
@@ -1921,47 +2074,48 @@ def organize_files_with_format():
         log_message("[ERROR] No files selected for organizing", log_type="processing")
         return
     
+    # Compile the format once; each file then needs a single substitution pass
+    folder_format_template, used_placeholders = build_folder_format_template(current_folder_format)
+    
     # Create a list to store files that will be moved with their destinations
     files_to_move = []
+    src_to_item = {}  # Source path -> table item, to drop rows once their file has moved
     skipped_files = []
     
+    metadata_index = build_metadata_index()
+    
+    # Fetch only the 'values' option of every selected row in one pass up front
+    _item = file_table.item
+    selected_rows = [(item, _item(item, 'values')) for item in selected_items]
+    
     # Check each selected file for required metadata
-    for item in selected_items:
-        values = file_table.item(item)['values']
-        table_metadata = [values[0], values[1], values[2], values[4]]  # Artist, Title, Album, Album Artist
-        
-        # Find matching file using cached metadata
-        matching_file = None
-        for file_path, metadata in file_metadata_cache.items():
-            current_metadata = [
-                metadata.get("artist", ""),
-                metadata.get("title", ""),
-                metadata.get("album", ""),
-                metadata.get("albumartist", "")
-            ]
-            if all(str(a).strip() == str(b).strip() for a, b in zip(current_metadata, table_metadata)):
-                matching_file = file_path
-                break
+    for item, values in selected_rows:
+        matching_file = find_matching_file(values, metadata_index)
         
         if not matching_file:
             log_message(f"[ERROR] Could not find file for {values[0]} - {values[1]}")
             skipped_files.append(f"{values[0]} - {values[1]}")
             continue
         
-        # Get required metadata
-        audio = get_audio_file(matching_file)
-        if not audio:
-            skipped_files.append(os.path.basename(matching_file))
-            continue
+        # Get required metadata from the cache; only reopen the file if the
+        # cached entry doesn't carry every tag
+        metadata = file_metadata_cache.get(matching_file)
+        if metadata is None or any(tag not in metadata for tag in CACHED_TAGS):
+            audio = get_audio_file(matching_file)
+            if not audio:
+                skipped_files.append(os.path.basename(matching_file))
+                continue
+            metadata = {tag: get_tag_value(audio, tag, "") for tag in CACHED_TAGS}
+            file_metadata_cache[matching_file] = metadata
             
         # Get all required tags
-        artist = get_tag_value(audio, "artist", "")
-        title = get_tag_value(audio, "title", "")
-        album = get_tag_value(audio, "album", "")
-        albumartist = get_tag_value(audio, "albumartist", "")
-        genre = get_tag_value(audio, "genre", "")
-        year = get_tag_value(audio, "date", "")
-        catalognumber = get_tag_value(audio, "catalognumber", "")
+        artist = metadata["artist"]
+        title = metadata["title"]
+        album = metadata["album"]
+        albumartist = metadata["albumartist"]
+        genre = metadata["genre"]
+        year = metadata["date"]
+        catalognumber = metadata["catalognumber"]
         
         # Check if all required fields are present
         required_fields = {"artist": artist, "title": title, "album": album, 
@@ -1983,29 +2137,16 @@ def organize_files_with_format():
             genre = genre.split(";")[0].strip()
             log_message(f"[INFO] Using first genre component: {genre}")
 
-        # Sanitize values for use in paths
-        from utils.file_operations import sanitize_filename as file_ops_sanitize_filename
-        safe_genre = file_ops_sanitize_filename(genre)
-        safe_year = file_ops_sanitize_filename(year)
-        safe_catalognumber = file_ops_sanitize_filename(catalognumber)
-        safe_albumartist = file_ops_sanitize_filename(albumartist)
-        safe_album = file_ops_sanitize_filename(album)
-        safe_artist = file_ops_sanitize_filename(artist)
-        safe_title = file_ops_sanitize_filename(title)
-        
         # Get file extension
         _, ext = os.path.splitext(matching_file)
         
-        # Build the destination path using the configured format
-        # Replace placeholders with actual values
-        destination_path = current_folder_format
-        destination_path = destination_path.replace("%genre%", safe_genre)
-        destination_path = destination_path.replace("%year%", safe_year)
-        destination_path = destination_path.replace("%catalognumber%", safe_catalognumber)
-        destination_path = destination_path.replace("%albumartist%", safe_albumartist)
-        destination_path = destination_path.replace("%album%", safe_album)
-        destination_path = destination_path.replace("%artist%", safe_artist)
-        destination_path = destination_path.replace("%title%", safe_title)
+        # Build the destination path using the configured format, sanitizing
+        # only the values whose placeholders actually appear in it
+        tag_values = {"genre": genre, "year": year, "catalognumber": catalognumber,
+                      "albumartist": albumartist, "album": album, "artist": artist, "title": title}
+        destination_path = folder_format_template.format_map(
+            {placeholder: sanitize_filename(tag_values[placeholder]) for placeholder in used_placeholders}
+        )
         
         # Add file extension if not already in the format
         if not destination_path.endswith(ext):
@@ -2014,6 +2155,7 @@ def organize_files_with_format():
         # Check if the destination path exists and is different from source
         if matching_file != destination_path:
             files_to_move.append((matching_file, destination_path))
+            src_to_item[matching_file] = item
         else:
             log_message(f"[SKIP] File is already in correct location: {os.path.basename(matching_file)}")
     
@@ -2028,22 +2170,23 @@ def organize_files_with_format():
         errors = 0
         moved_file_paths = []  # Track which files were successfully moved
         
-        for src, dest in files_to_move:
-            try:
-                # Create destination directory if it doesn't exist
-                dest_dir = os.path.dirname(dest)
-                os.makedirs(dest_dir, exist_ok=True)
-                
-                # Move the file
-                if os.path.exists(dest):
-                    log_message(f"[WARNING] Destination file already exists, overwriting: {dest}")
-                shutil.move(src, dest)
+        # Make sure no queued cover save is still writing to a file we move
+        wait_for_pending_writes()
+        
+        # Overwrites are allowed, as before, but announced
+        for _, dest in files_to_move:
+            if os.path.exists(dest):
+                log_message(f"[WARNING] Destination file already exists, overwriting: {dest}")
+        
+        # Move the files in parallel, then report on the UI thread in order
+        for src, dest, error in move_files_to_destinations(files_to_move):
+            if error is None:
                 moved_count += 1
                 log_message(f"[SUCCESS] Moved file to: {dest}")
                 moved_file_paths.append(src)  # Track the successfully moved file
-            except Exception as e:
+            else:
                 errors += 1
-                log_message(f"[ERROR] Failed to move {src}: {str(e)}")
+                log_message(f"[ERROR] Failed to move {src}: {str(error)}")
         
         # Show summary
         if moved_count > 0:
@@ -2051,30 +2194,16 @@ def organize_files_with_format():
             
             # Remove the moved files from the file_list and related data structures
             global file_list
+            moved_set = set(moved_file_paths)
+            file_list[:] = [path for path in file_list if path not in moved_set]
             for path in moved_file_paths:
-                if path in file_list:
-                    file_list.remove(path)
-                if path in file_metadata_cache:
-                    file_metadata_cache.pop(path)
-                processed_files.discard(path)
-                updated_files.discard(path)
+                file_metadata_cache.pop(path, None)
+                normalized_path = os.path.normpath(path)  # Status sets hold normalized paths
+                processed_files.discard(normalized_path)
+                updated_files.discard(normalized_path)
                 
             # Remove the moved files from the table
-            items_to_remove = []
-            for item in selected_items:
-                values = file_table.item(item)['values']
-                table_metadata = [values[0], values[1], values[2], values[4]]  # Artist, Title, Album, Album Artist
-                
-                # Find the corresponding file path
-                for file_path in moved_file_paths:
-                    if file_path in file_metadata_cache:
-                        continue  # Already removed from cache
-                        
-                    # Find if this item's metadata matches any moved file
-                    for src, _ in files_to_move:
-                        if os.path.normpath(src) == os.path.normpath(file_path):
-                            items_to_remove.append(item)
-                            break
+            items_to_remove = [src_to_item[src] for src in moved_file_paths if src in src_to_item]
             
             # Remove items from table
             if items_to_remove:
@@ -2128,16 +2257,39 @@ def update_table():
     # Force UI update
     app.update_idletasks()
 
+def prefetch_file_metadata(file_path):
+    """Read a scanned file's tags (runs on the folder scan thread; the cache is filled by store_file_metadata)."""
+    return read_file_metadata(file_path, CACHED_TAGS, get_audio_file, get_tag_value)
+
+def store_file_metadata(file_path, metadata):
+    """Put tags read by the folder scan into the cache (runs on the UI thread)."""
+    if metadata:
+        file_metadata_cache[file_path] = metadata
+
+def append_scanned_rows(batch, start_index):
+    """Add table rows for a batch of files from a running folder scan."""
+    table_insert_file_rows(file_table, batch, start_index, filter_entry.get().lower(),
+                           file_metadata_cache, get_audio_file, get_tag_value,
+                           updated_files, processed_files)
+
+def finish_folder_scan():
+    """Wrap up a streamed folder scan once every batch is in the table."""
+    metadata_store.commit()
+    file_count_var.set(f"{len(file_table.selection())}/{len(file_table.get_children())}")
+    auto_adjust_column_widths(file_table, columns)
+
 def clear_file_list():
     """Clear all file-related data structures and update the UI."""
     global file_list
     
     # Clear all data structures
+    cancel_file_scan()
     file_list = []
     processed_files.clear()
     updated_files.clear()
     selected_folders.clear()
     file_metadata_cache.clear()
+    clear_cover_cache()
     
     # Clear the table
     file_table.delete(*file_table.get_children())
@@ -3,17 +3,51 @@ API client module for handling external API requests and rate limiting.
 """
 
 import requests
+import threading
 import time
 import os
+from requests.adapters import HTTPAdapter
 from utils.logging import log_message
 from config import Config
 
+# Parse Discogs responses with orjson when it is installed (several times
+# faster on large search pages); the standard library parser otherwise
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 # API rate limiting
 rate_limit_total = Config.API["RATE_LIMIT"]
 rate_limit_used = 0
 rate_limit_remaining = rate_limit_total
 first_request_time = 0  # Track when the first request was made in the current window
 
+# Shared HTTP session so consecutive Discogs calls reuse pooled keep-alive
+# connections instead of paying a new TCP + TLS handshake each time
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    Get the shared requests session, creating it on first use.
+    
+    Returns:
+        requests.Session: Session with a pooled HTTPS adapter
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries stay in make_api_request, which also handles 429 waits
+                session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+                session.headers['Accept-Encoding'] = 'gzip, deflate'
+                _session = session
+    return _session
+
 def make_api_request(url, params, max_retries=3, retry_delay=2):
     """Make an API request with retries.
     
@@ -29,7 +63,7 @@ def make_api_request(url, params, max_retries=3, retry_delay=2):
     attempts = 0
     while attempts < max_retries:
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = get_session().get(url, params=params, timeout=10)
             
             if response.status_code == 429:  # Too Many Requests
                 retry_after = int(response.headers.get('Retry-After', retry_delay))
@@ -39,9 +73,9 @@ def make_api_request(url, params, max_retries=3, retry_delay=2):
                 continue
                 
             response.raise_for_status()  # Raise exception for 4xx/5xx status codes
-            return response.json(), response.headers
+            return _json_loads(response.content), response.headers
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             log_message(f"[ERROR] API request failed: {str(e)}")
             attempts += 1
             if attempts < max_retries:
@@ -7,6 +7,76 @@ from tkinter import ttk, StringVar, messagebox
 from config import Config, folder_format, DEFAULT_FOLDER_FORMAT
 from ui.styles import style_button, create_styled_entry, style_label
 import os
+import json
+from functools import lru_cache
+
+# Metadata placeholders a folder format can use
+_PLACEHOLDERS = ('%genre%', '%year%', '%catalognumber%', '%albumartist%', '%album%', '%artist%', '%title%')
+
+# Characters not allowed in a folder format (':' and '\' stay legal for drive and path separators)
+_INVALID_FORMAT_CHARS = ('<', '>', '"', '|', '?', '*')
+_INVALID_CHARS_TABLE = str.maketrans('', '', ''.join(_INVALID_FORMAT_CHARS))
+
+def write_settings_file(settings_path, settings):
+    """Serialize settings to JSON in memory and write them with a single call.
+    
+    Args:
+        settings_path: Path of the settings file
+        settings: Dictionary of settings to save
+    """
+    data = json.dumps(settings, indent=4, separators=(',', ': '))
+    with open(settings_path, 'w', buffering=65536) as f:
+        f.write(data)
+
+@lru_cache(maxsize=64)
+def validate_folder_format(format_string):
+    """Validate that the folder format makes sense.
+    
+    Results are memoized per format string, since the same string is usually
+    validated again on Save and Continue.
+    
+    Args:
+        format_string: The folder format to validate
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    # Check if format ends with a directory separator
+    if format_string.endswith('\\') or format_string.endswith('/'):
+        return False, "Format cannot end with a directory separator (\\, /)"
+        
+    # Check if format includes at least one metadata placeholder
+    # (a placeholder needs two '%', which rules most bad formats out in one pass)
+    if format_string.count('%') < 2 or not any(placeholder in format_string for placeholder in _PLACEHOLDERS):
+        return False, "Format must include at least one metadata placeholder"
+        
+    # Check if the format has a filename component
+    # (lowercase the format once, and only when there's no %title% to go on)
+    if '%title%' not in format_string:
+        lower_format = format_string.lower()
+        has_extension = any(ext in lower_format for ext in ('.mp3', '.flac', '.m4a', '.ogg', '.wav'))
+    else:
+        has_extension = True
+    
+    if not has_extension:
+        return False, "Format must include a filename component (%title% or a file extension)"
+        
+    # Check for basic Windows path validity
+    if ':' in format_string:
+        # If there's a drive letter, make sure it's correctly formatted:
+        # an ASCII letter, ':' and a backslash (plain character tests, no regex)
+        drive = format_string[0] if format_string else ''
+        if not (len(format_string) >= 3 and drive.isascii() and drive.isalpha() and
+                format_string[1] == ':' and format_string[2] == '\\'):
+            return False, "Invalid drive format. Must be like 'C:\\...'"
+            
+    # Check for invalid filename characters
+    # (one translate pass; the offending character is only looked up on failure)
+    if len(format_string.translate(_INVALID_CHARS_TABLE)) != len(format_string):
+        char = next(char for char in _INVALID_FORMAT_CHARS if char in format_string)
+        return False, f"Invalid character in format: '{char}'"
+            
+    return True, ""
 
 def show_folder_format_dialog(parent_window, custom_font, on_continue_callback):
     """Show a dialog to edit the folder structure format.
@@ -106,41 +176,6 @@ D:\\Music\\Collection\\%genre%\\%year%\\[%catalognumber%] %albumartist% - %album
         format_entry.configure(bg=Config.COLORS["VALID_ENTRY"])
         clear_error()  # Clear any error message
     
-    # Function to validate the folder format
-    def validate_folder_format(format_string):
-        """Validate that the folder format makes sense."""
-        # Check if format ends with a directory separator
-        if format_string.endswith('\\') or format_string.endswith('/'):
-            return False, "Format cannot end with a directory separator (\\, /)"
-            
-        # Check if format includes at least one metadata placeholder
-        placeholders = ['%genre%', '%year%', '%catalognumber%', '%albumartist%', '%album%', '%artist%', '%title%']
-        if not any(placeholder in format_string for placeholder in placeholders):
-            return False, "Format must include at least one metadata placeholder"
-            
-        # Check if the format has a filename component
-        has_title = '%title%' in format_string
-        has_extension = any(ext in format_string.lower() for ext in ['.mp3', '.flac', '.m4a', '.ogg', '.wav'])
-        
-        if not (has_title or has_extension):
-            return False, "Format must include a filename component (%title% or a file extension)"
-            
-        # Check for basic Windows path validity
-        if ':' in format_string:
-            # If there's a drive letter, make sure it's correctly formatted
-            import re
-            drive_pattern = r'^[a-zA-Z]:\\.*'
-            if not re.match(drive_pattern, format_string):
-                return False, "Invalid drive format. Must be like 'C:\\...'"
-                
-        # Check for invalid filename characters
-        invalid_chars = ['<', '>', ':', '"', '|', '?', '*']
-        for char in invalid_chars:
-            if char in format_string.replace(':', '').replace('\\', ''):  # Allow ':' in drive letter and '\' in path
-                return False, f"Invalid character in format: '{char}'"
-                
-        return True, ""
-    
     # Add save button - use 💾 icon like the API key save button
     def save_format():
         global folder_format
@@ -156,23 +191,23 @@ D:\\Music\\Collection\\%genre%\\%year%\\[%catalognumber%] %albumartist% - %album
             show_error(error_message)
             return
             
+        # Save to file - with explicit file path for debugging
+        settings_path = os.path.abspath(Config.FOLDER_STRUCTURE["SETTINGS_FILE"])
+        
+        # Nothing to write if the saved format is already this one
+        if format_string == folder_format and os.path.exists(settings_path):
+            format_entry.configure(bg=Config.COLORS["VALID_ENTRY"])
+            return
+            
         try:
             # Update global variable
             folder_format = format_string
             
-            # Save to file - with explicit file path for debugging
-            settings_path = os.path.abspath(Config.FOLDER_STRUCTURE["SETTINGS_FILE"])
-            
             # Debug message about path
             print(f"Attempting to save to: {settings_path}")
             
             # Try to directly write to the file instead of using save_settings
-            import json
-            with open(settings_path, 'w') as f:
-                settings = {
-                    'folder_format': folder_format
-                }
-                json.dump(settings, f, indent=4)
+            write_settings_file(settings_path, {'folder_format': folder_format})
             
             # Just verify the file exists without showing a popup
             if not os.path.exists(settings_path):
@@ -223,33 +258,30 @@ D:\\Music\\Collection\\%genre%\\%year%\\[%catalognumber%] %albumartist% - %album
             show_error(error_message)
             return
             
-        try:
-            # Save the new format
-            folder_format = format_string
-            
-            # Save to file - with explicit file path for debugging
-            settings_path = os.path.abspath(Config.FOLDER_STRUCTURE["SETTINGS_FILE"])
-            
-            # Debug message about path
-            print(f"Saving format before continuing: {folder_format}")
-            print(f"Saving to: {settings_path}")
-            
-            # Try to directly write to the file instead of using save_settings
-            import json
-            with open(settings_path, 'w') as f:
-                settings = {
-                    'folder_format': folder_format
-                }
-                json.dump(settings, f, indent=4)
+        # Save to file - with explicit file path for debugging
+        settings_path = os.path.abspath(Config.FOLDER_STRUCTURE["SETTINGS_FILE"])
+        
+        # Only write the settings file if the format actually changed
+        if format_string != folder_format or not os.path.exists(settings_path):
+            try:
+                # Save the new format
+                folder_format = format_string
                 
-            # Success - set background to green (even though we'll be closing the dialog)
-            format_entry.configure(bg=Config.COLORS["VALID_ENTRY"])
+                # Debug message about path
+                print(f"Saving format before continuing: {folder_format}")
+                print(f"Saving to: {settings_path}")
                 
-        except Exception as e:
-            error_msg = f"Error saving settings before continue: {str(e)}"
-            print(error_msg)
-            show_error(error_msg)
-            return
+                # Try to directly write to the file instead of using save_settings
+                write_settings_file(settings_path, {'folder_format': folder_format})
+                    
+                # Success - set background to green (even though we'll be closing the dialog)
+                format_entry.configure(bg=Config.COLORS["VALID_ENTRY"])
+                    
+            except Exception as e:
+                error_msg = f"Error saving settings before continue: {str(e)}"
+                print(error_msg)
+                show_error(error_msg)
+                return
             
         # Close the dialog
         format_dialog.destroy()
@@ -314,19 +346,24 @@ def show_move_confirmation_dialog(parent_window, custom_font, files_to_move, ski
     scrollbar = ttk.Scrollbar(file_frame)
     scrollbar.pack(side="right", fill="y")
     
-    # Text widget to show file paths
-    file_list_text = tk.Text(file_frame,
-                          font=('Consolas', Config.FONTS["TABLE_SIZE"]),
-                          bg=Config.COLORS["SECONDARY_BACKGROUND"],
-                          fg=Config.COLORS["TEXT"],
-                          yscrollcommand=scrollbar.set)
-    file_list_text.pack(side="left", fill="both", expand=True)
-    scrollbar.config(command=file_list_text.yview)
-    
-    # Add all files to the text widget
+    # List of moves as a two-column Treeview: it only renders the visible rows,
+    # unlike a Text widget which lays out every line of a long move list
+    file_list_tree = ttk.Treeview(file_frame,
+                                columns=("src", "dest"),
+                                show="headings",
+                                yscrollcommand=scrollbar.set)
+    file_list_tree.heading("src", text="FROM")
+    file_list_tree.heading("dest", text="TO")
+    file_list_tree.column("src", width=580, anchor="w")
+    file_list_tree.column("dest", width=580, anchor="w")
+    file_list_tree.pack(side="left", fill="both", expand=True)
+    scrollbar.config(command=file_list_tree.yview)
+    
+    # Add all moves to the list
+    _normpath = os.path.normpath
+    _insert = file_list_tree.insert
     for src, dest in files_to_move:
-        file_list_text.insert("end", f"From: {src}\nTo: {os.path.normpath(dest)}\n\n")
-    file_list_text.configure(state="disabled")  # Make read-only
+        _insert("", "end", values=(src, _normpath(dest)))
     
     # Show skipped files if any
     if skipped_files:
@@ -336,27 +373,37 @@ def show_move_confirmation_dialog(parent_window, custom_font, files_to_move, ski
                 bg=Config.COLORS["BACKGROUND"],
                 fg="#990000").pack(pady=(10, 0), padx=10)
                 
-        # Create another scrollable list for skipped files
-        skipped_frame = ttk.Frame(confirmation_dialog)
-        skipped_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Add scrollbar
-        skipped_scrollbar = ttk.Scrollbar(skipped_frame)
-        skipped_scrollbar.pack(side="right", fill="y")
-        
-        # Text widget to show skipped files
-        skipped_list_text = tk.Text(skipped_frame, height=5,
-                                  font=('Consolas', Config.FONTS["TABLE_SIZE"]),
-                                  bg=Config.COLORS["SECONDARY_BACKGROUND"],
-                                  fg="#990000",
-                                  yscrollcommand=skipped_scrollbar.set)
-        skipped_list_text.pack(side="left", fill="both", expand=True)
-        skipped_scrollbar.config(command=skipped_list_text.yview)
+        # The skipped list is only built if the user asks for it, so confirming
+        # or cancelling right away costs no Tk work for long skip lists
+        def show_skipped_files():
+            show_skipped_button.configure(state="disabled")
+            
+            # Create another scrollable list for skipped files
+            skipped_frame = ttk.Frame(confirmation_dialog)
+            skipped_frame.pack(fill="both", expand=True, padx=10, pady=5, before=button_frame)
+            
+            # Add scrollbar
+            skipped_scrollbar = ttk.Scrollbar(skipped_frame)
+            skipped_scrollbar.pack(side="right", fill="y")
+            
+            # Text widget to show skipped files
+            skipped_list_text = tk.Text(skipped_frame, height=5,
+                                      font=('Consolas', Config.FONTS["TABLE_SIZE"]),
+                                      bg=Config.COLORS["SECONDARY_BACKGROUND"],
+                                      fg="#990000",
+                                      yscrollcommand=skipped_scrollbar.set)
+            skipped_list_text.pack(side="left", fill="both", expand=True)
+            skipped_scrollbar.config(command=skipped_list_text.yview)
+            
+            # Add all skipped files to the text widget with a single insert
+            skipped_list_text.insert("end", "".join(f"{file}\n" for file in skipped_files))
+            skipped_list_text.configure(state="disabled")  # Make read-only
         
-        # Add all skipped files to the text widget
-        for file in skipped_files:
-            skipped_list_text.insert("end", f"{file}\n")
-        skipped_list_text.configure(state="disabled")  # Make read-only
+        show_skipped_button = tk.Button(confirmation_dialog,
+                                      text=f"SHOW {len(skipped_files)} SKIPPED FILES",
+                                      command=show_skipped_files)
+        style_button(show_skipped_button)
+        show_skipped_button.pack(pady=5, padx=10)
     
     # Button frame at the bottom
     button_frame = ttk.Frame(confirmation_dialog)
@@ -7,13 +7,31 @@ from config import Config
 import tkinter as tk
 from tkinter import ttk, font
 
+# Session-constant style values, looked up once instead of per styled widget
+_BG = Config.COLORS["BACKGROUND"]
+_SECONDARY_BG = Config.COLORS["SECONDARY_BACKGROUND"]
+_TEXT = Config.COLORS["TEXT"]
+_PADDING = Config.STYLES["WIDGET_PADDING"]
+_TABLE_FONT = ('Consolas', Config.FONTS["TABLE_SIZE"])
+
 # Add a global reference for the custom font
 _app_custom_font = None
 
+# (family, size) of the custom font, read from Tk once instead of per styled label
+_font_meta = None
+
 def set_custom_font(custom_font):
     """Store a reference to the application's custom font for use in styling functions."""
-    global _app_custom_font
+    global _app_custom_font, _font_meta
     _app_custom_font = custom_font
+    _font_meta = None
+
+def _get_font_meta():
+    """Return the custom font's (family, size), querying Tk only on first use."""
+    global _font_meta
+    if _font_meta is None:
+        _font_meta = (_app_custom_font.cget("family"), _app_custom_font.cget("size"))
+    return _font_meta
 
 def style_button(button, is_danger=False):
     """Apply standard button styling with optional variants.
@@ -24,10 +42,10 @@ def style_button(button, is_danger=False):
     """
     button.configure(
         font=_app_custom_font,
-        bg=Config.COLORS["SECONDARY_BACKGROUND"],
-        fg="#990000" if is_danger else Config.COLORS["TEXT"],
-        padx=Config.STYLES["WIDGET_PADDING"],
-        pady=Config.STYLES["WIDGET_PADDING"]
+        bg=_SECONDARY_BG,
+        fg="#990000" if is_danger else _TEXT,
+        padx=_PADDING,
+        pady=_PADDING
     )
 
 def style_entry(entry, font_size=None):
@@ -37,12 +55,12 @@ def style_entry(entry, font_size=None):
         entry: The tk.Entry to style
         font_size: Optional custom font size
     """
-    font_to_use = ('Consolas', font_size if font_size else Config.FONTS["TABLE_SIZE"])
+    font_to_use = ('Consolas', font_size) if font_size else _TABLE_FONT
     entry.configure(
         font=font_to_use,
-        bg=Config.COLORS["SECONDARY_BACKGROUND"],
-        fg=Config.COLORS["TEXT"],
-        insertbackground=Config.COLORS["TEXT"]
+        bg=_SECONDARY_BG,
+        fg=_TEXT,
+        insertbackground=_TEXT
     )
 
 def style_label(label, use_smaller_font=False):
@@ -53,17 +71,16 @@ def style_label(label, use_smaller_font=False):
         use_smaller_font: If True, use a font size 1pt smaller than default
     """
     if _app_custom_font:
-        current_size = _app_custom_font.cget("size")
+        font_family, current_size = _get_font_meta()
         font_size = current_size - 1 if use_smaller_font else current_size
-        font_family = _app_custom_font.cget("family")
     else:
         font_family = Config.STYLES["CUSTOM_FONT"]["FAMILY"]
         font_size = Config.FONTS["DEFAULT_SIZE"] - (1 if use_smaller_font else 0)
         
     label.configure(
         font=(font_family, font_size),
-        bg=Config.COLORS["BACKGROUND"],
-        fg=Config.COLORS["TEXT"],
+        bg=_BG,
+        fg=_TEXT,
         bd=0
     )
 
@@ -75,11 +92,11 @@ def style_checkbutton(checkbutton):
     """
     checkbutton.configure(
         font=_app_custom_font,
-        bg=Config.COLORS["BACKGROUND"],
-        fg=Config.COLORS["TEXT"],
-        selectcolor=Config.COLORS["SECONDARY_BACKGROUND"],
-        activebackground=Config.COLORS["BACKGROUND"],
-        activeforeground=Config.COLORS["TEXT"]
+        bg=_BG,
+        fg=_TEXT,
+        selectcolor=_SECONDARY_BG,
+        activebackground=_BG,
+        activeforeground=_TEXT
     )
 
 def configure_context_menu(menu):
@@ -119,32 +136,36 @@ def configure_styles(style, custom_font):
     # Set theme
     style.theme_use(Config.STYLES["THEME"])
     
+    # Read the session-constant colors and sizes into locals once
+    bg, sbg, txt = _BG, _SECONDARY_BG, _TEXT
+    pad = _PADDING
+    
     # Configure dark theme styles
-    style.configure('Dark.TPanedwindow', background=Config.COLORS["BACKGROUND"], sashwidth=0)
-    style.configure('TFrame', background=Config.COLORS["BACKGROUND"])
-    style.configure('TButton', padding=Config.STYLES["WIDGET_PADDING"], font=custom_font, 
-                   background=Config.COLORS["SECONDARY_BACKGROUND"], foreground=Config.COLORS["TEXT"], 
+    style.configure('Dark.TPanedwindow', background=bg, sashwidth=0)
+    style.configure('TFrame', background=bg)
+    style.configure('TButton', padding=pad, font=custom_font, 
+                   background=sbg, foreground=txt, 
                    relief="solid", borderwidth=1)
     style.map('TButton',
         relief=[('pressed', 'sunken'), ('!pressed', 'solid')],
         borderwidth=[('pressed', 1), ('!pressed', 1)])
-    style.configure('TEntry', padding=Config.STYLES["WIDGET_PADDING"], 
-                   fieldbackground=Config.COLORS["SECONDARY_BACKGROUND"], foreground=Config.COLORS["TEXT"])
-    style.configure('TLabel', background=Config.COLORS["BACKGROUND"], foreground=Config.COLORS["TEXT"], font=custom_font)
-    style.configure('TText', padding=Config.STYLES["WIDGET_PADDING"], 
-                   background=Config.COLORS["SECONDARY_BACKGROUND"], foreground=Config.COLORS["TEXT"])
+    style.configure('TEntry', padding=pad, 
+                   fieldbackground=sbg, foreground=txt)
+    style.configure('TLabel', background=bg, foreground=txt, font=custom_font)
+    style.configure('TText', padding=pad, 
+                   background=sbg, foreground=txt)
     
     # Table styles with dark theme
     style.configure('Treeview', 
                    rowheight=15,
-                   font=('Consolas', Config.FONTS["TABLE_SIZE"]),
-                   background=Config.COLORS["SECONDARY_BACKGROUND"],
-                   foreground=Config.COLORS["TEXT"],
-                   fieldbackground=Config.COLORS["SECONDARY_BACKGROUND"])
+                   font=_TABLE_FONT,
+                   background=sbg,
+                   foreground=txt,
+                   fieldbackground=sbg)
     style.configure('Treeview.Heading', 
                    font=('Consolas', Config.FONTS["TABLE_HEADING_SIZE"], 'bold'),
-                   background=Config.COLORS["BACKGROUND"],
-                   foreground=Config.COLORS["TEXT"])
+                   background=bg,
+                   foreground=txt)
 
     # Configure table borders and remove extra spacing
     style.layout("Treeview", [
@@ -160,36 +181,30 @@ def configure_styles(style, custom_font):
     ])
 
     # Left panel styles with dark theme
-    style.configure('LeftPanel.TFrame', background=Config.COLORS["BACKGROUND"])
-    style.configure('Section.TLabelframe', background=Config.COLORS["BACKGROUND"], foreground=Config.COLORS["TEXT"], padding=0)
+    style.configure('LeftPanel.TFrame', background=bg)
+    style.configure('Section.TLabelframe', background=bg, foreground=txt, padding=0)
     style.configure('Section.TLabelframe.Label', 
                    font=custom_font, 
-                   background=Config.COLORS["BACKGROUND"],
-                   foreground=Config.COLORS["TEXT"])
+                   background=bg,
+                   foreground=txt)
 
     # Custom checkbutton style with dark theme
     style.configure('Custom.TCheckbutton', 
                    font=(Config.STYLES["CUSTOM_FONT"]["FAMILY"], Config.FONTS["DEFAULT_SIZE"]),
-                   background=Config.COLORS["BACKGROUND"],
-                   foreground=Config.COLORS["TEXT"])
+                   background=bg,
+                   foreground=txt)
 
     # Progress bar styles
-    style.configure("API.Horizontal.TProgressbar",
+    trough = Config.COLORS["PROGRESSBAR"]["TROUGH"]
+    style.configure(_API_PROGRESS_STYLE,
                    background=Config.COLORS["PROGRESSBAR"]["GREEN"],
-                   troughcolor=Config.COLORS["PROGRESSBAR"]["TROUGH"])
-    style.configure("Gradient.Horizontal.TProgressbar",
+                   troughcolor=trough)
+    style.configure(_FILE_PROGRESS_STYLE,
                    background=Config.COLORS["SUCCESS"],
-                   troughcolor=Config.COLORS["PROGRESSBAR"]["TROUGH"])
+                   troughcolor=trough)
 
-def update_progress_bar_style(style, progress, bar_type="file"):
-    """Update progress bar color based on progress value.
-    
-    Args:
-        style: The ttk.Style object
-        progress: For file progress, 0-100 percentage. For API, number of used calls.
-        bar_type: Either "file" or "api"
-    """
-    # Calculate color based on progress
+def _progress_color(progress):
+    """Compute the green-to-yellow-to-red color for a 0-100 progress value."""
     if progress < 50:
         # Green to Yellow (mix more yellow as progress increases)
         green = 255
@@ -198,14 +213,37 @@ def update_progress_bar_style(style, progress, bar_type="file"):
         # Yellow to Red (reduce green as progress increases)
         red = 255
         green = int(((100 - progress) / 50) * 255)
+    return f'#{red:02x}{green:02x}00'
+
+# Progress bar colors for every whole progress value, computed once
+_PROGRESS_COLORS = tuple(_progress_color(i) for i in range(101))
+_FILE_PROGRESS_STYLE = "Gradient.Horizontal.TProgressbar"
+_API_PROGRESS_STYLE = "API.Horizontal.TProgressbar"
+
+# Last color applied to each progress bar type
+_last_progress_color = {"file": None, "api": None}
+
+def update_progress_bar_style(style, progress, bar_type="file"):
+    """Update progress bar color based on progress value.
     
-    color = f'#{red:02x}{green:02x}00'
+    Args:
+        style: The ttk.Style object
+        progress: For file progress, 0-100 percentage. For API, number of used calls.
+        bar_type: Either "file" or "api"
+    """
+    # Look up the precomputed color for this progress value
+    color = _PROGRESS_COLORS[max(0, min(100, int(progress)))]
+    
+    # Skip the Tcl round-trip when the bar already has this color
+    if _last_progress_color.get(bar_type) == color:
+        return
+    _last_progress_color[bar_type] = color
     
     # Apply color to appropriate style
     if bar_type == "file":
-        style.configure("Gradient.Horizontal.TProgressbar", background=color)
+        style.configure(_FILE_PROGRESS_STYLE, background=color)
     else:
-        style.configure("API.Horizontal.TProgressbar", background=color)
+        style.configure(_API_PROGRESS_STYLE, background=color)
 
 def set_api_entry_style(entry, is_valid):
     """Set the style of the API entry based on validity.
@@ -284,10 +322,10 @@ def create_styled_text(parent, width=None, height=None, state="normal", wrap="wo
     """Create and return a styled text widget."""
     text = tk.Text(parent, width=width, height=height, state=state, wrap=wrap)
     text.configure(
-        font=('Consolas', Config.FONTS["TABLE_SIZE"]),
-        bg=Config.COLORS["SECONDARY_BACKGROUND"],
-        fg=Config.COLORS["TEXT"],
-        insertbackground=Config.COLORS["TEXT"]
+        font=_TABLE_FONT,
+        bg=_SECONDARY_BG,
+        fg=_TEXT,
+        insertbackground=_TEXT
     )
     return text
 
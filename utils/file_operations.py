@@ -5,18 +5,32 @@ Provides functionality for file handling, selection, path manipulation, and audi
 
 import os
 import sys
-import re
+import stat
+import errno
+import shutil
+import heapq
+import itertools
+import queue
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog
-from utils.logging import log_message
+from config import Config
+from utils.logging import log_message, debug_enabled, redirected_logging
 
-# Import Mutagen libraries for audio file handling
+# Import Mutagen for audio file handling; the per-format modules are only
+# imported the first time a file of that format is loaded
+import importlib
 import mutagen
-from mutagen.mp3 import MP3
-from mutagen.flac import FLAC
-from mutagen.mp4 import MP4
-from mutagen.oggvorbis import OggVorbis
-from mutagen.asf import ASF
-from mutagen.wave import WAVE
+
+# Characters that end a bare (unquoted, unbraced) path in drag-and-drop data
+_DROP_SEPARATORS = ' \t\r\n'
+
+# Base folder for bundled resources, resolved once: PyInstaller's temp folder
+# (_MEIPASS) when frozen, otherwise the project root (parent of utils/) so paths
+# resolve correctly regardless of the current working directory
+_BASE_PATH = getattr(sys, '_MEIPASS', None) or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 def resource_path(relative_path):
     """
@@ -28,15 +42,113 @@ def resource_path(relative_path):
     Returns:
         Absolute path to the resource
     """
+    return os.path.join(_BASE_PATH, relative_path)
+
+def _scan_folder(folder, ext_tuple, with_inodes=False):
+    """
+    List one folder's matching audio files and its subfolders.
+    
+    Args:
+        folder: Folder to list
+        ext_tuple: Tuple of lowercase extensions to match
+        with_inodes: Return subfolders as (inode, path) pairs
+        
+    Returns:
+        tuple: (list of matching file paths, list of subfolder paths, warning
+        message or None). The warning is returned rather than logged because
+        this may run on a pool thread, and logging writes to the UI.
+    """
+    files = []
+    subfolders = []
+    warning = None
     try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        # Anchor to the project root (parent of utils/) so paths resolve
-        # correctly regardless of the current working directory.
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir and with_inodes:
+                        subfolders.append((entry.inode(), entry.path))
+                        continue
+                except OSError:
+                    # Entry vanished or can't be inspected; skip just this one
+                    continue
+                if is_dir:
+                    subfolders.append(entry.path)
+                elif entry.name.lower().endswith(ext_tuple):
+                    files.append(entry.path)
+    except PermissionError:
+        warning = f"[WARNING] Permission denied accessing folder: {folder}"
+    except OSError as e:
+        # A folder removed mid-scan or an unreachable share shouldn't end the whole walk
+        warning = f"[WARNING] Failed to scan folder {folder}: {str(e)}"
+    return files, subfolders, warning
+
+def _iter_audio_files_parallel(root, ext_tuple, max_workers):
+    """
+    Yield the audio files below a folder, listing folders on a thread pool.
     
-    return os.path.join(base_path, relative_path)
+    Each folder's subfolders are submitted as soon as its listing is consumed,
+    so the workers read ahead while files are yielded in the same depth-first
+    order as the sequential walk. Warnings are logged here, on the consuming
+    thread.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = [executor.submit(_scan_folder, root, ext_tuple)]
+        try:
+            while pending:
+                files, subfolders, warning = pending.pop().result()
+                if warning:
+                    log_message(warning)
+                pending.extend(executor.submit(_scan_folder, subfolder, ext_tuple) for subfolder in reversed(subfolders))
+                yield from files
+        finally:
+            # A consumer that stops early shouldn't wait for listings it won't use
+            for future in pending:
+                future.cancel()
+
+def iter_audio_files(root, ext_tuple):
+    """
+    Recursively yield the audio files below a folder.
+    
+    Folders are listed with os.scandir; DirEntry caches the type information
+    from the directory read, so no extra stat call is made per entry. When
+    Config.FILE_SCAN["SEEK_ORDERED_WALK"] is on, folders are visited in inode
+    order (fewer seeks on hard drives); otherwise, when
+    Config.FILE_SCAN["PARALLEL_WALK"] is on, the listings run on a thread pool.
+    
+    Args:
+        root: Folder to scan
+        ext_tuple: Tuple of lowercase extensions to match
+        
+    Yields:
+        str: Path of each matching file
+    """
+    if Config.FILE_SCAN["SEEK_ORDERED_WALK"]:
+        # Always descend into the lowest-numbered known folder next; inode
+        # numbers roughly follow on-disk placement on most file systems
+        pending = [(0, root)]
+        while pending:
+            files, subfolders, warning = _scan_folder(heapq.heappop(pending)[1], ext_tuple, with_inodes=True)
+            if warning:
+                log_message(warning)
+            for subfolder in subfolders:
+                heapq.heappush(pending, subfolder)
+            yield from files
+        return
+    
+    if Config.FILE_SCAN["PARALLEL_WALK"]:
+        yield from _iter_audio_files_parallel(root, ext_tuple, Config.FILE_SCAN["MAX_WORKERS"])
+        return
+    
+    # Depth-first, top-down like os.walk: subfolders are pushed in reverse so
+    # they are popped (and the table filled) in directory listing order
+    pending = [root]
+    while pending:
+        files, subfolders, warning = _scan_folder(pending.pop(), ext_tuple)
+        if warning:
+            log_message(warning)
+        pending.extend(reversed(subfolders))
+        yield from files
 
 def select_files(file_type_description, supported_extensions, file_list_var=None, count_var=None, update_table_func=None):
     """
@@ -73,7 +185,7 @@ def select_files(file_type_description, supported_extensions, file_list_var=None
 
 def select_folder(update_table_func=None, file_list_var=None, metadata_cache=None, 
                   processed_files=None, updated_files=None, selected_folders_var=None,
-                  supported_extensions=None, count_var=None):
+                  supported_extensions=None, count_var=None, stream_callbacks=None):
     """
     Open a dialog to select a folder and add all audio files inside it, including subfolders.
     
@@ -86,16 +198,28 @@ def select_folder(update_table_func=None, file_list_var=None, metadata_cache=Non
         selected_folders_var: Set to store selected folder paths
         supported_extensions: List of supported file extensions
         count_var: StringVar to update with file count
+        stream_callbacks: Optional dict to show files while the folder is still
+            being scanned (requires file_list_var):
+            - 'schedule': Tk after(ms, func), used to poll from the UI thread
+            - 'append_rows': Called on the UI thread with (batch, start_index)
+            - 'prepare_file': Optional, called per file on the scan thread
+              (e.g. to read its metadata there); must not touch shared state
+            - 'store_prepared': Optional, called on the UI thread with
+              (path, prepare_file result) before the file's row is added
+            - 'finish': Optional, called on the UI thread once the scan is done
     
     Returns:
-        List of found audio files
+        Number of audio files added when file_list_var is given (the files are
+        streamed straight into it), otherwise the list of found audio files.
+        When streaming, the scan continues in the background and 0 is returned.
     """
     folder_selected = filedialog.askdirectory()
     if not folder_selected:
-        return []
+        return 0 if file_list_var is not None else []
         
     # Clear existing data if variables provided
     if file_list_var is not None:
+        cancel_file_scan()  # A previous streamed scan must not add to the new list
         file_list_var.clear()
     if metadata_cache is not None:
         metadata_cache.clear()
@@ -108,26 +232,195 @@ def select_folder(update_table_func=None, file_list_var=None, metadata_cache=Non
     if selected_folders_var is not None:
         selected_folders_var.add(folder_selected)
         
-    # Find all matching files recursively
-    found_files = []
-    for root, _, files in os.walk(folder_selected):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in supported_extensions):
-                found_files.append(os.path.join(root, file))
-                
-    # Update file list if provided
-    if file_list_var is not None:
-        file_list_var.extend(found_files)
-        
-        # Update counter if provided
-        if count_var:
-            count_var.set(f"{len(file_list_var)}/{len(file_list_var)}")
-            
-        # Update UI if function provided  
+    # Find all matching files recursively (str.endswith takes the whole suffix tuple)
+    ext_tuple = tuple(ext.lower() for ext in supported_extensions)
+    found_files = iter_audio_files(folder_selected, ext_tuple)
+    
+    # Without a target list, hand the files back to the caller
+    if file_list_var is None:
+        return list(found_files)
+    
+    if stream_callbacks:
+        # Show the (now empty) list right away, then fill it as the scan goes
         if update_table_func:
             update_table_func()
-            
-    return found_files
+        _stream_files(found_files, file_list_var, count_var, stream_callbacks)
+        return 0
+    
+    # Stream the files into the list without building an intermediate copy
+    file_list_var.extend(found_files)
+    
+    # Update counter if provided
+    if count_var:
+        count_var.set(f"{len(file_list_var)}/{len(file_list_var)}")
+        
+    # Update UI if function provided  
+    if update_table_func:
+        update_table_func()
+        
+    return len(file_list_var)
+
+# A scan hands its files to the UI every STREAM_BATCH_SIZE files or
+# STREAM_BATCH_INTERVAL seconds, whichever comes first
+STREAM_BATCH_SIZE = 500
+STREAM_BATCH_INTERVAL = 0.1
+STREAM_POLL_MS = 50
+
+# Bumped whenever the file list is replaced; a streamed scan started under an
+# older value stops reading and its remaining batches are dropped
+_scan_generation = 0
+
+def cancel_file_scan():
+    """Abandon any streamed folder scan that is still running."""
+    global _scan_generation
+    _scan_generation += 1
+
+def _stream_files(found_files, file_list_var, count_var, stream_callbacks):
+    """
+    Scan on a background thread and add the files to the UI in batches.
+    
+    The scan thread only produces batches; file_list_var, the table, the
+    counter and whatever store_prepared fills are only touched from the UI
+    thread, inside the scheduled poll. Messages logged on the scan thread (walk
+    warnings, unreadable files) travel through the same queue and are logged
+    by the poll too. Starting a scan cancels the previous one.
+    
+    Args:
+        found_files: Iterator of audio file paths (consumed on the scan thread)
+        file_list_var: List the files are appended to
+        count_var: Optional StringVar to update with file count
+        stream_callbacks: Callback dict, see select_folder
+    """
+    schedule = stream_callbacks['schedule']
+    append_rows = stream_callbacks['append_rows']
+    prepare_file = stream_callbacks.get('prepare_file')
+    store_prepared = stream_callbacks.get('store_prepared')
+    finish = stream_callbacks.get('finish')
+    batches = queue.Queue()
+    cancel_file_scan()
+    generation = _scan_generation
+    
+    def scan():
+        with redirected_logging(lambda message, log_type: batches.put((message, log_type))):
+            produce()
+    
+    def produce():
+        batch = []
+        deadline = time.monotonic() + STREAM_BATCH_INTERVAL
+        try:
+            for path in found_files:
+                if generation != _scan_generation:
+                    batch = []
+                    break
+                batch.append((path, prepare_file(path) if prepare_file else None))
+                if len(batch) >= STREAM_BATCH_SIZE or time.monotonic() >= deadline:
+                    batches.put(batch)
+                    batch = []
+                    deadline = time.monotonic() + STREAM_BATCH_INTERVAL
+        except Exception as e:
+            log_message(f"[ERROR] Folder scan failed: {str(e)}")
+        finally:
+            if batch:
+                batches.put(batch)
+            batches.put(None)  # End of scan
+    
+    def poll():
+        while True:
+            if generation != _scan_generation:
+                return  # Superseded: drop whatever this scan still produces
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                schedule(STREAM_POLL_MS, poll)
+                return
+            if batch is None:
+                break
+            if isinstance(batch, tuple):
+                log_message(*batch)  # (message, log_type) logged on the scan thread
+                continue
+            if store_prepared:
+                for path, prepared in batch:
+                    store_prepared(path, prepared)
+            paths = [path for path, _ in batch]
+            start_index = len(file_list_var)
+            file_list_var.extend(paths)
+            append_rows(paths, start_index)
+            if count_var:
+                count_var.set(f"{len(file_list_var)}/{len(file_list_var)}")
+        
+        log_message(f"[INFO] Added {len(file_list_var)} audio files to the list")
+        if finish:
+            finish()
+    
+    threading.Thread(target=scan, daemon=True).start()
+    schedule(STREAM_POLL_MS, poll)
+
+# Batches smaller than this are stat'ed inline; a thread pool only pays off
+# when there are enough paths (or a slow network share) to overlap
+_PARALLEL_STAT_THRESHOLD = 32
+
+def _stat_mode(path):
+    """Return a path's st_mode, or None if it can't be stat'ed."""
+    try:
+        return os.stat(path).st_mode
+    except OSError:
+        return None
+
+def _stat_modes(paths):
+    """
+    Stat a batch of paths, overlapping the calls on a thread pool for large batches.
+    
+    Args:
+        paths: List of paths to stat
+        
+    Returns:
+        list: st_mode for each path (None where the stat failed), in input order
+    """
+    if len(paths) < _PARALLEL_STAT_THRESHOLD:
+        return [_stat_mode(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=Config.FILE_SCAN["MAX_WORKERS"]) as executor:
+        return list(executor.map(_stat_mode, paths))
+
+def _split_dnd_paths(data):
+    """
+    Split drag-and-drop data into path tokens in a single left-to-right scan.
+    
+    Recognizes quoted paths and paths between braces (both may contain spaces),
+    plus bare drive ("C:\\...") and UNC ("\\\\server\\...") paths, which end at
+    the next whitespace. Other bare tokens are ignored. Each step jumps to the
+    next delimiter with str.find, so no regex is involved.
+    
+    Args:
+        data: Raw data string from the drop event
+        
+    Returns:
+        list: Path strings in the order they appear
+    """
+    paths = []
+    i = 0
+    n = len(data)
+    while i < n:
+        char = data[i]
+        if char in _DROP_SEPARATORS:
+            i += 1
+        elif char == '{' or char == '"':
+            close = data.find('}' if char == '{' else '"', i + 1)
+            if close == -1:
+                close = n
+            if close > i + 1:
+                paths.append(data[i + 1:close])
+            i = close + 1
+        else:
+            end = n
+            for separator in _DROP_SEPARATORS:
+                found = data.find(separator, i, end)
+                if found != -1:
+                    end = found
+            token = data[i:end]
+            if token.startswith('\\\\') or (token[1:3] in (':\\', ':/') and token[0].isalpha()):
+                paths.append(token)
+            i = end
+    return paths
 
 def handle_drop(files, file_list_var=None, processed_files=None, updated_files=None, 
                selected_folders_var=None, metadata_cache=None, table=None,
@@ -135,6 +428,9 @@ def handle_drop(files, file_list_var=None, processed_files=None, updated_files=N
     """
     Handle dropped files and add them to the file list.
     """
+    # A streamed folder scan still running must not add to the new list
+    cancel_file_scan()
+    
     # Clear all data structures if provided
     if file_list_var is not None:
         file_list_var.clear()
@@ -151,60 +447,44 @@ def handle_drop(files, file_list_var=None, processed_files=None, updated_files=N
     if table:
         table.delete(*table.get_children())
     
+    # Drop diagnostics follow Config.DEBUG_LOGGING; checked once so big drops
+    # don't format thousands of path strings when debug logging is off
+    debug_drop = debug_enabled()
+    
     # Log the raw data for debugging
-    log_message(f"[DEBUG] Raw dropped data: {files}")
+    if debug_drop:
+        log_message(f"[DEBUG] Raw dropped data: {files}")
     
     # New approach: extract ALL possible paths regardless of format
     dropped_paths = []
     
     if files:
-        # Extract paths using different methods and combine results
-        
-        # 1. First look for quoted paths (for folders with spaces)
-        quoted_paths = []
-        if '"' in files:
-            quoted_matches = re.findall(r'"([^"]+)"', files)
-            for path in quoted_matches:
-                if os.path.exists(path):
-                    quoted_paths.append(path)
-                    log_message(f"[DEBUG] Found quoted path: '{path}'")
-        
-        # 2. Look for paths between braces
-        brace_paths = []
-        if '{' in files and '}' in files:
-            brace_matches = re.findall(r'\{([^}]+)\}', files)
-            for path in brace_matches:
-                if os.path.exists(path):
-                    brace_paths.append(path)
-                    log_message(f"[DEBUG] Found brace path: '{path}'")
+        # Extract paths with one token scan plus an optional line split:
+        # 1. Quoted paths (for folders with spaces)
+        # 2. Paths between braces
+        # 3. Bare drive and UNC paths (for folders without spaces), up to the next space
+        # 4. Paths in newline-separated format (lines may contain spaces, so they
+        #    can't share the token scan without swallowing the other forms)
+        candidates = itertools.chain(
+            _split_dnd_paths(files),
+            (line.strip().strip('"') for line in files.splitlines()) if '\n' in files else ()
+        )
         
-        # 3. Look for basic Windows drive paths (for folders without spaces)
-        # This captures paths that start with drive letter and colon, and doesn't have a space until the next quote
-        drive_paths = []
-        basic_path_matches = re.findall(r'([A-Za-z]:[/\\][^ "\r\n{}\[\]]*)', files)
-        for path in basic_path_matches:
-            if os.path.exists(path):
-                drive_paths.append(path)
-                log_message(f"[DEBUG] Found basic drive path: '{path}'")
-        
-        # 4. Look for paths in newline-separated format
-        newline_paths = []
-        if '\n' in files or '\r\n' in files:
-            for line in re.split(r'\r?\n', files):
-                clean_line = line.strip().strip('"')
-                if clean_line and os.path.exists(clean_line):
-                    newline_paths.append(clean_line)
-                    log_message(f"[DEBUG] Found newline path: '{clean_line}'")
-        
-        # Combine all paths but remove duplicates while preserving order
+        # Keep the first occurrence of each normalized path; existence is settled
+        # by the single stat each path gets when it is processed below
         all_paths = []
         seen = set()
         
-        for path in quoted_paths + brace_paths + drive_paths + newline_paths:
+        for path in candidates:
+            if not path:
+                continue
             norm_path = os.path.normpath(path)
-            if norm_path not in seen:
-                seen.add(norm_path)
-                all_paths.append(path)
+            if norm_path in seen:
+                continue
+            seen.add(norm_path)
+            all_paths.append(path)
+            if debug_drop:
+                log_message(f"[DEBUG] Found dropped path: '{path}'")
         
         # Remove parent directories if their child directories are also in the list
         # This prevents adding files from parent folders when only the child was dragged
@@ -220,7 +500,8 @@ def handle_drop(files, file_list_var=None, processed_files=None, updated_files=N
                     # We need to ensure it's a directory boundary, not just a prefix
                     if norm_other.startswith(norm_path + os.sep):
                         is_parent = True
-                        log_message(f"[DEBUG] Excluding parent path '{path}' because child '{other_path}' exists")
+                        if debug_drop:
+                            log_message(f"[DEBUG] Excluding parent path '{path}' because child '{other_path}' exists")
                         break
             
             if not is_parent:
@@ -228,96 +509,356 @@ def handle_drop(files, file_list_var=None, processed_files=None, updated_files=N
                 
         dropped_paths = filtered_paths
     
-    log_message(f"[DEBUG] Found {len(dropped_paths)} valid paths to process")
+    if debug_drop:
+        log_message(f"[DEBUG] Found {len(dropped_paths)} candidate paths to process")
     
-    # Process each dropped path (could be file or folder)
-    all_files = []
-    for path in dropped_paths:
+    # Process each dropped path (could be file or folder), streaming the found
+    # files straight into the target list when one is provided
+    ext_tuple = tuple(ext.lower() for ext in supported_extensions)
+    all_files = file_list_var if file_list_var is not None else []
+    start_count = len(all_files)
+    # One stat per path answers both "does it exist" and "file or folder";
+    # the stats are issued together up front so large drops overlap them
+    for path, mode in zip(dropped_paths, _stat_modes(dropped_paths)):
         try:
-            if os.path.isdir(path):
+            if mode is None:
+                # Partial matches (e.g. a drive path cut at a space) land here
+                if debug_drop:
+                    log_message(f"[DEBUG] Skipping missing path: '{path}'")
+                continue
+            
+            if stat.S_ISDIR(mode):
                 # It's a folder - add it to selected folders if tracking
                 if selected_folders_var is not None:
                     selected_folders_var.add(path)
-                log_message(f"[DEBUG] Processing folder: '{path}'")
+                if debug_drop:
+                    log_message(f"[DEBUG] Processing folder: '{path}'")
                 
                 # Find all audio files recursively
-                folder_files = []
-                for root, _, files in os.walk(path):
-                    for file in files:
-                        if any(file.lower().endswith(ext) for ext in supported_extensions):
-                            full_path = os.path.join(root, file)
-                            folder_files.append(full_path)
-                            
-                log_message(f"[DEBUG] Found {len(folder_files)} audio files in folder '{path}'")
-                all_files.extend(folder_files)
+                before = len(all_files)
+                all_files.extend(iter_audio_files(path, ext_tuple))
+                if debug_drop:
+                    log_message(f"[DEBUG] Found {len(all_files) - before} audio files in folder '{path}'")
                 
-            elif os.path.isfile(path) and any(path.lower().endswith(ext) for ext in supported_extensions):
+            elif stat.S_ISREG(mode) and path.lower().endswith(ext_tuple):
                 # It's a supported audio file
                 all_files.append(path)
-                log_message(f"[DEBUG] Added file: '{path}'")
+                if debug_drop:
+                    log_message(f"[DEBUG] Added file: '{path}'")
         except Exception as e:
             log_message(f"[ERROR] Failed to process path {path}: {str(e)}")
     
-    # Update file list if provided
-    if file_list_var is not None:
-        file_list_var.extend(all_files)
-        
-        # Update counter if provided
-        if count_var:
-            count_var.set(f"{len(file_list_var)}/{len(file_list_var)}")
+    added_count = len(all_files) - start_count
+    
+    # Update counter if provided
+    if file_list_var is not None and count_var:
+        count_var.set(f"{len(file_list_var)}/{len(file_list_var)}")
     
     # Update UI if function provided
     if update_table_func:
         update_table_func()
         
-    log_message(f"[INFO] Added {len(all_files)} audio files to the list")
-    return all_files
+    log_message(f"[INFO] Added {added_count} audio files to the list")
+    return added_count if file_list_var is not None else all_files
+
+# Mutagen (module, class) for each supported extension
+_AUDIO_HANDLERS = {
+    '.mp3': ('mutagen.mp3', 'MP3'),
+    '.flac': ('mutagen.flac', 'FLAC'),
+    '.m4a': ('mutagen.mp4', 'MP4'),
+    '.mp4': ('mutagen.mp4', 'MP4'),
+    '.ogg': ('mutagen.oggvorbis', 'OggVorbis'),
+    '.wma': ('mutagen.asf', 'ASF'),
+    '.wav': ('mutagen.wave', 'WAVE'),
+}
+
+@lru_cache(maxsize=None)
+def _resolve_audio_handler(ext):
+    """Import and return the Mutagen class for an extension, or None if unsupported."""
+    handler = _AUDIO_HANDLERS.get(ext)
+    if handler is None:
+        return None
+    module_name, class_name = handler
+    return getattr(importlib.import_module(module_name), class_name)
 
-def get_audio_file(file_path):
+def get_audio_file(file_path, ext=None):
     """
     Helper function to safely get an audio file object with appropriate tag handling.
     
+    Parsed objects are cached per file version (modification time and size), so
+    repeated lookups of an unchanged file skip the mutagen parse, while any save
+    to the file naturally produces a fresh object on the next call.
+    
     Args:
         file_path: Path to the audio file
+        ext: Lowercase extension of the file, if the caller already knows it
         
     Returns:
         Audio file object with the appropriate type based on file extension
     """
+    if ext is None:
+        ext = file_extension(file_path)
+    
+    # Unsupported files are rejected before touching the file system
+    if ext not in _AUDIO_HANDLERS:
+        log_message(f"[ERROR] Unsupported file type: {ext}")
+        return None
+    
     try:
-        # Get the file extension
-        ext = os.path.splitext(file_path)[1].lower()
+        st = os.stat(file_path)
+    except OSError as e:
+        log_message(f"[ERROR] Failed to load audio file {file_path}: {str(e)}")
+        return None
+    return _cached_audio_file(file_path, st.st_mtime_ns, st.st_size, ext, _audio_generations.get(file_path, 0))
+
+def file_extension(file_path):
+    """Return the lowercase extension of a path (including the dot), or ''."""
+    return os.path.splitext(file_path)[1].lower()
+
+# Per-path counter that is part of the cache key, so one file's cached object
+# can be dropped without clearing the whole cache
+_audio_generations = {}
+
+@lru_cache(maxsize=256)
+def _cached_audio_file(file_path, mtime_ns, size, ext, generation=0):
+    """Load an audio file once per (path, mtime, size, generation) version."""
+    return _load_audio_file(file_path, ext)
+
+def evict_audio_file(file_path):
+    """
+    Stop handing out the cached object for one file.
+    
+    Used when an object is passed to another thread (e.g. a queued save), so
+    later get_audio_file callers get their own copy instead of sharing it.
+    
+    Args:
+        file_path: Path of the file whose cached object should be dropped
+    """
+    _audio_generations[file_path] = _audio_generations.get(file_path, 0) + 1
+
+def flush_audio_cache():
+    """
+    Drop every cached audio object.
+    
+    Saved files get new cache keys on their own; this is for objects whose
+    in-memory tags no longer match the file, e.g. after a failed save.
+    """
+    _cached_audio_file.cache_clear()
+
+# Read buffer used when parsing tags
+LOAD_BUFFER_SIZE = 64 * 1024
+
+def _load_audio_file(file_path, ext=None):
+    """
+    Load an audio file object with the handler matching its extension.
+    
+    Args:
+        file_path: Path to the audio file
+        ext: Lowercase extension of the file (computed from the path if omitted)
+        
+    Returns:
+        Audio file object or None if loading failed
+    """
+    try:
+        # Get the file extension unless the caller already resolved it
+        if ext is None:
+            ext = file_extension(file_path)
         
         # Use appropriate handler based on file type
-        if ext == '.mp3':
-            # For MP3, first try to load with MP3
-            audio = MP3(file_path)
-            
-            # Ensure ID3 tags exist
-            if audio.tags is None:
-                try:
-                    audio.add_tags()
-                except mutagen.MutagenError:
-                    pass  # Tags already exist
-            
-            return audio
-            
-        elif ext == '.flac':
-            return FLAC(file_path)
-        elif ext in ['.m4a', '.mp4']:
-            return MP4(file_path)
-        elif ext == '.ogg':
-            return OggVorbis(file_path)
-        elif ext == '.wma':
-            return ASF(file_path)
-        elif ext == '.wav':
-            return WAVE(file_path)
-        else:
+        handler = _resolve_audio_handler(ext)
+        if handler is None:
             log_message(f"[ERROR] Unsupported file type: {ext}")
             return None
+        
+        # Parse through an explicitly sized buffer: on network shares Python
+        # picks a tiny default and mutagen's many small header reads each
+        # become a round trip
+        with open(file_path, 'rb', buffering=LOAD_BUFFER_SIZE) as fileobj:
+            audio = handler(fileobj)
+        # Objects loaded from a file object don't record where they came from
+        audio.filename = file_path
+        
+        # For MP3, ensure ID3 tags exist
+        if ext == '.mp3' and audio.tags is None:
+            try:
+                audio.add_tags()
+            except mutagen.MutagenError:
+                pass  # Tags already exist
+        
+        return audio
     except Exception as e:
         log_message(f"[ERROR] Failed to load audio file {file_path}: {str(e)}")
         return None
 
+# Destination folders already created (or found to exist) during the current
+# organize run; cleared at the start of each run
+_mkdir_cache = set()
+
+def clear_mkdir_cache():
+    """Forget the known destination folders, e.g. after folders were deleted externally."""
+    _mkdir_cache.clear()
+
+def ensure_directory(dir_path):
+    """Create a directory (and parents) unless it is already known to exist."""
+    if dir_path and dir_path not in _mkdir_cache:
+        os.makedirs(dir_path, exist_ok=True)
+        _mkdir_cache.add(dir_path)
+
+# Chunk size for cross-device copies on Windows, where shutil has no kernel
+# copy path and would otherwise loop in 1 MiB reads
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+def _copy_file_fast(src, dest):
+    """
+    Copy a file's data and timestamps for a cross-device move.
+    
+    Args:
+        src: Path of the file to copy
+        dest: Destination path of the copy
+    """
+    if os.name == 'nt':
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+    else:
+        # shutil.copyfile already uses sendfile / fcopyfile here
+        shutil.copyfile(src, dest)
+    shutil.copystat(src, dest)
+
+def move_file_to_destination(src, dest, create_dirs=True):
+    """
+    Move a file, creating its destination folder if needed.
+    
+    A same-volume move is a single atomic rename; only moves across devices
+    fall back to copying the file and deleting the original.
+    
+    Args:
+        src: Path of the file to move
+        dest: Destination path of the file
+        create_dirs: Whether to create the destination folder
+    """
+    dest_dir = os.path.dirname(dest)
+    if create_dirs:
+        ensure_directory(dest_dir)
+    try:
+        os.replace(src, dest)
+    except FileNotFoundError:
+        # The cached folder may have been removed since; create it again and retry
+        if not create_dirs or not os.path.exists(src) or os.path.isdir(dest_dir):
+            raise
+        _mkdir_cache.discard(dest_dir)
+        ensure_directory(dest_dir)
+        os.replace(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV and getattr(e, "winerror", None) != 17:  # 17: ERROR_NOT_SAME_DEVICE
+            raise
+        # Copy next to the destination under a name only this call uses, then
+        # rename it into place; a failure only ever removes that partial copy
+        partial = f"{dest}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            _copy_file_fast(src, partial)
+            os.replace(partial, dest)
+        except BaseException:
+            # Don't leave a partial copy behind; the original is untouched
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            raise
+        os.remove(src)
+
+def move_files_to_destinations(pairs, workers=None):
+    """
+    Move a batch of files in parallel.
+    
+    Moves are I/O bound (cross-device moves copy the whole file, and renames on
+    network shares wait on the server), so a thread pool overlaps them. All
+    destination folders are created up front so the workers never race on
+    os.makedirs, and only the first of several sources with the same
+    destination is moved; the others fail without touching the file system,
+    so no two workers ever write the same path.
+    
+    Args:
+        pairs: List of (source, destination) tuples
+        workers: Optional number of worker threads
+        
+    Returns:
+        list: (source, destination, error) for each pair in order; error is
+        None for a successful move, otherwise the exception raised
+    """
+    claimed = set()
+    collisions = set()
+    for index, (_, dest) in enumerate(pairs):
+        key = os.path.normcase(os.path.normpath(dest))
+        if key in claimed:
+            collisions.add(index)
+        claimed.add(key)
+    
+    for dest_dir in dict.fromkeys(os.path.dirname(dest) for _, dest in pairs):
+        try:
+            ensure_directory(dest_dir)
+        except OSError:
+            pass  # Reported by the move into that folder
+    
+    def move_one(indexed_pair):
+        index, (src, dest) = indexed_pair
+        if index in collisions:
+            return src, dest, FileExistsError(f"Another selected file is also being moved to {dest}")
+        try:
+            move_file_to_destination(src, dest, create_dirs=False)
+            return src, dest, None
+        except Exception as e:
+            return src, dest, e
+    
+    if len(pairs) < 2:
+        return [move_one(indexed_pair) for indexed_pair in enumerate(pairs)]
+    workers = workers or min(32, (os.cpu_count() or 4) * 4, len(pairs))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(move_one, enumerate(pairs)))
+
+# Write buffer used when saving tags, so mutagen's many small writes reach the
+# disk (or network share) as a few large sequential ones
+SAVE_BUFFER_SIZE = 256 * 1024
+
+# Minimum tag padding left after a save
+MIN_TAG_PADDING = 1024
+
+def _keep_padding(info):
+    """
+    Mutagen padding hook: keep existing padding (at least MIN_TAG_PADDING).
+    
+    Mutagen's default policy may trim surplus padding, which forces the next
+    larger tag edit to rewrite the whole file; keeping it lets later edits
+    fit in place.
+    """
+    return max(MIN_TAG_PADDING, info.padding)
+
+def save_audio_file(audio, file_path=None):
+    """
+    Save an audio file's tags through a large buffered file object.
+    
+    Args:
+        audio: Mutagen audio file object to save
+        file_path: Path of the file (defaults to the path the object was loaded from)
+    """
+    file_path = file_path or audio.filename
+    try:
+        try:
+            fileobj = open(file_path, 'r+b', buffering=SAVE_BUFFER_SIZE)
+        except OSError:
+            # Some file systems refuse read/write opens; let mutagen handle those itself
+            audio.save(padding=_keep_padding)
+            return
+        with fileobj:
+            audio.save(fileobj, padding=_keep_padding)
+    except Exception:
+        # The cached object now holds edits that never reached the file
+        flush_audio_cache()
+        raise
+
+# Translation table replacing the characters forbidden in Windows file names,
+# including the ASCII control characters (0x00-0x1F) Windows also rejects
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*' + ''.join(map(chr, range(32)))})
+
 def sanitize_filename(filename):
     """
     Sanitize filename by removing or replacing invalid characters.
@@ -328,12 +869,6 @@ def sanitize_filename(filename):
     Returns:
         Sanitized filename safe for use in file systems
     """
-    # Replace only the characters that are forbidden in Windows file names
-    forbidden_chars = ['<', '>', ':', '"', '/', '\\', '|', '?', '*']
-    for char in forbidden_chars:
-        filename = filename.replace(char, '_')
-    
-    # Remove leading/trailing spaces and dots
-    filename = filename.strip(' .')
-    
-    return filename
+    # Replace the characters that are forbidden in Windows file names in a single
+    # pass, then remove leading/trailing spaces and dots
+    return filename.translate(_SANITIZE_TABLE).strip(' .')
@@ -5,16 +5,52 @@ Provides functionality for image processing, conversion, and clipboard operation
 
 import io
 import os
+import base64
+import hashlib
+import struct
+from collections import OrderedDict
 from PIL import Image, ImageTk, ImageGrab
 import win32clipboard
 import win32con
 from utils.logging import log_message
-from utils.file_operations import resource_path
+from utils.file_operations import resource_path, get_audio_file
+from mutagen.mp3 import MP3
+from mutagen.flac import FLAC, Picture
+from mutagen.mp4 import MP4
+from mutagen.oggvorbis import OggVorbis
+from mutagen.asf import ASF
 
 # Global variable to store the original image data for internal copy-paste
 # This allows us to bypass clipboard compression/decompression entirely
 _original_image_data = None
 
+# Leading magic bytes of the image formats we may embed as album art
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+)
+
+def sniff_image_mime(image_data, default='image/jpeg'):
+    """
+    Determine an image's mime type from its header bytes, without decoding it.
+    
+    Args:
+        image_data: Image data in bytes
+        default: Mime type to return when the format is not recognised
+        
+    Returns:
+        str: The detected mime type
+    """
+    for signature, mime_type in _IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return mime_type
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'image/webp'
+    return default
+
 def copy_image_to_clipboard(image_data):
     """
     Copies an image to the system clipboard.
@@ -37,10 +73,17 @@ def copy_image_to_clipboard(image_data):
         # Create an image from the data
         img = Image.open(io.BytesIO(image_data))
         
-        # Convert to bitmap format for Windows clipboard
-        output = io.BytesIO()
-        img.convert("RGB").save(output, "BMP")
-        data = output.getvalue()[14:]  # The file header for BMP is 14 bytes
+        # Build the CF_DIB payload directly: a BITMAPINFOHEADER followed by
+        # 32-bit BGRA rows. Four bytes per pixel needs no row padding, and the
+        # raw encoder writes the rows bottom-up itself, so no BMP encoder runs.
+        # The fourth byte carries real alpha (255 for opaque images): apps that
+        # read it as alpha would otherwise paste a fully transparent image
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        width, height = img.size
+        pixels = img.tobytes("raw", "BGRA", 0, -1)
+        header = struct.pack('<IiiHHIIiiII', 40, width, height, 1, 32, 0, len(pixels), 0, 0, 0, 0)
+        data = header + pixels
         
         # Place on system clipboard
         win32clipboard.OpenClipboard()
@@ -58,6 +101,26 @@ def copy_image_to_clipboard(image_data):
         if clipboard_opened:
             win32clipboard.CloseClipboard()
 
+# Default "no cover" PhotoImages keyed by (path, size); the placeholder never
+# changes, so it is decoded and resized only once per session
+_default_photos = {}
+
+def _release_photo(photo):
+    """Idle callback whose only job is to drop the last reference to a replaced image."""
+
+def _show_photo(label, photo):
+    """
+    Point a label at a PhotoImage and keep it alive.
+    
+    The image the label showed before is released from an idle callback, so
+    freeing its Tk image happens after the repaint instead of during it.
+    """
+    previous = getattr(label, 'image', None)
+    label.configure(image=photo)
+    label.image = photo  # Keep a reference!
+    if previous is not None and previous is not photo:
+        label.after_idle(_release_photo, previous)
+
 def load_default_album_art(default_image_path, label=None, size=(240, 240)):
     """
     Load the default album art image.
@@ -71,68 +134,80 @@ def load_default_album_art(default_image_path, label=None, size=(240, 240)):
         PhotoImage: The loaded image as a PhotoImage object
     """
     try:
-        # Try to load the placeholder image from resources
-        placeholder_path = resource_path(default_image_path)
-        if os.path.exists(placeholder_path):
+        photo = _default_photos.get((default_image_path, size))
+        if photo is None:
+            # Try to load the placeholder image from resources
+            placeholder_path = resource_path(default_image_path)
+            if not os.path.exists(placeholder_path):
+                log_message(f"[WARNING] Default album art not found at {placeholder_path}")
+                if label:
+                    label.configure(image='')
+                return None
             img = Image.open(placeholder_path)
             img = img.resize(size, Image.Resampling.LANCZOS)
             photo = ImageTk.PhotoImage(img)
+            _default_photos[(default_image_path, size)] = photo
+        
+        # Update the label if provided
+        if label:
+            _show_photo(label, photo)
             
-            # Update the label if provided
-            if label:
-                label.configure(image=photo)
-                label.image = photo  # Keep a reference!
-                
-            return photo
-        else:
-            log_message(f"[WARNING] Default album art not found at {placeholder_path}")
-            if label:
-                label.configure(image='')
-            return None
+        return photo
     except Exception as e:
         log_message(f"[ERROR] Failed to load default album art: {str(e)}")
         if label:
             label.configure(image='')
         return None
 
-def update_album_art_display(image_data, label, size=240, load_default_func=None):
+# Largest display size resampled with the cheaper bilinear filter by default
+_THUMBNAIL_MAX_SIZE = 256
+
+def _fit_cover(image_data, size, high_quality=False):
     """
-    Update the album art display with the provided image data.
+    Decode an image and scale/crop it to fill a size x size square.
     
     Args:
         image_data: Image data in bytes
-        label: The tkinter Label widget to update
         size: Size of the album art (square)
-        load_default_func: Optional function to call if loading fails
+        high_quality: Resample with LANCZOS even for thumbnail sizes
         
     Returns:
-        PhotoImage: The created PhotoImage object, or None if failed
+        Image: The fitted PIL image
     """
-    try:
-        log_message(f"[COVER] Processing image data: {len(image_data)} bytes")
-        
-        # Open the image data
-        img_buffer = io.BytesIO(image_data)
-        img = Image.open(img_buffer)
-        log_message(f"[COVER] Image opened successfully: {img.format}, {img.size}, {img.mode}")
-        
-        # Instead of thumbnail which may leave empty space, we'll resize with padding
-        # to ensure the image fills the entire space while maintaining aspect ratio
-        
-        # Calculate the scaling factor to fill the container
-        width, height = img.size
-        width_ratio = size / width
-        height_ratio = size / height
-        
-        # Use the larger ratio to ensure the image fills the space
-        ratio = max(width_ratio, height_ratio)
-        
-        # Calculate new dimensions
-        new_width = round(width * ratio)
-        new_height = round(height * ratio)
+    # Open the image data
+    img_buffer = io.BytesIO(image_data)
+    img = Image.open(img_buffer)
+    log_message(f"[COVER] Image opened successfully: {img.format}, {img.size}, {img.mode}")
+    
+    # Instead of thumbnail which may leave empty space, we'll resize with padding
+    # to ensure the image fills the entire space while maintaining aspect ratio
+    
+    # Calculate the scaling factor to fill the container
+    width, height = img.size
+    width_ratio = size / width
+    height_ratio = size / height
+    
+    # Use the larger ratio to ensure the image fills the space
+    ratio = max(width_ratio, height_ratio)
+    
+    # Calculate new dimensions
+    new_width = round(width * ratio)
+    new_height = round(height * ratio)
+    
+    # Image.open only parsed the header so far, so covers that are already
+    # the display size are shown without any resampling
+    if (width, height) != (size, size):
+        # Let the JPEG decoder downscale by a power of two while decoding
+        # (it never goes below the requested size), leaving less for LANCZOS
+        img.draft(None, (new_width, new_height))
         
-        # Resize the image (will be larger than container in one dimension)
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Resize the image (will be larger than container in one dimension);
+        # at thumbnail sizes bilinear looks the same as LANCZOS for a fraction of the work
+        if high_quality or size > _THUMBNAIL_MAX_SIZE:
+            resample = Image.Resampling.LANCZOS
+        else:
+            resample = Image.Resampling.BILINEAR
+        img = img.resize((new_width, new_height), resample)
         
         # If image is larger than container, crop it to center
         if new_width > size or new_height > size:
@@ -143,6 +218,43 @@ def update_album_art_display(image_data, label, size=240, load_default_func=None
             img = img.crop((left, top, right, bottom))
         
         log_message(f"[COVER] Image resized and cropped to fill {size}x{size}")
+    else:
+        img.load()
+    
+    return img
+
+# Recently shown covers as ready-made PhotoImages, keyed by (image digest,
+# size, quality), so flicking between tracks of the same album skips Pillow
+# entirely and just points the label at an existing Tk image
+_COVER_CACHE_SIZE = 64
+_cover_photos = OrderedDict()
+
+def update_album_art_display(image_data, label, size=240, load_default_func=None, high_quality=False):
+    """
+    Update the album art display with the provided image data.
+    
+    Args:
+        image_data: Image data in bytes
+        label: The tkinter Label widget to update
+        size: Size of the album art (square)
+        load_default_func: Optional function to call if loading fails
+        high_quality: Resample with LANCZOS even for thumbnail sizes
+        
+    Returns:
+        PhotoImage: The created PhotoImage object, or None if failed
+    """
+    try:
+        log_message(f"[COVER] Processing image data: {len(image_data)} bytes")
+        
+        key = (hashlib.blake2b(image_data, digest_size=16).digest(), size, high_quality)
+        photo = _cover_photos.get(key)
+        if photo is not None:
+            _cover_photos.move_to_end(key)
+            _show_photo(label, photo)
+            log_message(f"[COVER] Album cover label updated with cached {size}x{size} image")
+            return photo
+        
+        img = _fit_cover(image_data, size, high_quality)
         
         # Create a PhotoImage object
         try:
@@ -150,9 +262,13 @@ def update_album_art_display(image_data, label, size=240, load_default_func=None
             log_message(f"[COVER] PhotoImage created successfully")
             
             # Update the label
-            label.configure(image=photo)
+            _show_photo(label, photo)
             log_message(f"[COVER] Album cover label updated with new image")
             
+            _cover_photos[key] = photo
+            if len(_cover_photos) > _COVER_CACHE_SIZE:
+                _cover_photos.popitem(last=False)
+            
             return photo
         except Exception as e:
             log_message(f"[COVER] Failed to create or apply PhotoImage: {e}")
@@ -208,6 +324,36 @@ def paste_image_from_clipboard():
         log_message(f"[ERROR] Failed to paste image from clipboard: {str(e)}")
         return None
 
+def _parse_asf_picture(value):
+    """
+    Get the image bytes out of a WM/Picture attribute value.
+    
+    The value is a picture type byte, the image size as a little-endian DWORD,
+    a null-terminated UTF-16LE MIME type and description, then the image.
+    
+    Args:
+        value: Raw WM/Picture attribute bytes
+        
+    Returns:
+        bytes: The image data, or None if the value is malformed
+    """
+    if len(value) < 5:
+        return None
+    (size,) = struct.unpack_from('<I', value, 1)
+    offset = 5
+    # Skip the MIME type and the description (UTF-16 null is two zero bytes on an even offset)
+    for _ in range(2):
+        end = offset
+        while True:
+            end = value.find(b'\x00\x00', end)
+            if end == -1:
+                return None
+            if (end - offset) % 2 == 0:
+                break
+            end += 1
+        offset = end + 2
+    return value[offset:offset + size]
+
 def extract_album_art_from_file(file_path, audio_file=None):
     """
     Extract album art from an audio file.
@@ -220,38 +366,14 @@ def extract_album_art_from_file(file_path, audio_file=None):
         bytes: Image data in bytes if found, None otherwise
     """
     try:
-        import mutagen
-        from mutagen.mp3 import MP3
-        from mutagen.flac import FLAC
-        from mutagen.mp4 import MP4
-        from mutagen.oggvorbis import OggVorbis
-        from mutagen.asf import ASF
-        
-        # If audio_file is not provided, load it
+        # If audio_file is not provided, load it through the shared (cached) loader
         if audio_file is None:
-            # Get the file extension
             if not file_path:
                 log_message(f"[ERROR] Invalid file path: empty or None")
                 return None
-                
-            ext = os.path.splitext(file_path)[1].lower()
-            if not ext:
-                log_message(f"[ERROR] File has no extension: {file_path}")
-                return None
             
-            # Use appropriate handler based on file type
-            if ext == '.mp3':
-                audio_file = MP3(file_path)
-            elif ext == '.flac':
-                audio_file = FLAC(file_path)
-            elif ext in ['.m4a', '.mp4']:
-                audio_file = MP4(file_path)
-            elif ext == '.ogg':
-                audio_file = OggVorbis(file_path)
-            elif ext == '.wma':
-                audio_file = ASF(file_path)
-            else:
-                log_message(f"[ERROR] Unsupported file type: {ext} for {os.path.basename(file_path)}")
+            audio_file = get_audio_file(file_path)
+            if audio_file is None:
                 return None
         
         # Extract album art based on file type
@@ -273,22 +395,15 @@ def extract_album_art_from_file(file_path, audio_file=None):
                 return audio_file['covr'][0]
         
         elif isinstance(audio_file, OggVorbis):
-            # Ogg files might have METADATA_BLOCK_PICTURE
+            # Ogg files might have METADATA_BLOCK_PICTURE (a base64 FLAC picture block)
             if 'metadata_block_picture' in audio_file:
-                import base64
-                data = base64.b64decode(audio_file['metadata_block_picture'][0])
-                # Skip the header to get just the image data
-                # This is a simplification - proper implementation would parse the header
-                return data[32:]  # Skip the FLAC picture header
+                picture = Picture(base64.b64decode(audio_file['metadata_block_picture'][0]))
+                return picture.data
         
         elif isinstance(audio_file, ASF):
             # WMA files use WM/Picture
             if 'WM/Picture' in audio_file:
-                # The format is complex, this is a simplification
-                picture_data = audio_file['WM/Picture'][0].value
-                # Skip the ASF picture header to get just the image data
-                # This is a simplification - proper implementation would parse the header
-                return picture_data[50:]  # Skip the ASF picture header
+                return _parse_asf_picture(audio_file['WM/Picture'][0].value)
         
         log_message(f"[INFO] No album art found in file: {os.path.basename(file_path)}")
         return None
@@ -296,3 +411,18 @@ def extract_album_art_from_file(file_path, audio_file=None):
     except Exception as e:
         log_message(f"[ERROR] Failed to extract album art: {str(e)}")
         return None
+
+def load_audio_and_art(file_path):
+    """
+    Load an audio file and extract its album art in one call.
+    
+    Args:
+        file_path: Path to the audio file
+        
+    Returns:
+        tuple: (audio file object or None, image data in bytes or None)
+    """
+    audio_file = get_audio_file(file_path)
+    if audio_file is None:
+        return None, None
+    return audio_file, extract_album_art_from_file(file_path, audio_file)
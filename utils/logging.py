@@ -1,161 +1,316 @@
-"""
-Logging utilities for the application.
-Provides functionality for logging messages to UI text widgets or console.
-"""
-
-import tkinter as tk
-
-class Logger:
-    """
-    Logger class that handles sending messages to UI text widgets with fallback to console.
-    Supports different log types and special formatting for success/failure messages.
-    """
-    def __init__(self):
-        """Initialize the logger with empty widget references."""
-        self.debug_widget = None
-        self.processing_widget = None
-        
-    def set_debug_widget(self, widget):
-        """Set the widget for debug messages."""
-        self.debug_widget = widget
-        
-    def set_processing_widget(self, widget):
-        """Set the widget for processing messages."""
-        self.processing_widget = widget
-    
-    def clear_logs(self, app=None, debug_scrollbar=None, processing_scrollbar=None):
-        """Clear both log widgets and reset their scrollbars."""
-        # Clear processing log box if it exists
-        if self.processing_widget:
-            self.processing_widget.configure(state="normal")
-            self.processing_widget.delete("1.0", "end")
-            self.processing_widget.configure(state="disabled")
-            
-            # Force scrollbar update for processing log
-            if processing_scrollbar:
-                self.processing_widget.yview_moveto(0)
-                autohide_scrollbar(processing_scrollbar, 0, 1)
-        
-        # Clear debug log box if it exists
-        if self.debug_widget:
-            self.debug_widget.configure(state="normal")
-            self.debug_widget.delete("1.0", "end")
-            self.debug_widget.configure(state="disabled")
-            
-            # Force scrollbar update for debug log
-            if debug_scrollbar:
-                self.debug_widget.yview_moveto(0)
-                autohide_scrollbar(debug_scrollbar, 0, 1)
-            
-        # Update the UI if app is provided
-        if app:
-            app.update_idletasks()
-    
-    def log(self, message, log_type="debug"):
-        """
-        Log messages in the appropriate text box based on type.
-        
-        Args:
-            message: The message text to log
-            log_type: Either "debug" (for technical messages) or "processing" (for operation results)
-                - "debug" messages will appear in the debug widget (technical information)
-                - "processing" messages will appear in the processing widget (success/failure results)
-        """
-        # Handle the case when UI elements aren't defined yet (early startup)
-        if log_type == "debug" and self.debug_widget is None:
-            print(f"Early log: {message}")
-            return
-            
-        # Use debug widget as fallback if processing widget isn't defined yet
-        if log_type == "processing" and self.processing_widget is None:
-            if self.debug_widget is None:
-                print(f"Early log: {message}")
-                return
-            target_widget = self.debug_widget
-        else:
-            # Determine which widget to use based on message type
-            if (message.startswith("[OK]") or message.startswith("[NOK]") or 
-                message.startswith("[INFO] API Calls:")):
-                # Only OK/NOK messages and API counter go to processing widget
-                target_widget = self.processing_widget
-            else:
-                # Everything else goes to debug widget
-                target_widget = self.debug_widget
-            
-        target_widget.configure(state="normal")
-        
-        # Special handling for OK/NOK tags in processing messages
-        if message.startswith("[OK]") and target_widget == self.processing_widget:
-            target_widget.insert("end", "[OK] ", "ok")
-            target_widget.insert("end", message[4:] + "\n")
-        elif message.startswith("[NOK]") and target_widget == self.processing_widget:
-            target_widget.insert("end", "[NOK] ", "nok")
-            target_widget.insert("end", message[5:] + "\n")
-        elif message.startswith("[INFO] API Calls:"):
-            target_widget.insert("end", message + "\n", "api_call")
-        else:
-            target_widget.insert("end", message + "\n")
-            
-        target_widget.configure(state="disabled")
-        target_widget.see("end")  # Auto-scroll to the latest message
-
-
-def autohide_scrollbar(scrollbar, first, last):
-    """
-    Hide scrollbar if not needed, show if needed.
-    Used by text widgets to automatically hide/show scrollbars.
-    """
-    try:
-        # Convert to float for comparison
-        first = float(first)
-        last = float(last)
-        
-        # Check if scrollbar still exists
-        if not scrollbar.winfo_exists():
-            return
-            
-        # Get current manager (grid or pack)
-        manager = scrollbar.winfo_manager()
-        
-        # If no manager, initialize based on parent widget's existing children
-        if not manager:
-            parent_children = scrollbar.master.pack_slaves()
-            if parent_children:  # If parent already has packed children
-                scrollbar.pack(side="right", fill="y")
-                manager = 'pack'
-            else:  # Default to grid for table
-                scrollbar.grid(row=0, column=1, sticky="ns")
-                manager = 'grid'
-        
-        # Only hide if we're absolutely sure we don't need it
-        if first <= 0.0 and last >= 1.0:
-            # Hide the scrollbar
-            if manager == 'grid':
-                scrollbar.grid_remove()
-            elif manager == 'pack':
-                scrollbar.pack_forget()
-        else:
-            # Show the scrollbar with correct parameters
-            if manager == 'grid' and not scrollbar.grid_info():
-                scrollbar.grid(row=0, column=1, sticky="ns")
-            elif manager == 'pack' and not scrollbar.pack_info():
-                scrollbar.pack(side="right", fill="y")
-        
-        # Update scrollbar position without triggering another update
-        scrollbar.set(first, last)
-        
-    except Exception as e:
-        # Log error but don't raise it to prevent breaking the UI
-        print(f"[ERROR] Scrollbar error: {str(e)}")  # Use print to avoid potential recursion
-
-
-# Create a global logger instance for the application
-logger = Logger()
-
-# Function for backward compatibility
-def log_message(message, log_type="debug"):
-    """
-    Compatibility function to maintain backward compatibility with existing code.
-    Forwards to the global logger instance.
-    """
-    logger.log(message, log_type)
+"""
+Logging utilities for the application.
+Provides functionality for logging messages to UI text widgets or console.
+"""
+
+import threading
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from config import Config
+
+# Minimum time between progressive flushes while messages are being batched
+BATCH_FLUSH_INTERVAL = 0.25
+
+# How often (ms) the UI thread writes messages logged from other threads
+LOG_PUMP_MS = 100
+
+class Logger:
+    """
+    Logger class that handles sending messages to UI text widgets with fallback to console.
+    Supports different log types and special formatting for success/failure messages.
+    """
+    def __init__(self):
+        """Initialize the logger with empty widget references."""
+        self.debug_widget = None
+        self.processing_widget = None
+        
+        # Batch state is per thread: a batch opened by a worker never holds
+        # back the UI thread's messages, and vice versa
+        self._local = threading.local()
+        
+        # Messages logged from other threads, as (widget, insert args); only
+        # the UI thread writes them, from the pump started by start_pump
+        self._queued = []
+        self._queued_lock = threading.Lock()
+        self._pump_root = None
+    
+    def start_pump(self, root):
+        """
+        Route messages from other threads through the UI thread.
+        
+        Tk widgets must only be touched by the thread running the main loop,
+        so once this is called, messages logged elsewhere are queued and
+        written by a periodic root.after callback.
+        
+        Args:
+            root: Tk root window whose after() schedules the pump
+        """
+        self._pump_root = root
+        root.after(LOG_PUMP_MS, self._pump)
+    
+    def _pump(self):
+        """Write the queued messages, then reschedule (UI thread only)."""
+        self._write_queued()
+        self._pump_root.after(LOG_PUMP_MS, self._pump)
+    
+    def _write_queued(self):
+        """Write messages queued by other threads (UI thread only)."""
+        with self._queued_lock:
+            queued, self._queued = self._queued, []
+        self._write_runs(queued)
+        
+    def set_debug_widget(self, widget):
+        """Set the widget for debug messages."""
+        self.debug_widget = widget
+        
+    def set_processing_widget(self, widget):
+        """Set the widget for processing messages."""
+        self.processing_widget = widget
+    
+    def clear_logs(self, app=None, debug_scrollbar=None, processing_scrollbar=None):
+        """Clear both log widgets and reset their scrollbars."""
+        # Clear processing log box if it exists
+        if self.processing_widget:
+            self.processing_widget.configure(state="normal")
+            self.processing_widget.delete("1.0", "end")
+            self.processing_widget.configure(state="disabled")
+            
+            # Force scrollbar update for processing log
+            if processing_scrollbar:
+                self.processing_widget.yview_moveto(0)
+                autohide_scrollbar(processing_scrollbar, 0, 1)
+        
+        # Clear debug log box if it exists
+        if self.debug_widget:
+            self.debug_widget.configure(state="normal")
+            self.debug_widget.delete("1.0", "end")
+            self.debug_widget.configure(state="disabled")
+            
+            # Force scrollbar update for debug log
+            if debug_scrollbar:
+                self.debug_widget.yview_moveto(0)
+                autohide_scrollbar(debug_scrollbar, 0, 1)
+            
+        # Update the UI if app is provided
+        if app:
+            app.update_idletasks()
+    
+    def log(self, message, log_type="debug"):
+        """
+        Log messages in the appropriate text box based on type.
+        
+        Args:
+            message: The message text to log
+            log_type: Either "debug" (for technical messages) or "processing" (for operation results)
+                - "debug" messages will appear in the debug widget (technical information)
+                - "processing" messages will appear in the processing widget (success/failure results)
+        """
+        # Messages from a thread inside redirected() go to its handler instead
+        redirect = getattr(self._local, 'redirect', None)
+        if redirect is not None:
+            redirect(message, log_type)
+            return
+        
+        # Handle the case when UI elements aren't defined yet (early startup)
+        if log_type == "debug" and self.debug_widget is None:
+            print(f"Early log: {message}")
+            return
+            
+        # Use debug widget as fallback if processing widget isn't defined yet
+        if log_type == "processing" and self.processing_widget is None:
+            if self.debug_widget is None:
+                print(f"Early log: {message}")
+                return
+            target_widget = self.debug_widget
+        else:
+            # Determine which widget to use based on message type
+            if (message.startswith("[OK]") or message.startswith("[NOK]") or 
+                message.startswith("[INFO] API Calls:")):
+                # Only OK/NOK messages and API counter go to processing widget
+                target_widget = self.processing_widget
+            else:
+                # Everything else goes to debug widget
+                target_widget = self.debug_widget
+        
+        # Special handling for OK/NOK tags in processing messages
+        if message.startswith("[OK]") and target_widget == self.processing_widget:
+            chunks = ("[OK] ", "ok", message[4:] + "\n", ())
+        elif message.startswith("[NOK]") and target_widget == self.processing_widget:
+            chunks = ("[NOK] ", "nok", message[5:] + "\n", ())
+        elif message.startswith("[INFO] API Calls:"):
+            chunks = (message + "\n", "api_call")
+        else:
+            chunks = (message + "\n", ())
+        
+        if self._pump_root is not None and threading.current_thread() is not threading.main_thread():
+            with self._queued_lock:
+                self._queued.append((target_widget, chunks))
+            return
+        
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.pending.append((target_widget, chunks))
+            # Still flush now and then so long runs give progressive feedback
+            if time.monotonic() - local.last_flush >= BATCH_FLUSH_INTERVAL:
+                self.flush()
+            return
+        
+        # Keep messages queued by other threads ahead of this one
+        if self._pump_root is not None:
+            self._write_queued()
+        self._insert(target_widget, chunks)
+    
+    def _insert(self, target_widget, chunks):
+        """Insert text/tag chunks into a widget with a single insert call."""
+        target_widget.configure(state="normal")
+        target_widget.insert("end", *chunks)
+        target_widget.configure(state="disabled")
+        target_widget.see("end")  # Auto-scroll to the latest message
+    
+    def flush(self):
+        """Write the calling thread's batched messages, with one insert per widget run."""
+        if self._pump_root is not None and threading.current_thread() is not threading.main_thread():
+            return  # Other threads' messages are written by the pump
+        local = self._local
+        pending = getattr(local, 'pending', None)
+        local.pending = []
+        local.last_flush = time.monotonic()
+        if self._pump_root is not None:
+            self._write_queued()
+        self._write_runs(pending or [])
+    
+    def _write_runs(self, pending):
+        """Insert (widget, chunks) entries, merging consecutive ones per widget."""
+        run_widget = None
+        run_chunks = []
+        for widget, chunks in pending:
+            if widget is not run_widget and run_chunks:
+                self._insert(run_widget, run_chunks)
+                run_chunks = []
+            run_widget = widget
+            run_chunks.extend(chunks)
+        if run_chunks:
+            self._insert(run_widget, run_chunks)
+    
+    @contextmanager
+    def batched(self):
+        """
+        Buffer messages logged inside the block and write them in bulk.
+        
+        Each Text insert triggers a relayout, so per-file loops over large
+        selections log through this to avoid thousands of widget updates.
+        Batches can be nested and only affect the thread that opened them;
+        messages are flushed when the outermost ends. Off the UI thread
+        (once start_pump was called) messages are queued anyway, so the
+        batch changes nothing there.
+        """
+        local = self._local
+        if not getattr(local, 'depth', 0):
+            local.depth = 0
+            local.pending = []
+            local.last_flush = time.monotonic()
+        local.depth += 1
+        try:
+            yield self
+        finally:
+            local.depth -= 1
+            if local.depth == 0:
+                self.flush()
+
+    @contextmanager
+    def redirected(self, handler):
+        """
+        Hand every message logged by the calling thread to handler instead.
+        
+        Lets a background job collect its log lines (including those of the
+        helpers it calls) and have them written later by the UI thread.
+        
+        Args:
+            handler: Callable taking (message, log_type)
+        """
+        previous = getattr(self._local, 'redirect', None)
+        self._local.redirect = handler
+        try:
+            yield self
+        finally:
+            self._local.redirect = previous
+
+def autohide_scrollbar(scrollbar, first, last):
+    """
+    Hide scrollbar if not needed, show if needed.
+    Used by text widgets to automatically hide/show scrollbars.
+    """
+    try:
+        # Convert to float for comparison
+        first = float(first)
+        last = float(last)
+        
+        # Check if scrollbar still exists
+        if not scrollbar.winfo_exists():
+            return
+            
+        # Get current manager (grid or pack)
+        manager = scrollbar.winfo_manager()
+        
+        # If no manager, initialize based on parent widget's existing children
+        if not manager:
+            parent_children = scrollbar.master.pack_slaves()
+            if parent_children:  # If parent already has packed children
+                scrollbar.pack(side="right", fill="y")
+                manager = 'pack'
+            else:  # Default to grid for table
+                scrollbar.grid(row=0, column=1, sticky="ns")
+                manager = 'grid'
+        
+        # Only hide if we're absolutely sure we don't need it
+        if first <= 0.0 and last >= 1.0:
+            # Hide the scrollbar
+            if manager == 'grid':
+                scrollbar.grid_remove()
+            elif manager == 'pack':
+                scrollbar.pack_forget()
+        else:
+            # Show the scrollbar with correct parameters
+            if manager == 'grid' and not scrollbar.grid_info():
+                scrollbar.grid(row=0, column=1, sticky="ns")
+            elif manager == 'pack' and not scrollbar.pack_info():
+                scrollbar.pack(side="right", fill="y")
+        
+        # Update scrollbar position without triggering another update
+        scrollbar.set(first, last)
+        
+    except Exception as e:
+        # Log error but don't raise it to prevent breaking the UI
+        print(f"[ERROR] Scrollbar error: {str(e)}")  # Use print to avoid potential recursion
+
+
+# Create a global logger instance for the application
+logger = Logger()
+
+def debug_enabled():
+    """
+    Whether [DEBUG] messages are written at all.
+    
+    Callers guard debug messages that are costly to build (list comprehensions,
+    per-release loops) with this so the work is skipped when they would be dropped.
+    """
+    return Config.DEBUG_LOGGING
+
+# Function for backward compatibility
+def log_message(message, log_type="debug"):
+    """
+    Compatibility function to maintain backward compatibility with existing code.
+    Forwards to the global logger instance.
+    """
+    if not Config.DEBUG_LOGGING and message.startswith("[DEBUG]"):
+        return
+    logger.log(message, log_type)
+
+def batched_logging():
+    """Context manager that batches log messages on the global logger."""
+    return logger.batched()
+
+def redirected_logging(handler):
+    """Context manager that sends the calling thread's log messages to handler."""
+    return logger.redirected(handler)
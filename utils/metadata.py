@@ -3,227 +3,459 @@ Metadata handling utilities for the application.
 Provides functionality for reading, writing, and fetching audio metadata across different formats.
 """
 
-import mutagen
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC, Picture
 from mutagen.mp4 import MP4, MP4Cover
 from mutagen.oggvorbis import OggVorbis
 from mutagen.asf import ASF
 from mutagen.id3 import ID3, APIC, TPE1, TIT2, TALB, TPE2, TXXX, TDRC, TRCK, TCON
-from utils.logging import log_message
+from utils.logging import log_message, debug_enabled
+from utils.file_operations import get_audio_file, save_audio_file, evict_audio_file
+from utils.image_handling import sniff_image_mime
 import requests
-from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor
 import time
 import threading
+import queue
+import atexit
 import os
 import re
+import json
+import hashlib
+from config import Config
 from services.api_client import make_api_request
 
+class _LRUCache(OrderedDict):
+    """
+    Dictionary bounded to maxsize entries, evicting the least recently used.
+    
+    Writes are expected under cache_lock; get() stays safe without it, so
+    lookups keep their lock-free fast path.
+    """
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None):
+        """Look up a key and mark it as recently used."""
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        try:
+            self.move_to_end(key)
+        except KeyError:
+            pass  # Evicted by a concurrent write in between
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+    
+    def add(self, key):
+        """Set-style insert, for caches that only record membership."""
+        self[key] = True
+
+# Maximum entries kept by the search caches (a long session over a large
+# library would otherwise keep every album it ever looked up)
+CATALOG_CACHE_SIZE = 10000
+FAILED_SEARCH_CACHE_SIZE = 50000
+COVER_IMAGE_CACHE_SIZE = 128  # Downloaded images, so kept small
+
+# Age (seconds) after which a disk-cached cover is revalidated with the server
+COVER_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Cover URLs that just failed are not requested again for this many seconds;
+# the table is trimmed once it holds more than MAX_FAILED_COVER_URLS entries
+FAILED_COVER_TTL = 60
+MAX_FAILED_COVER_URLS = 256
+
+# Shared session for cover downloads: keep-alive connections to the image
+# host are reused across files, and transient errors are retried
+_cover_session = requests.Session()
+_cover_session.mount('https://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503])
+))
+_cover_session.headers.update({
+    'User-Agent': 'Phonodex/1.0',
+    'Referer': 'https://www.discogs.com/'
+})
+
+# Cover downloads are streamed and abandoned past this size, so a broken or
+# hostile server cannot make the app buffer an arbitrarily large body
+MAX_COVER_DOWNLOAD_SIZE = 20 * 1024 * 1024
+COVER_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Concurrent background cover downloads (kept low: every cover comes
+# from the same image host, which also rate-limits)
+COVER_PREFETCH_WORKERS = 4
+
 # Cache for metadata results
-album_catalog_cache = {}
-failed_search_cache = set()  # Cache for artist-album combinations that returned no results
-album_cover_image_cache = {}  # Cache for downloaded cover images (stores actual image bytes)
-cache_lock = threading.Lock()  # Lock for thread-safe cache access
+album_catalog_cache = _LRUCache(CATALOG_CACHE_SIZE)
+failed_search_cache = _LRUCache(FAILED_SEARCH_CACHE_SIZE)  # Artist-album combinations that returned no results
+album_cover_image_cache = _LRUCache(COVER_IMAGE_CACHE_SIZE)  # Downloaded cover images (stores actual image bytes)
+cache_lock = threading.Lock()  # Guards cache writes; single lookups are atomic and lock-free
+_failed_cover_urls = {}  # cover URL -> time.monotonic() of its last failed download (guarded by cache_lock)
+_inflight_covers = {}  # cover URL -> Future of its background download (guarded by cache_lock)
+_inflight_searches = {}  # cache_key -> Future of the search currently running for it (guarded by cache_lock)
+
+# MP4 cover atom format by image mime type (anything unknown is stored as JPEG)
+_MP4_COVER_FORMATS = {
+    'image/png': MP4Cover.FORMAT_PNG,
+    'image/jpeg': MP4Cover.FORMAT_JPEG,
+    'image/jpg': MP4Cover.FORMAT_JPEG,
+}
+
+# Background writer for MP4 cover saves (full-file rewrites) so the processing
+# thread can move on to the next lookup while the previous file is written
+_cover_write_queue = queue.Queue()
+_cover_writer_thread = None
+_cover_writer_lock = threading.Lock()
+
+def _cover_writer_worker():
+    """Drain queued cover saves, one file at a time."""
+    while True:
+        audio_file, file_path, log, on_saved = _cover_write_queue.get()
+        try:
+            save_audio_file(audio_file, file_path)
+            log(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
+            on_saved()
+        except Exception as e:
+            log(f"[COVER] Error saving MP4 cover art for {os.path.basename(file_path)}: {e}")
+        finally:
+            _cover_write_queue.task_done()
+
+def _queue_cover_write(audio_file, file_path, log, on_saved):
+    """Queue an audio file save on the background cover writer thread.
+    
+    Args:
+        audio_file: Audio file object with the new cover already set
+        file_path: Path of the file being written (for logging)
+        log: Logging function
+        on_saved: Callable invoked after a successful save
+    """
+    global _cover_writer_thread
+    with _cover_writer_lock:
+        if _cover_writer_thread is None:
+            _cover_writer_thread = threading.Thread(target=_cover_writer_worker, daemon=True)
+            _cover_writer_thread.start()
+    # The writer owns this object now; later get_audio_file calls must not
+    # hand it out to code that would edit or save it at the same time
+    evict_audio_file(file_path)
+    _cover_write_queue.put((audio_file, file_path, log, on_saved))
+
+def wait_for_pending_writes():
+    """Block until all queued cover saves have been written to disk."""
+    _cover_write_queue.join()
+
+# Never let interpreter shutdown kill the daemon writer mid-save
+atexit.register(wait_for_pending_writes)
+
+# Tag name -> ID3 frame id (TXXX frames are addressed as "TXXX:<desc>")
+_ID3_FRAMES = {
+    "artist": "TPE1",
+    "title": "TIT2",
+    "album": "TALB",
+    "albumartist": "TPE2",
+    "catalognumber": "TXXX:CATALOGNUMBER",
+    "date": "TDRC",  # Year/Date
+    "tracknumber": "TRCK",  # Track number
+    "genre": "TCON"  # Genre
+}
+
+# Tag name -> (ID3 frame class, factory building the frame for a value)
+_ID3_FRAME_BUILDERS = {
+    "artist": (TPE1, lambda v: TPE1(encoding=3, text=[v])),
+    "title": (TIT2, lambda v: TIT2(encoding=3, text=[v])),
+    "album": (TALB, lambda v: TALB(encoding=3, text=[v])),
+    "albumartist": (TPE2, lambda v: TPE2(encoding=3, text=[v])),
+    "catalognumber": (TXXX, lambda v: TXXX(encoding=3, desc="CATALOGNUMBER", text=[v])),
+    "date": (TDRC, lambda v: TDRC(encoding=3, text=[v])),
+    "tracknumber": (TRCK, lambda v: TRCK(encoding=3, text=[v])),
+    "genre": (TCON, lambda v: TCON(encoding=3, text=[v]))
+}
+
+# Tag name -> MP4 atom
+_MP4_ATOMS = {
+    "artist": "©ART",
+    "title": "©nam",
+    "album": "©alb",
+    "albumartist": "aART",
+    "catalognumber": "----:com.apple.iTunes:CATALOGNUMBER",
+    "date": "©day",  # Year/date
+    "tracknumber": "trkn",  # Track number
+    "genre": "©gen"  # Genre
+}
+
+# Tag name -> WMA (ASF) attribute
+_ASF_ATTRIBUTES = {
+    "artist": "Author",
+    "title": "Title",
+    "album": "WM/AlbumTitle",
+    "albumartist": "WM/AlbumArtist",
+    "catalognumber": "WM/CatalogNo",
+    "date": "WM/Year",  # Year/date
+    "tracknumber": "WM/TrackNumber",  # Track number
+    "genre": "WM/Genre"  # Genre
+}
+
+# Table column index -> tag name, used when no mapping is passed in
+_COLUMN_TAGS = {
+    0: "artist",
+    1: "title",
+    2: "album",
+    3: "catalognumber",
+    4: "albumartist",
+    5: "date",
+    6: "tracknumber",
+    7: "genre",
+}
+
+def _noop(*args):
+    """Default for callbacks the caller did not provide."""
+
+# Shared read-only defaults for the callbacks and options parameters
+_NO_CALLBACKS = MappingProxyType({})
+_DEFAULT_UPDATE_OPTIONS = MappingProxyType({'catalog': True, 'year': True, 'art': True})
+
+def _get_mp3_tag(audio, tag_name, default):
+    """Read a tag from an MP3's ID3 frames."""
+    if not audio.tags:
+        return default
+        
+    mapped_tag = _ID3_FRAMES.get(tag_name)
+    
+    if not mapped_tag:
+        return default
+        
+    # Handle TXXX frames specially
+    if mapped_tag.startswith("TXXX:"):
+        desc = mapped_tag.split(":")[1]
+        for tag in audio.tags.getall("TXXX"):
+            if tag.desc == desc:
+                return str(tag.text[0])
+    # Handle regular ID3 frames
+    elif mapped_tag in audio.tags:
+        return str(audio.tags[mapped_tag].text[0])
+        
+    return default
+
+def _get_vorbis_tag(audio, tag_name, default):
+    """Read a tag from a FLAC or Ogg Vorbis comment (field names match the tag names)."""
+    return audio.get(tag_name, [default])[0]
+
+def _get_mp4_tag(audio, tag_name, default):
+    """Read a tag from an MP4/M4A atom."""
+    mapped_tag = _MP4_ATOMS.get(tag_name)
+    if mapped_tag and mapped_tag in audio:
+        # Special handling for track number in MP4
+        if mapped_tag == "trkn" and audio.get(mapped_tag):
+            return str(audio[mapped_tag][0][0])  # Track numbers are stored as tuples
+        # Special handling for custom iTunes tags (bytes data)
+        elif mapped_tag.startswith("----"):
+            # Custom iTunes tags are stored as bytes and need to be decoded
+            try:
+                byte_value = audio[mapped_tag][0]
+                if isinstance(byte_value, bytes):
+                    return byte_value.decode('utf-8')
+                return str(byte_value)
+            except Exception as e:
+                log_message(f"[ERROR] Failed to decode MP4 custom tag {mapped_tag}: {e}")
+                return default
+        return str(audio[mapped_tag][0])
+    return default
+
+def _get_asf_tag(audio, tag_name, default):
+    """Read a tag from a WMA (ASF) attribute."""
+    mapped_tag = _ASF_ATTRIBUTES.get(tag_name)
+    if mapped_tag and mapped_tag in audio:
+        return str(audio[mapped_tag][0])
+    return default
+
+# Tag readers keyed by the exact mutagen type, so a lookup is one dict probe
+# instead of a chain of isinstance checks
+_TAG_GETTERS = {
+    MP3: _get_mp3_tag,
+    FLAC: _get_vorbis_tag,
+    MP4: _get_mp4_tag,
+    OggVorbis: _get_vorbis_tag,
+    ASF: _get_asf_tag,
+}
+
+def _tag_handler(handlers, audio):
+    """Find the handler for an audio object's type, falling back to isinstance for subclasses."""
+    handler = handlers.get(type(audio))
+    if handler is None:
+        for audio_type, candidate in handlers.items():
+            if isinstance(audio, audio_type):
+                return candidate
+    return handler
 
 def get_tag_value(audio, tag_name, default=""):
     """Helper function to get tag value across different audio formats."""
     try:
-        # MP3
-        if isinstance(audio, MP3):
-            if not audio.tags:
-                return default
-                
-            id3_mapping = {
-                "artist": "TPE1",
-                "title": "TIT2",
-                "album": "TALB",
-                "albumartist": "TPE2",
-                "catalognumber": "TXXX:CATALOGNUMBER",
-                "date": "TDRC",  # Year/Date
-                "tracknumber": "TRCK",  # Track number
-                "genre": "TCON"  # Genre
-            }
-            mapped_tag = id3_mapping.get(tag_name)
-            
-            if not mapped_tag:
-                return default
-                
-            # Handle TXXX frames specially
-            if mapped_tag.startswith("TXXX:"):
-                desc = mapped_tag.split(":")[1]
-                for tag in audio.tags.getall("TXXX"):
-                    if tag.desc == desc:
-                        return str(tag.text[0])
-            # Handle regular ID3 frames
-            elif mapped_tag in audio.tags:
-                return str(audio.tags[mapped_tag].text[0])
-                
+        handler = _tag_handler(_TAG_GETTERS, audio)
+        if handler is None:
             return default
-            
-        # FLAC
-        elif isinstance(audio, FLAC):
-            flac_mapping = {
-                "date": "date",
-                "tracknumber": "tracknumber",
-                "genre": "genre"
-            }
-            mapped_tag = flac_mapping.get(tag_name, tag_name)
-            return audio.get(mapped_tag, [default])[0]
-        # MP4/M4A
-        elif isinstance(audio, MP4):
-            mp4_mapping = {
-                "artist": "©ART",
-                "title": "©nam",
-                "album": "©alb",
-                "albumartist": "aART",
-                "catalognumber": "----:com.apple.iTunes:CATALOGNUMBER",
-                "date": "©day",
-                "tracknumber": "trkn",
-                "genre": "©gen"
-            }
-            mapped_tag = mp4_mapping.get(tag_name)
-            if mapped_tag and mapped_tag in audio:
-                # Special handling for track number in MP4
-                if mapped_tag == "trkn" and audio.get(mapped_tag):
-                    return str(audio[mapped_tag][0][0])  # Track numbers are stored as tuples
-                # Special handling for custom iTunes tags (bytes data)
-                elif mapped_tag.startswith("----"):
-                    # Custom iTunes tags are stored as bytes and need to be decoded
-                    try:
-                        byte_value = audio[mapped_tag][0]
-                        if isinstance(byte_value, bytes):
-                            return byte_value.decode('utf-8')
-                        return str(byte_value)
-                    except Exception as e:
-                        log_message(f"[ERROR] Failed to decode MP4 custom tag {mapped_tag}: {e}")
-                        return default
-                return str(audio[mapped_tag][0])
-        # OGG
-        elif isinstance(audio, OggVorbis):
-            ogg_mapping = {
-                "date": "date",
-                "tracknumber": "tracknumber",
-                "genre": "genre"
-            }
-            mapped_tag = ogg_mapping.get(tag_name, tag_name)
-            return audio.get(mapped_tag, [default])[0]
-        # WMA
-        elif isinstance(audio, ASF):
-            asf_mapping = {
-                "artist": "Author",
-                "title": "Title",
-                "album": "WM/AlbumTitle",
-                "albumartist": "WM/AlbumArtist",
-                "catalognumber": "WM/CatalogNo",
-                "date": "WM/Year",
-                "tracknumber": "WM/TrackNumber",
-                "genre": "WM/Genre"
-            }
-            mapped_tag = asf_mapping.get(tag_name)
-            if mapped_tag and mapped_tag in audio:
-                return str(audio[mapped_tag][0])
-            
-        return default
+        return handler(audio, tag_name, default)
     except Exception as e:
         log_message(f"[ERROR] Failed to get tag {tag_name}: {str(e)}")
         return default
 
-def set_tag_value(audio, tag_name, value):
-    """Helper function to set tag value across different audio formats."""
-    try:
-        # FLAC
-        if isinstance(audio, FLAC):
-            # FLAC tags need to be lists
-            audio[tag_name] = [value]
-        # MP4/M4A
-        elif isinstance(audio, mutagen.mp4.MP4):
-            mp4_mapping = {
-                "artist": "©ART",
-                "title": "©nam",
-                "album": "©alb",
-                "albumartist": "aART",
-                "catalognumber": "----:com.apple.iTunes:CATALOGNUMBER",
-                "date": "©day",  # Year/date
-                "tracknumber": "trkn",  # Track number
-                "genre": "©gen"  # Genre
-            }
-            mapped_tag = mp4_mapping.get(tag_name)
-            if mapped_tag:
-                if mapped_tag == "trkn":
-                    # Special handling for track numbers in MP4
-                    audio[mapped_tag] = [(int(value), 0)]  # Format as (track_number, total_tracks)
-                elif mapped_tag.startswith("----"):
-                    # Special handling for custom iTunes tags (like CATALOGNUMBER)
-                    try:
-                        # Custom iTunes tags need to be encoded as bytes with a special format
-                        tag_parts = mapped_tag.split(":")
-                        namespace = tag_parts[1]  # e.g., "com.apple.iTunes"
-                        name = tag_parts[2]       # e.g., "CATALOGNUMBER"
-                        
-                        # Create a properly formatted custom tag
-                        log_message(f"[DEBUG] Setting iTunes custom tag: {namespace}:{name}={value}")
-                        audio[mapped_tag] = [value.encode("utf-8")]
-                    except Exception as e:
-                        log_message(f"[ERROR] Failed to set custom MP4 tag {mapped_tag}: {e}")
-                else:
-                    # Regular MP4 tags
-                    audio[mapped_tag] = [value]
-        # OGG
-        elif isinstance(audio, mutagen.oggvorbis.OggVorbis):
-            audio[tag_name] = [value]
-        # WMA
-        elif isinstance(audio, mutagen.asf.ASF):
-            asf_mapping = {
-                "artist": "Author",
-                "title": "Title",
-                "album": "WM/AlbumTitle",
-                "albumartist": "WM/AlbumArtist",
-                "catalognumber": "WM/CatalogNo",
-                "date": "WM/Year",  # Year/date
-                "tracknumber": "WM/TrackNumber",  # Track number
-                "genre": "WM/Genre"  # Genre
-            }
-            mapped_tag = asf_mapping.get(tag_name)
-            if mapped_tag:
-                audio[mapped_tag] = [value]
-        # MP3
-        elif isinstance(audio, mutagen.mp3.MP3):
-            id3_mapping = {
-                "artist": (TPE1, lambda v: TPE1(encoding=3, text=[v])),
-                "title": (TIT2, lambda v: TIT2(encoding=3, text=[v])),
-                "album": (TALB, lambda v: TALB(encoding=3, text=[v])),
-                "albumartist": (TPE2, lambda v: TPE2(encoding=3, text=[v])),
-                "catalognumber": (TXXX, lambda v: TXXX(encoding=3, desc="CATALOGNUMBER", text=[v])),
-                "date": (TDRC, lambda v: TDRC(encoding=3, text=[v])),
-                "tracknumber": (TRCK, lambda v: TRCK(encoding=3, text=[v])),
-                "genre": (TCON, lambda v: TCON(encoding=3, text=[v]))
-            }
-            if tag_name in id3_mapping:
-                frame_class, frame_creator = id3_mapping[tag_name]
-                if audio.tags is None:
-                    audio.add_tags()
-                
-                # Remove existing frame before adding new one
-                if tag_name == "catalognumber":
-                    # Special handling for TXXX frames
-                    for tag in list(audio.tags.getall("TXXX")):
-                        if tag.desc == "CATALOGNUMBER":
-                            audio.tags.delall("TXXX:" + tag.desc)
-                else:
-                    # Regular ID3 frames
-                    frame_name = frame_class.__name__
-                    if frame_name in audio.tags:
-                        audio.tags.delall(frame_name)
-                
-                # Always add the frame with the new value (even if empty)
-                audio.tags.add(frame_creator(value))
+def _set_vorbis_tag(audio, tag_name, value):
+    """Set a FLAC or Ogg Vorbis comment (the values need to be lists)."""
+    audio[tag_name] = [value]
+
+def _set_mp4_tag(audio, tag_name, value):
+    """Set an MP4/M4A atom."""
+    mapped_tag = _MP4_ATOMS.get(tag_name)
+    if mapped_tag:
+        if mapped_tag == "trkn":
+            # Special handling for track numbers in MP4
+            audio[mapped_tag] = [(int(value), 0)]  # Format as (track_number, total_tracks)
+        elif mapped_tag.startswith("----"):
+            # Special handling for custom iTunes tags (like CATALOGNUMBER)
+            try:
+                # Custom iTunes tags need to be encoded as bytes with a special format
+                tag_parts = mapped_tag.split(":")
+                namespace = tag_parts[1]  # e.g., "com.apple.iTunes"
+                name = tag_parts[2]       # e.g., "CATALOGNUMBER"
                 
-        audio.save()
+                # Create a properly formatted custom tag
+                log_message(f"[DEBUG] Setting iTunes custom tag: {namespace}:{name}={value}")
+                audio[mapped_tag] = [value.encode("utf-8")]
+            except Exception as e:
+                log_message(f"[ERROR] Failed to set custom MP4 tag {mapped_tag}: {e}")
+        else:
+            # Regular MP4 tags
+            audio[mapped_tag] = [value]
+
+def _set_asf_tag(audio, tag_name, value):
+    """Set a WMA (ASF) attribute."""
+    mapped_tag = _ASF_ATTRIBUTES.get(tag_name)
+    if mapped_tag:
+        audio[mapped_tag] = [value]
+
+def _set_mp3_tag(audio, tag_name, value):
+    """Set an MP3's ID3 frame, replacing any existing one."""
+    if tag_name in _ID3_FRAME_BUILDERS:
+        frame_class, frame_creator = _ID3_FRAME_BUILDERS[tag_name]
+        if audio.tags is None:
+            audio.add_tags()
+        
+        # Remove existing frame before adding new one
+        if tag_name == "catalognumber":
+            # Special handling for TXXX frames
+            for tag in list(audio.tags.getall("TXXX")):
+                if tag.desc == "CATALOGNUMBER":
+                    audio.tags.delall("TXXX:" + tag.desc)
+        else:
+            # Regular ID3 frames
+            frame_name = frame_class.__name__
+            if frame_name in audio.tags:
+                audio.tags.delall(frame_name)
+        
+        # Always add the frame with the new value (even if empty)
+        audio.tags.add(frame_creator(value))
+
+# Tag writers keyed by the exact mutagen type (see _TAG_GETTERS)
+_TAG_SETTERS = {
+    FLAC: _set_vorbis_tag,
+    MP4: _set_mp4_tag,
+    OggVorbis: _set_vorbis_tag,
+    ASF: _set_asf_tag,
+    MP3: _set_mp3_tag,
+}
+
+def set_tag_value(audio, tag_name, value, *, save=True):
+    """Helper function to set tag value across different audio formats.
+    
+    Args:
+        audio: Mutagen audio file object
+        tag_name: Name of the tag to set
+        value: New tag value
+        save: Write the file right away; callers setting several tags pass
+            False and save once at the end
+        
+    Returns:
+        bool: True if the tag was set (and saved, if requested)
+    """
+    try:
+        handler = _tag_handler(_TAG_SETTERS, audio)
+        if handler is not None:
+            handler(audio, tag_name, value)
+        
+        if save:
+            save_audio_file(audio)
         return True
     except Exception as e:
         log_message(f"[ERROR] Failed to set tag {tag_name}: {str(e)}")
         return False
 
+def set_tags_bulk(audio, updates):
+    """Set several tags in one pass without saving.
+    
+    The format's setter is resolved once for the whole batch; the caller
+    writes the file afterwards with a single save.
+    
+    Args:
+        audio: Mutagen audio file object
+        updates: Dictionary of tag name to new value
+        
+    Returns:
+        bool: True if all tags were set
+    """
+    try:
+        handler = _tag_handler(_TAG_SETTERS, audio)
+        if handler is not None:
+            for tag_name, value in updates.items():
+                handler(audio, tag_name, value)
+        return True
+    except Exception as e:
+        log_message(f"[ERROR] Failed to set tags {', '.join(updates)}: {str(e)}")
+        return False
+
+@lru_cache(maxsize=4096)
+def _top_catalog_numbers(catalog_numbers):
+    """
+    Rank catalog numbers by how often they occur.
+    
+    Retries and repeated searches return the same result sets, so the ranking
+    is memoized on the (hashable) tuple of catalog numbers.
+    
+    Args:
+        catalog_numbers: Tuple of uppercase catalog numbers
+        
+    Returns:
+        tuple: (top 2 (catalog, count) pairs, number of unique catalog numbers)
+    """
+    catalog_counts = {}
+    for catalog in catalog_numbers:
+        catalog_counts[catalog] = catalog_counts.get(catalog, 0) + 1
+    
+    # Single pass for the top 2 instead of sorting every count; strict
+    # comparisons keep the first-seen catalog on ties, like most_common()
+    best = second = None
+    best_n = second_n = 0
+    for catalog, count in catalog_counts.items():
+        if count > best_n:
+            second, second_n = best, best_n
+            best, best_n = catalog, count
+        elif count > second_n:
+            second, second_n = catalog, count
+    
+    top = ((best, best_n),) if second is None else ((best, best_n), (second, second_n))
+    return top, len(catalog_counts)
+
 def select_by_frequency(releases):
     """Helper function to select a release based on catalog number frequency.
     
@@ -235,15 +467,19 @@ def select_by_frequency(releases):
     """
     # First pass: collect all catalog numbers
     log_message(f"[DEBUG] --- Processing all {len(releases)} releases to find catalog numbers ---")
+    _normalize_release_fields(releases)
     all_catalog_numbers = []
+    catno_to_release = {}  # Normalized catalog number -> first release carrying it
     
     # Debug raw catalog values before filtering
-    raw_catalogs = [release.get("catno", "MISSING") for release in releases]
-    log_message(f"[DEBUG] Raw catalog values: {raw_catalogs}")
+    if debug_enabled():
+        raw_catalogs = [release.get("catno", "MISSING") for release in releases]
+        log_message(f"[DEBUG] Raw catalog values: {raw_catalogs}")
     
     for release in releases:
-        catno = release.get("catno", "").strip()
-        if catno and catno.upper() != "NONE":  # Explicitly exclude NONE values
+        catno_to_release.setdefault(release["_catno_norm"], release)
+        if release["_catno_valid"]:  # Explicitly excludes NONE values
+            catno = release["_catno"]
             all_catalog_numbers.append(catno.upper())
             log_message(f"[DEBUG] Found catalog number: {catno}")
     
@@ -252,11 +488,10 @@ def select_by_frequency(releases):
         
         # Pick first release with ANY catalog value, even if it's "NONE"
         for release in releases:
-            catno = release.get("catno", "").strip()
+            catno = release["_catno"]
             if catno:  # Any non-empty catalog, even "NONE"
                 log_message(f"[DEBUG] Falling back to using catalog: {catno}")
-                normalized_catalog = catno.replace(" ", "").upper()
-                return release, normalized_catalog
+                return release, release["_catno_norm"]
                 
         # If still nothing, just use the first release and assign a placeholder
         if releases:
@@ -266,12 +501,9 @@ def select_by_frequency(releases):
             
         return None, None
         
-    # Count occurrences of all catalog numbers
-    catalog_counts = Counter(all_catalog_numbers)
-    log_message(f"[DEBUG] --- Analyzing frequency of {len(catalog_counts)} unique catalog numbers ---")
-    
-    # Get the top 2 most common catalog numbers
-    most_common = catalog_counts.most_common(2)
+    # Get the top 2 most common catalog numbers (memoized on the catalog tuple)
+    most_common, unique_count = _top_catalog_numbers(tuple(all_catalog_numbers))
+    log_message(f"[DEBUG] --- Analyzing frequency of {unique_count} unique catalog numbers ---")
     
     # Start with the most common
     most_common_catalog = most_common[0][0]
@@ -289,8 +521,7 @@ def select_by_frequency(releases):
     log_message(f"[DEBUG] Selected catalog number by frequency: {normalized_catalog}")
     
     # Find the release with this catalog number
-    matching_release = next((release for release in releases 
-                           if release.get("catno", "").strip().upper().replace(" ", "") == normalized_catalog), None)
+    matching_release = catno_to_release.get(normalized_catalog)
     
     # If no matching release found (shouldn't happen but just in case)
     if not matching_release and releases:
@@ -464,6 +695,78 @@ def _resolve_cover_art(artist, album, selected_release, api_token, search_url):
     return _resolve_cover_art_from_discogs(selected_release, api_token, search_url)
 
 
+# Everything the release-matching passes in fetch_metadata need to know about
+# one search result, computed in a single pass over the results
+_ReleaseMatch = namedtuple(
+    "_ReleaseMatch",
+    "title artist album artist_match album_match exact_title has_catalog"
+)
+
+def _classify_release(release, artist_lc, album_lc):
+    """
+    Lowercase and split a Discogs release title once and evaluate every match test on it.
+    
+    Args:
+        release: Release dictionary from the search results
+        artist_lc: Lowercase artist being searched for
+        album_lc: Lowercase album being searched for
+        
+    Returns:
+        _ReleaseMatch: Titles without " - " have no artist part (None) and use
+        the whole title as the album part
+    """
+    release_title = release.get('title', '').lower()
+    head, sep, tail = release_title.partition(' - ')
+    if sep:
+        release_artist = head.strip()
+        release_album = tail.strip()
+        artist_match = _loose_match(release_artist, artist_lc)
+    else:
+        release_artist = None
+        release_album = release_title
+        artist_match = False
+    return _ReleaseMatch(
+        release_title,
+        release_artist,
+        release_album,
+        artist_match,
+        _loose_match(release_album, album_lc),
+        release_album == album_lc,
+        release["_catno_valid"],
+    )
+
+def _loose_match(a, b):
+    """Match two lowercase names when either contains the other (equality included)."""
+    if a == b:
+        return True
+    # Only the shorter name can be contained in the longer one, so a single
+    # substring search decides it
+    if len(a) < len(b):
+        return a in b
+    return b in a
+
+def _normalize_release_fields(releases):
+    """
+    Attach normalized catalog number and year fields to each release dict, once.
+    
+    Sets "_catno" (stripped), "_catno_norm" (uppercase, spaces removed),
+    "_catno_valid" (a real catalog number, not empty or "NONE") and "_year"
+    (int, or None when missing or not numeric) so the selection passes read
+    precomputed values instead of re-parsing every time.
+    
+    Args:
+        releases: List of release dictionaries from Discogs API
+    """
+    for release in releases:
+        if "_catno_norm" in release:
+            continue
+        year = str(release.get("year") or "")
+        release["_year"] = int(year) if year.isdigit() else None
+        catno = release.get("catno", "").strip()
+        release["_catno"] = catno
+        release["_catno_norm"] = catno.replace(" ", "").upper()
+        release["_catno_valid"] = bool(catno) and catno.upper() != "NONE"
+
 def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     """Fetch the most common catalog number and essential metadata for an album.
     
@@ -491,18 +794,65 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     if title:
         title = title.strip()
     
+    # Lowercase the search terms once; every matching pass below reuses them
+    artist_lc = artist.lower()
+    album_lc = album.lower()
+    
     # Use consistent cache key that includes both artist and album
-    cache_key = f"{artist.lower()}|{album.lower()}"
+    cache_key = f"{artist_lc}|{album_lc}"
+    
+    # Single dict/set lookups are atomic under the GIL, so reads take no lock;
+    # a miss racing a write only costs one redundant API call
+    cached_metadata = album_catalog_cache.get(cache_key)
+    known_failure = cached_metadata is None and cache_key in failed_search_cache
+    if cached_metadata is not None:
+        log_message(f"[INFO] Using cached catalog number for '{artist} - {album}'.")
+        return cached_metadata, None  # No headers with cached data
+    if known_failure:
+        log_message(f"[INFO] Skipping known failed search for '{artist} - {album}'.")
+        return None, None
     
-    # Thread-safe cache access
+    # Concurrent lookups of the same album share one search: the first caller
+    # runs it and the others wait for its result instead of querying again
     with cache_lock:
-        if cache_key in album_catalog_cache:
-            log_message(f"[INFO] Using cached catalog number for '{artist} - {album}'.")
-            return album_catalog_cache[cache_key], None  # No headers with cached data
-        if cache_key in failed_search_cache:
-            log_message(f"[INFO] Skipping known failed search for '{artist} - {album}'.")
-            return None, None
+        future = _inflight_searches.get(cache_key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight_searches[cache_key] = future
+    
+    if not owner:
+        log_message(f"[INFO] Waiting for in-flight search for '{artist} - {album}'.")
+        return future.result()
+    
+    try:
+        result = _search_metadata(artist, album, title, artist_lc, album_lc, cache_key, api_token, search_url)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        with cache_lock:
+            _inflight_searches.pop(cache_key, None)
+    return result
+
+def _search_metadata(artist, album, title, artist_lc, album_lc, cache_key, api_token, search_url):
+    """Query Discogs for an album that missed the caches and select its release.
     
+    Args:
+        artist: The stripped artist name
+        album: The stripped album name
+        title: The stripped track title, or None
+        artist_lc: Lowercase artist name
+        album_lc: Lowercase album name
+        cache_key: Key the result is cached under
+        api_token: Discogs API token
+        search_url: Discogs search URL endpoint
+        
+    Returns:
+        tuple: (metadata dictionary, response headers) or (None, None) if not found
+    """
     log_message(f"[API CALL] Requesting Discogs for: Artist='{artist}', Album='{album}'")
     
     # Try first with exact search but use q parameter instead of separate fields
@@ -528,7 +878,7 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         )
         
         # If still no results and we have a title that's different from the album name
-        if (not response_data or not response_data.get("results")) and title and title.lower() != album.lower():
+        if (not response_data or not response_data.get("results")) and title and title.lower() != album_lc:
             log_message(f"[INFO] No matches found with album name, trying with title: {title}")
             response_data, response_headers = make_api_request(
                 search_url,
@@ -543,7 +893,7 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         # Cache the failed search
         with cache_lock:
             failed_search_cache.add(cache_key)
-            log_message(f"[INFO] Caching failed search for '{artist} - {album}'")
+        log_message(f"[INFO] Caching failed search for '{artist} - {album}'")
         return None, None
         
     releases = response_data.get("results", [])
@@ -557,34 +907,30 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     for idx, release in enumerate(releases[:10], 1):  # Show first 10 for debugging
         log_message(f"[INFO] Match {idx}: '{release.get('title', '')}' ({release.get('year', 'Unknown')}), Catalog: '{release.get('catno', 'Unknown')}'")
     
+    # Normalize catalog numbers and years and classify every release once, up front;
+    # the passes below only read the precomputed fields
+    _normalize_release_fields(releases)
+    matches = {id(release): _classify_release(release, artist_lc, album_lc) for release in releases}
+    
     # First filter for EXACT album matches, not just artist
     exact_album_matches = []
     for release in releases:
-        release_title = release.get('title', '').lower()
-        # Split on " - " to separate artist and album title
-        if ' - ' in release_title:
-            parts = release_title.split(' - ')
-            release_artist = parts[0].strip()
-            # The album title is everything after the first " - "
-            release_album = ' - '.join(parts[1:]).strip()
-            
-            # Check if both artist and album match (using fuzzy matching to accommodate minor variations)
-            artist_match = release_artist.lower() == artist.lower() or release_artist.lower() in artist.lower() or artist.lower() in release_artist.lower()
-            album_match = release_album.lower() == album.lower() or release_album.lower() in album.lower() or album.lower() in release_album.lower()
-            
-            if artist_match and album_match:
+        match = matches[id(release)]
+        # Titles are "Artist - Album" when they contain " - "
+        if match.artist is not None:
+            # Both artist and album must match (fuzzy matching accommodates minor variations)
+            if match.artist_match and match.album_match:
                 # Verify catalog number is preserved
-                catno = release.get("catno", "").strip()
+                catno = release["_catno"]
                 if catno:
                     log_message(f"[DEBUG] Found exact album match with catalog {catno}: {release.get('title')}")
                 else:
                     log_message(f"[DEBUG] Found exact album match WITHOUT catalog: {release.get('title')}")
                 exact_album_matches.append(release)
-        elif not ' - ' in release_title:
+        else:
             # Some releases might not follow the "Artist - Title" format
-            # Try fuzzy matching on the whole title
-            title_match = album.lower() in release_title or release_title in album.lower()
-            if title_match:
+            # Fuzzy match on the whole title
+            if match.album_match:
                 log_message(f"[DEBUG] Found title-only match: {release.get('title')}")
                 exact_album_matches.append(release)
     
@@ -592,46 +938,45 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     if exact_album_matches:
         log_message(f"[DEBUG] Using {len(exact_album_matches)} exact album matches instead of all {len(releases)} search results")
         # CRITICAL DEBUG: Verify catalog numbers are preserved in exact matches
-        exact_catalogs = [r.get("catno", "") for r in exact_album_matches if r.get("catno", "").strip()]
-        log_message(f"[DEBUG] Catalog numbers in exact matches: {exact_catalogs}")
+        if debug_enabled():
+            exact_catalogs = [r.get("catno", "") for r in exact_album_matches if r["_catno"]]
+            log_message(f"[DEBUG] Catalog numbers in exact matches: {exact_catalogs}")
         target_releases = exact_album_matches
     else:
         log_message(f"[WARNING] No exact album matches found. Results may be less accurate.")
         # Even with no exact matches, still try to find any artist matches at least
         exact_artist_matches = []
         for release in releases:
-            release_title = release.get('title', '').lower()
-            if ' - ' in release_title:
-                release_artist = release_title.split(' - ')[0].strip()
-                if release_artist.lower() == artist.lower() or release_artist.lower() in artist.lower() or artist.lower() in release_artist.lower():
-                    exact_artist_matches.append(release)
-                    log_message(f"[DEBUG] Found artist-only match: {release.get('title')}")
+            if matches[id(release)].artist_match:
+                exact_artist_matches.append(release)
+                log_message(f"[DEBUG] Found artist-only match: {release.get('title')}")
         
         target_releases = exact_artist_matches if exact_artist_matches else releases
         if exact_artist_matches:
             log_message(f"[DEBUG] Using {len(exact_artist_matches)} artist-only matches as fallback")
             # CRITICAL DEBUG: Verify catalog numbers are preserved in artist matches
-            artist_catalogs = [r.get("catno", "") for r in exact_artist_matches if r.get("catno", "").strip()]
-            log_message(f"[DEBUG] Catalog numbers in artist matches: {artist_catalogs}")
+            if debug_enabled():
+                artist_catalogs = [r.get("catno", "") for r in exact_artist_matches if r["_catno"]]
+                log_message(f"[DEBUG] Catalog numbers in artist matches: {artist_catalogs}")
     
     # NEW STEP: Check for exact album title matches BEFORE filtering by catalog number
     log_message(f"[DEBUG] Looking for exact album title matches for: '{album}'")
     exact_album_title_matches = []
     
+    log_debug = debug_enabled()
     for release in target_releases:
-        release_title = release.get('title', '').lower()
-        log_message(f"[DEBUG] Checking release: '{release_title}'")
-        
-        # Extract just the album part from "Artist - Album"
-        if ' - ' in release_title:
-            release_album = ' - '.join(release_title.split(' - ')[1:]).strip()
-            log_message(f"[DEBUG] Extracted album part: '{release_album}'")
-        else:
-            release_album = release_title
-            log_message(f"[DEBUG] No album part extraction possible, using whole title: '{release_album}'")
+        match = matches[id(release)]
+        if log_debug:
+            log_message(f"[DEBUG] Checking release: '{match.title}'")
+            
+            # Use just the album part from "Artist - Album"
+            if match.artist is not None:
+                log_message(f"[DEBUG] Extracted album part: '{match.album}'")
+            else:
+                log_message(f"[DEBUG] No album part extraction possible, using whole title: '{match.album}'")
         
         # Check for exact album name match
-        if release_album.lower() == album.lower():
+        if match.exact_title:
             log_message(f"[INFO] Found exact album title match: '{release.get('title')}'")
             exact_album_title_matches.append(release)
     
@@ -641,7 +986,7 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         filtered_releases = exact_album_title_matches
         
         # Check if ANY of these exact title matches have non-NONE catalogs
-        non_none_exact_matches = [r for r in exact_album_title_matches if r.get("catno", "").strip().upper() != "NONE" and r.get("catno", "").strip() != ""]
+        non_none_exact_matches = [r for r in exact_album_title_matches if matches[id(r)].has_catalog]
         if non_none_exact_matches:
             log_message(f"[INFO] Found {len(non_none_exact_matches)} exact album title matches with valid catalog numbers")
             filtered_releases = non_none_exact_matches
@@ -650,15 +995,16 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     else:
         log_message(f"[WARNING] No exact album title matches found, proceeding with standard catalog number filtering")
         # Only now apply the NONE catalog filter if we didn't find exact album title matches
-        non_none_releases = [r for r in target_releases if r.get("catno", "").strip().upper() != "NONE" and r.get("catno", "").strip() != ""]
+        non_none_releases = [r for r in target_releases if matches[id(r)].has_catalog]
         
         # Use non-none releases if available, otherwise fall back to all target releases
         if non_none_releases:
             log_message(f"[DEBUG] Found {len(non_none_releases)} releases with non-NONE catalog numbers")
             filtered_releases = non_none_releases
             # CRITICAL DEBUG: Verify catalog numbers are preserved after NONE filtering
-            filtered_catalogs = [r.get("catno", "") for r in filtered_releases]
-            log_message(f"[DEBUG] Catalog numbers after filtering: {filtered_catalogs}")
+            if debug_enabled():
+                filtered_catalogs = [r.get("catno", "") for r in filtered_releases]
+                log_message(f"[DEBUG] Catalog numbers after filtering: {filtered_catalogs}")
         else:
             log_message(f"[WARNING] All releases have NONE or empty catalog numbers, using all target releases")
             filtered_releases = target_releases
@@ -669,29 +1015,28 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         return None, None
     
     # Sort releases by year (oldest first) if year information is available
-    releases_with_year = [r for r in filtered_releases if r.get("year") and str(r.get("year")).isdigit()]
+    # (years were parsed once up front, so the filter and sort key are plain lookups)
+    releases_with_year = [r for r in filtered_releases if r["_year"] is not None]
     if releases_with_year:
         log_message(f"[DEBUG] --------------------------------------------------")
         log_message(f"[DEBUG] Sorting {len(releases_with_year)} releases by year (oldest first)")
-        releases_with_year.sort(key=lambda r: int(r.get("year", 9999)))
+        releases_with_year.sort(key=itemgetter("_year"))
         
         # Use the oldest release that has a valid catalog number AND matches artist
+        # (membership is tested by identity: comparing release dicts for equality
+        # would walk every field of every earlier match)
+        exact_album_match_ids = {id(r) for r in exact_album_matches}
         oldest_release = None
         for release in releases_with_year:
             # Re-verify artist match to ensure it's not an unrelated old album
-            release_title = release.get('title', '').lower()
-            if ' - ' in release_title:
-                release_artist = release_title.split(' - ')[0].strip()
-                artist_match = (release_artist.lower() == artist.lower() or 
-                               release_artist.lower() in artist.lower() or 
-                               artist.lower() in release_artist.lower())
-                
-                if artist_match:
+            match = matches[id(release)]
+            if match.artist is not None:
+                if match.artist_match:
                     oldest_release = release
                     break
             else:
                 # If no artist info in title, only use if we had exact album matches initially
-                if exact_album_matches and release in exact_album_matches:
+                if id(release) in exact_album_match_ids:
                     oldest_release = release
                     break
         
@@ -702,18 +1047,18 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         
         # Continue with the rest of your existing logic for catalog number validation
         if oldest_release:
-            catno = oldest_release.get("catno", "").strip()
+            catno = oldest_release["_catno"]
             
             # CRITICAL FIX: Check if the catalog number exists and is not "NONE" before using it
             log_message(f"[DEBUG] Oldest release from year {oldest_release.get('year')} has catalog: '{catno}'")
             
-            if catno and catno.upper() != "NONE":
+            if oldest_release["_catno_valid"]:
                 log_message(f"[INFO] Selected oldest release from year {oldest_release.get('year')} with catalog number: {catno}")
                 selected_release = oldest_release
-                normalized_catalog = catno.replace(" ", "").upper()
+                normalized_catalog = oldest_release["_catno_norm"]
             else:
                 # Even if the catalog is NONE, if this is an exact album title match, still use it
-                if exact_album_title_matches and oldest_release in exact_album_title_matches:
+                if id(oldest_release) in {id(r) for r in exact_album_title_matches}:
                     log_message(f"[INFO] Selected oldest release with NONE catalog because it's an exact album title match")
                     selected_release = oldest_release
                     normalized_catalog = "NONE"  # Use a standardized placeholder
@@ -731,11 +1076,10 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
         log_message(f"[WARNING] Could not select a valid catalog number for '{album}'.")
         # Last resort: just use the first release with any catalog number
         for release in filtered_releases:
-            catno = release.get("catno", "").strip()
-            if catno and catno.upper() != "NONE":
-                log_message(f"[INFO] Last resort: using first available catalog number: {catno}")
+            if release["_catno_valid"]:
+                log_message(f"[INFO] Last resort: using first available catalog number: {release['_catno']}")
                 selected_release = release
-                normalized_catalog = catno.replace(" ", "").upper()
+                normalized_catalog = release["_catno_norm"]
                 break
         
         # If still no catalog, return None
@@ -763,6 +1107,355 @@ def fetch_metadata(artist, album, title=None, api_token=None, search_url=None):
     log_message(f"[INFO] Found metadata for '{artist} - {album}': {metadata}")
     return metadata, response_headers
 
+def _embedded_cover(audio_file):
+    """Return the bytes of a file's only embedded cover, or None if it has none or several."""
+    if isinstance(audio_file, MP4):
+        covers = audio_file.get('covr') or []
+        return bytes(covers[0]) if len(covers) == 1 else None
+    if isinstance(audio_file, FLAC):
+        pictures = audio_file.pictures
+        return pictures[0].data if len(pictures) == 1 else None
+    if isinstance(audio_file, MP3):
+        if audio_file.tags is None:
+            return None
+        frames = audio_file.tags.getall("APIC")
+        return frames[0].data if len(frames) == 1 else None
+    return None
+
+def existing_cover_matches(audio_file, image_data):
+    """Check whether a file's only embedded cover is byte-identical to image_data.
+    
+    Args:
+        audio_file: Loaded mutagen audio file object
+        image_data: Raw bytes of the cover about to be written
+        
+    Returns:
+        bool: True if writing the cover would not change the file
+    """
+    embedded = _embedded_cover(audio_file)
+    return embedded is not None and embedded == image_data
+
+def _cover_already_embedded(cover_url, embedded):
+    """
+    Check an embedded cover against what is known about a cover URL, without downloading.
+    
+    Compares against the bytes in the memory cache, or else against the
+    SHA-256 recorded in the disk cache sidecar.
+    
+    Args:
+        cover_url: URL of the cover about to be applied
+        embedded: Bytes of the file's embedded cover
+        
+    Returns:
+        bool: True if the file already carries that image
+    """
+    cached_image = album_cover_image_cache.get(cover_url)
+    if cached_image is not None:
+        return cached_image['data'] == embedded
+    try:
+        with open(_cover_cache_paths(cover_url)[1], 'r', encoding='utf-8') as f:
+            digest = json.load(f).get('sha256')
+    except (OSError, ValueError):
+        return False
+    return digest is not None and digest == hashlib.sha256(embedded).hexdigest()
+
+def _cover_cache_paths(cover_url):
+    """Return the (image, sidecar) paths of a cover URL in the disk cache."""
+    base = os.path.join(Config.COVER_CACHE_DIR, hashlib.sha256(cover_url.encode('utf-8')).hexdigest())
+    return base + '.bin', base + '.json'
+
+def _read_cover_cache(cover_url):
+    """
+    Read a cover from the disk cache.
+    
+    Returns:
+        tuple: (image bytes, sidecar info dict), or (None, None) on a miss
+    """
+    data_path, info_path = _cover_cache_paths(cover_url)
+    try:
+        with open(info_path, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        with open(data_path, 'rb') as f:
+            return f.read(), info
+    except (OSError, ValueError):
+        return None, None
+
+def _write_cover_cache(cover_url, image_data, info):
+    """
+    Store a cover in the disk cache; failures only cost a later re-download.
+    
+    Both files are written to temporary names and renamed into place, the
+    image first, so a reader never sees a sidecar without its image. Pass
+    image_data=None to update only the sidecar of an existing entry.
+    """
+    data_path, info_path = _cover_cache_paths(cover_url)
+    try:
+        os.makedirs(Config.COVER_CACHE_DIR, exist_ok=True)
+        if image_data is not None:
+            with open(data_path + '.tmp', 'wb') as f:
+                f.write(image_data)
+            os.replace(data_path + '.tmp', data_path)
+        with open(info_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        os.replace(info_path + '.tmp', info_path)
+    except OSError as e:
+        log_message(f"[WARNING] Failed to cache cover art on disk: {str(e)}")
+
+def _read_capped(response, limit):
+    """
+    Read a streamed response body, giving up once it grows past limit bytes.
+    
+    Args:
+        response: requests response opened with stream=True
+        limit: Maximum body size in bytes
+        
+    Returns:
+        bytes: The body, or None if it is larger than limit
+    """
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > limit:
+        return None
+    body = bytearray()
+    for chunk in response.iter_content(COVER_DOWNLOAD_CHUNK_SIZE):
+        body += chunk
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+def clear_cover_cache():
+    """Drop the in-memory cover images (the disk cache is kept)."""
+    with cache_lock:
+        album_cover_image_cache.clear()
+        _failed_cover_urls.clear()
+
+def _record_failed_cover(cover_url):
+    """Remember a failed cover download, trimming the table when it grows too large."""
+    now = time.monotonic()
+    with cache_lock:
+        _failed_cover_urls[cover_url] = now
+        if len(_failed_cover_urls) > MAX_FAILED_COVER_URLS:
+            for url, failed_at in list(_failed_cover_urls.items()):
+                if now - failed_at >= FAILED_COVER_TTL:
+                    del _failed_cover_urls[url]
+            # Still full of recent failures: drop the oldest ones
+            while len(_failed_cover_urls) > MAX_FAILED_COVER_URLS:
+                del _failed_cover_urls[next(iter(_failed_cover_urls))]
+
+def _fetch_cover(cover_url, api_token, log):
+    """
+    Get a cover image from the memory cache, the disk cache or Discogs.
+    
+    Args:
+        cover_url: URL of the image
+        api_token: Discogs API token (optional)
+        log: Logging callback
+        
+    Returns:
+        tuple: (image bytes, mime type), or (None, 'image/jpeg') if the download failed
+    """
+    cached_image = album_cover_image_cache.get(cover_url)  # Lock-free read
+    if cached_image is not None:
+        log(f"[COVER] Using cached image data: {len(cached_image['data'])} bytes (lossless transfer)")
+        return cached_image['data'], cached_image['mime']
+    
+    image_data, info = _read_cover_cache(cover_url)
+    if image_data is not None and time.time() - info.get('checked', 0) < COVER_CACHE_MAX_AGE:
+        mime_type = info.get('mime', 'image/jpeg')
+        log(f"[COVER] Using cover art from disk cache: {len(image_data)} bytes, mime: {mime_type}")
+    else:
+        # Don't hit a URL again while its last failure is recent; transient
+        # 429/503 responses are retried once the entry expires
+        failed_at = _failed_cover_urls.get(cover_url)
+        if failed_at is not None and time.monotonic() - failed_at < FAILED_COVER_TTL:
+            log(f"[COVER] Skipping cover that failed recently: {cover_url}")
+            return None, 'image/jpeg'
+        
+        # Add API token if provided (User-Agent and Referer come from the session)
+        headers = {}
+        if api_token:
+            headers['Authorization'] = f'Discogs token={api_token}'
+        
+        # Revalidate a stale disk entry instead of downloading it again
+        if image_data is not None:
+            if info.get('etag'):
+                headers['If-None-Match'] = info['etag']
+            if info.get('last_modified'):
+                headers['If-Modified-Since'] = info['last_modified']
+        
+        log(f"[COVER] Downloading cover art from: {cover_url}")
+        try:
+            with _cover_session.get(cover_url, headers=headers, timeout=10, stream=True) as response:
+                if response.status_code == 304 and image_data is not None:
+                    body = None
+                elif response.status_code != 200:
+                    log(f"[ERROR] Failed to download cover image (Status {response.status_code})")
+                    _record_failed_cover(cover_url)
+                    return None, 'image/jpeg'
+                else:
+                    body = _read_capped(response, MAX_COVER_DOWNLOAD_SIZE)
+                    if body is None:
+                        log(f"[ERROR] Cover image exceeds {MAX_COVER_DOWNLOAD_SIZE // (1024 * 1024)} MB, skipping: {cover_url}")
+                        _record_failed_cover(cover_url)
+                        return None, 'image/jpeg'
+        except requests.RequestException as e:
+            # Timeouts and connection errors are remembered like failed statuses
+            log(f"[ERROR] Failed to download cover image: {str(e)}")
+            _record_failed_cover(cover_url)
+            return None, 'image/jpeg'
+        
+        if body is None:
+            mime_type = info.get('mime', 'image/jpeg')
+            info['checked'] = time.time()
+            _write_cover_cache(cover_url, None, info)
+            log(f"[COVER] Cover art unchanged on server, using disk cache: {len(image_data)} bytes")
+        else:
+            image_data = body
+            # Trust the image's own header bytes over the server's content-type
+            mime_type = sniff_image_mime(image_data, default=response.headers.get('content-type', 'image/jpeg'))
+            _write_cover_cache(cover_url, image_data, {
+                'mime': mime_type,
+                'sha256': hashlib.sha256(image_data).hexdigest(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked': time.time()
+            })
+            log(f"[COVER] Downloaded and cached: {len(image_data)} bytes, mime: {mime_type}")
+    
+    # Keep it in memory for the other tracks of the album
+    with cache_lock:
+        album_cover_image_cache[cover_url] = {
+            'data': image_data,
+            'mime': mime_type
+        }
+    return image_data, mime_type
+
+# Background cover downloads started ahead of the tag writes that need them
+_cover_download_pool = None
+_cover_download_lock = threading.Lock()
+
+def schedule_cover_download(cover_url, api_token=None):
+    """
+    Start downloading a cover in the background and return at once.
+    
+    The processing thread keeps writing tags while the image arrives;
+    update_album_metadata waits on the download only when it reaches a file
+    that needs this cover. Repeated calls for a URL share one download.
+    
+    Args:
+        cover_url: URL of the image
+        api_token: Discogs API token (optional)
+        
+    Returns:
+        Future: Resolves to (image bytes, mime type) as returned by _fetch_cover
+    """
+    global _cover_download_pool
+    with _cover_download_lock:
+        if _cover_download_pool is None:
+            _cover_download_pool = ThreadPoolExecutor(max_workers=COVER_PREFETCH_WORKERS)
+    
+    with cache_lock:
+        future = _inflight_covers.get(cover_url)
+        if future is not None:
+            return future
+        future = _cover_download_pool.submit(_fetch_cover, cover_url, api_token, log_message)
+        _inflight_covers[cover_url] = future
+    
+    def forget(done):
+        with cache_lock:
+            if _inflight_covers.get(cover_url) is done:
+                del _inflight_covers[cover_url]
+    
+    # Registered outside the lock: it runs immediately if the download already finished
+    future.add_done_callback(forget)
+    return future
+
+def _write_cover_flac(audio_file, image_data, mime_type, file_path, log, on_saved):
+    """Replace a FLAC file's pictures with a front cover."""
+    # Clear existing pictures
+    audio_file.clear_pictures()
+    
+    # Create new picture
+    picture = Picture()
+    picture.type = 3  # Front cover
+    picture.mime = mime_type
+    picture.desc = 'Front Cover'
+    picture.data = image_data
+    
+    # Add picture to FLAC file
+    audio_file.add_picture(picture)
+    if log is not _noop:
+        log(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
+    return True
+
+def _write_cover_mp3(audio_file, image_data, mime_type, file_path, log, on_saved):
+    """Replace an MP3 file's APIC frames with a front cover."""
+    verbose = log is not _noop  # Skip building messages nobody receives
+    if audio_file.tags is None:
+        audio_file.add_tags()
+        log(f"[COVER] Added new ID3 tags to file")
+    
+    log(f"[COVER] Updating cover art for MP3 file")
+    
+    # Replace any existing cover art with the new front cover in one step
+    try:
+        if verbose:
+            log(f"[COVER] Setting cover art: {len(image_data)} bytes, mime: {mime_type}")
+        
+        # Always use type 3 (front cover) for new cover art; the frame is built
+        # before the tags are touched, so a failure leaves the old cover intact
+        audio_file.tags.setall("APIC", [
+            APIC(
+                encoding=3,
+                mime=mime_type,
+                type=3,  # Front cover
+                desc='Front Cover',
+                data=image_data
+            )
+        ])
+        log(f"[COVER] Successfully set front cover APIC frame")
+        if verbose:
+            log(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
+        return True
+    except Exception as e:
+        log(f"[COVER] Error adding APIC frame: {e}")
+        return None
+
+def _write_cover_mp4(audio_file, image_data, mime_type, file_path, log, on_saved):
+    """Set an MP4 file's cover atom and queue the (full rewrite) save."""
+    verbose = log is not _noop  # Skip building messages nobody receives
+    log(f"[COVER] Updating cover art for MP4/M4A file")
+    
+    try:
+        if verbose:
+            log(f"[COVER] Adding cover art: {len(image_data)} bytes, mime: {mime_type}")
+        
+        # Determine correct cover format based on mime type (ignoring parameters)
+        cover_format = _MP4_COVER_FORMATS.get(
+            mime_type.split(';', 1)[0].strip().lower(), MP4Cover.FORMAT_JPEG)
+            
+        # Create MP4Cover object and set it
+        cover = MP4Cover(image_data, cover_format)
+        audio_file['covr'] = [cover]
+        
+        # Hand the save to the background writer; it also writes any tag
+        # changes already made to the object
+        _queue_cover_write(audio_file, file_path, log, on_saved)
+        if verbose:
+            log(f"[COVER] Queued cover art write for {os.path.basename(file_path)}")
+        return False
+    except Exception as e:
+        log(f"[COVER] Error updating MP4 cover art: {e}")
+        return None
+
+# Cover writers by audio type. Each applies the cover to the loaded object and
+# returns True if the caller must save the file, False if the writer arranged
+# the save itself, or None if the cover could not be applied.
+_COVER_WRITERS = {
+    FLAC: _write_cover_flac,
+    MP3: _write_cover_mp3,
+    MP4: _write_cover_mp4,
+}
+
 def update_album_metadata(file_path, metadata, audio_file=None, options=None, callbacks=None):
     """Update an audio file's metadata based on provided options.
     
@@ -774,32 +1467,34 @@ def update_album_metadata(file_path, metadata, audio_file=None, options=None, ca
         callbacks: Dictionary of callback functions (log_message, mark_updated, mark_processed)
         
     Returns:
-        bool: True if any updates were made, False otherwise
+        bool: True if any updates were made, False otherwise; None if the save
+        was handed to the background writer, which calls mark_updated once it
+        has succeeded (see wait_for_pending_writes)
     """
     # Default options if none provided
     if options is None:
-        options = {
-            'catalog': True,
-            'year': True,
-            'art': True
-        }
+        options = _DEFAULT_UPDATE_OPTIONS
     
     # Default callbacks
     if callbacks is None:
-        callbacks = {
-            'log_message': lambda msg: None,
-            'mark_updated': lambda path: None,
-            'mark_processed': lambda path: None
-        }
+        callbacks = _NO_CALLBACKS
     
-    log_message = callbacks.get('log_message', lambda msg: None)
-    mark_updated = callbacks.get('mark_updated', lambda path: None)
-    mark_processed = callbacks.get('mark_processed', lambda path: None)
+    log_message = callbacks.get('log_message', _noop)
+    mark_updated = callbacks.get('mark_updated', _noop)
+    mark_processed = callbacks.get('mark_processed', _noop)
+    base_name = os.path.basename(file_path)
+    verbose = log_message is not _noop  # Skip building success messages nobody receives
+    
+    # Nothing selected to write: don't parse the file at all
+    write_catalog = options.get('catalog', True) and metadata.get("catalog_number")
+    write_year = options.get('year', True) and metadata.get("year")
+    cover_url = options.get('art', True) and (metadata.get("cover_image") or metadata.get("thumb"))
+    if not (write_catalog or write_year or cover_url):
+        return False
     
     try:
         # Load audio file if not provided
         if audio_file is None:
-            from utils.file_operations import get_audio_file
             audio_file = get_audio_file(file_path)
             
         if not audio_file:
@@ -809,166 +1504,78 @@ def update_album_metadata(file_path, metadata, audio_file=None, options=None, ca
         updated = False  # Track if any updates were made
         normalized_path = os.path.normpath(file_path)
 
-        # Update catalog number if selected
-        if options.get('catalog', True) and metadata.get("catalog_number"):
-            try:
-                set_tag_value(audio_file, "catalognumber", metadata["catalog_number"])
-                updated = True
-                log_message(f"[SUCCESS] Updated catalog number for {os.path.basename(file_path)}")
-            except Exception as e:
-                log_message(f"[ERROR] Failed to update catalog number: {e}")
+        # Set the selected catalog number and year in one pass
+        tag_updates = {}
+        if write_catalog:
+            tag_updates["catalognumber"] = metadata["catalog_number"]
+        if write_year:
+            tag_updates["date"] = str(metadata["year"])
+        if tag_updates and set_tags_bulk(audio_file, tag_updates):
+            updated = True
+            if verbose:
+                if write_catalog:
+                    log_message(f"[SUCCESS] Updated catalog number for {base_name}")
+                if write_year:
+                    log_message(f"[SUCCESS] Updated year to {metadata['year']} for {base_name}")
 
-        # Update year if selected
-        if options.get('year', True) and metadata.get("year"):
-            try:
-                set_tag_value(audio_file, "date", str(metadata["year"]))
-                updated = True
-                log_message(f"[SUCCESS] Updated year to {metadata['year']} for {os.path.basename(file_path)}")
-            except Exception as e:
-                log_message(f"[ERROR] Failed to update year: {e}")
-
-        # Save changes if any were made
-        if updated:
-            audio_file.save()
-            mark_updated(normalized_path)
+        # Tag and cover changes stay in memory and are written by a single
+        # save at the end (or by the queued MP4 cover write)
+        needs_save = updated
 
         # Update album art if selected
-        if options.get('art', True) and (metadata.get("cover_image") or metadata.get("thumb")):
+        if cover_url:
             try:
-                cover_url = metadata.get("cover_image") or metadata.get("thumb")
-                
-                # Check if we already have cached image data for this URL
-                image_data = None
-                mime_type = 'image/jpeg'
-                
-                with cache_lock:
-                    if cover_url in album_cover_image_cache:
-                        cached_image = album_cover_image_cache[cover_url]
-                        image_data = cached_image['data']
-                        mime_type = cached_image['mime']
-                        log_message(f"[COVER] Using cached image data: {len(image_data)} bytes (lossless transfer)")
-                
-                # If not cached, download it
-                if image_data is None:
-                    # Add API token if provided
-                    headers = {
-                        'User-Agent': 'Phonodex/1.0',
-                        'Referer': 'https://www.discogs.com/'
-                    }
-                    
-                    if metadata.get('api_token'):
-                        headers['Authorization'] = f'Discogs token={metadata["api_token"]}'
-                    
-                    log_message(f"[COVER] Downloading cover art from: {cover_url}")
-                    response = requests.get(cover_url, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        image_data = response.content
-                        mime_type = response.headers.get('content-type', 'image/jpeg')
-                        
-                        # Cache the downloaded image for future use
-                        with cache_lock:
-                            album_cover_image_cache[cover_url] = {
-                                'data': image_data,
-                                'mime': mime_type
-                            }
-                        log_message(f"[COVER] Downloaded and cached: {len(image_data)} bytes, mime: {mime_type}")
+                # Files that already carry the known image for this URL need
+                # neither the download nor the rewrite
+                embedded = _embedded_cover(audio_file)
+                if embedded is not None and _cover_already_embedded(cover_url, embedded):
+                    image_data = mime_type = None
+                    updated = True
+                    if verbose:
+                        log_message(f"[COVER] Existing cover art already matches for {base_name}, skipping download and rewrite")
+                else:
+                    # A download already running in the background, else memory
+                    # cache, then disk cache, then the network
+                    pending = _inflight_covers.get(cover_url)
+                    if pending is not None:
+                        image_data, mime_type = pending.result()
                     else:
-                        log_message(f"[ERROR] Failed to download cover image (Status {response.status_code})")
-                        image_data = None
+                        image_data, mime_type = _fetch_cover(cover_url, metadata.get('api_token'), log_message)
                 
+                # Skip the rewrite entirely if the file already carries this exact cover
+                if image_data is not None and embedded is not None and embedded == image_data:
+                    updated = True
+                    if verbose:
+                        log_message(f"[COVER] Existing cover art already matches for {base_name}, skipping rewrite")
                 # If we have image data (either cached or freshly downloaded), apply it
-                if image_data is not None:
-                    # For MP3 files, always remove existing art first
-                    if isinstance(audio_file, MP3):
-                        if audio_file.tags is None:
-                            audio_file.add_tags()
-                            log_message(f"[COVER] Added new ID3 tags to file")
-                        
-                        # Always remove existing cover art first
-                        existing_apic = audio_file.tags.getall("APIC")
-                        if existing_apic:
-                            log_message(f"[COVER] Found {len(existing_apic)} existing APIC frames, removing them")
-                            audio_file.tags.delall("APIC")
-                        else:
-                            log_message("[COVER] No existing APIC frames found")
-                    # Handle FLAC files
-                    if isinstance(audio_file, FLAC):
-                        # Clear existing pictures
-                        audio_file.clear_pictures()
-                        
-                        # Create new picture
-                        picture = Picture()
-                        picture.type = 3  # Front cover
-                        picture.mime = mime_type
-                        picture.desc = 'Front Cover'
-                        picture.data = image_data
-                        
-                        # Add picture to FLAC file
-                        audio_file.add_picture(picture)
-                        audio_file.save()
-                        updated = True
-                        log_message(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
-                    
-                    # Handle MP3 files
-                    elif isinstance(audio_file, MP3):
-                        log_message(f"[COVER] Updating cover art for MP3 file")
-                        
-                        # Add new cover art
-                        try:
-                            log_message(f"[COVER] Adding new cover art: {len(image_data)} bytes, mime: {mime_type}")
-                            
-                            # Always use type 3 (front cover) for new cover art
-                            audio_file.tags.add(
-                                APIC(
-                                    encoding=3,
-                                    mime=mime_type,
-                                    type=3,  # Front cover
-                                    desc='Front Cover',
-                                    data=image_data
-                                )
-                            )
-                            log_message(f"[COVER] Successfully added front cover APIC frame")
-                            audio_file.save()
-                            updated = True
-                            log_message(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
-                        except Exception as e:
-                            log_message(f"[COVER] Error adding APIC frame: {e}")
-                    # Handle MP4/M4A files
-                    elif isinstance(audio_file, MP4):
-                        log_message(f"[COVER] Updating cover art for MP4/M4A file")
-                        
-                        try:
-                            log_message(f"[COVER] Adding cover art: {len(image_data)} bytes, mime: {mime_type}")
-                            
-                            # Determine correct cover format based on mime type
-                            if mime_type.endswith('png'):
-                                cover_format = MP4Cover.FORMAT_PNG
-                            else:
-                                cover_format = MP4Cover.FORMAT_JPEG
-                                
-                            # Create MP4Cover object and set it
-                            cover = MP4Cover(image_data, cover_format)
-                            audio_file['covr'] = [cover]
-                            
-                            # Save the file
-                            audio_file.save()
-                            updated = True
-                            log_message(f"[SUCCESS] Updated cover art for {os.path.basename(file_path)}")
-                        except Exception as e:
-                            log_message(f"[COVER] Error updating MP4 cover art: {e}")
-                    else:
+                elif image_data is not None:
+                    writer = _tag_handler(_COVER_WRITERS, audio_file)
+                    if writer is None:
                         log_message(f"[COVER] Album art update not supported for this file type: {type(audio_file).__name__}")
+                    else:
+                        result = writer(audio_file, image_data, mime_type, file_path, log_message,
+                                        lambda: mark_updated(normalized_path))
+                        if result is False:
+                            # Queued: the writer saves every change made so far
+                            # and reports success through mark_updated
+                            mark_processed(normalized_path)
+                            return None
+                        if result is not None:
+                            updated = True
+                            needs_save = result
             except Exception as e:
                 log_message(f"[ERROR] Failed to update cover art: {str(e)}")
 
+        if needs_save:
+            save_audio_file(audio_file, file_path)
+
         if updated:
             mark_updated(normalized_path)
             mark_processed(normalized_path)
         return updated
 
     except Exception as e:
-        log_message(f"[ERROR] Failed to update metadata for {os.path.basename(file_path)}: {str(e)}")
+        log_message(f"[ERROR] Failed to update metadata for {base_name}: {str(e)}")
         return False
 
 def update_tag_by_column(file_path, column_num, new_value, audio_file=None, column_to_tag_mapping=None, callbacks=None):
@@ -987,31 +1594,19 @@ def update_tag_by_column(file_path, column_num, new_value, audio_file=None, colu
     """
     # Default column to tag mapping if none provided
     if column_to_tag_mapping is None:
-        column_to_tag_mapping = {
-            0: "artist",
-            1: "title",
-            2: "album",
-            3: "catalognumber",
-            4: "albumartist",
-            5: "date",
-            6: "tracknumber",
-            7: "genre",
-        }
+        column_to_tag_mapping = _COLUMN_TAGS
     
     # Default callbacks
     if callbacks is None:
-        callbacks = {
-            'log_message': lambda msg: None,
-            'mark_updated': lambda path: None
-        }
+        callbacks = _NO_CALLBACKS
     
-    log_message = callbacks.get('log_message', lambda msg: None)
-    mark_updated = callbacks.get('mark_updated', lambda path: None)
+    log_message = callbacks.get('log_message', _noop)
+    mark_updated = callbacks.get('mark_updated', _noop)
+    base_name = os.path.basename(file_path)
     
     try:
         # Load audio file if not provided
         if audio_file is None:
-            from utils.file_operations import get_audio_file
             audio_file = get_audio_file(file_path)
             
         if not audio_file:
@@ -1028,14 +1623,15 @@ def update_tag_by_column(file_path, column_num, new_value, audio_file=None, colu
         # Set the tag value
         if set_tag_value(audio_file, tag, new_value):
             mark_updated(file_path)
-            log_message(f"[SUCCESS] Updated {os.path.basename(file_path)} {tag}: {new_value}")
+            if log_message is not _noop:
+                log_message(f"[SUCCESS] Updated {base_name} {tag}: {new_value}")
             return True
         else:
-            log_message(f"[ERROR] Failed to update {tag} for {os.path.basename(file_path)}")
+            log_message(f"[ERROR] Failed to update {tag} for {base_name}")
             return False
             
     except Exception as e:
-        log_message(f"[ERROR] Failed to update metadata for {os.path.basename(file_path)}: {str(e)}")
+        log_message(f"[ERROR] Failed to update metadata for {base_name}: {str(e)}")
         return False
 
 def update_mp3_metadata(file_path, column_num, new_value, callbacks=None):
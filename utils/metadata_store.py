@@ -0,0 +1,139 @@
+"""
+Persistent metadata cache for the application.
+Stores the tags read from each audio file in a SQLite database keyed by path, size
+and modification time, so unchanged files are not reopened with mutagen on every launch.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from config import Config
+from utils.logging import log_message
+
+# Tag keys held per file in the caches, in table column order
+CACHED_TAGS = ("artist", "title", "album", "catalognumber", "albumartist", "date", "tracknumber", "genre")
+
+class MetadataStore:
+    """
+    SQLite-backed cache of per-file tag dictionaries.
+
+    An entry is only returned while the file's size and modification time still
+    match the ones recorded with it, so any edit (by this app or another) makes
+    the stale entry miss and the file is read again.
+    """
+    def __init__(self, db_path):
+        """Open (or create) the cache database at db_path."""
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._dirty = False
+
+    def _connect(self):
+        """Open the database lazily; returns None if it cannot be used."""
+        if self._conn is None:
+            try:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS files ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, tags TEXT)"
+                )
+                self._conn = conn
+            except sqlite3.Error as e:
+                log_message(f"[WARNING] Metadata cache unavailable: {str(e)}")
+                self._conn = False
+        return self._conn or None
+
+    def get(self, file_path):
+        """
+        Get the cached tags for a file if the file is unchanged.
+
+        Args:
+            file_path: Path to the audio file
+
+        Returns:
+            dict: The cached tags, or None on a miss
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT tags FROM files WHERE path=? AND size=? AND mtime_ns=?",
+                    (file_path, stat.st_size, stat.st_mtime_ns)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, file_path, tags):
+        """
+        Record the tags read from a file; written to disk on the next commit().
+
+        Args:
+            file_path: Path to the audio file
+            tags: Dictionary of tag name to value
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, tags) VALUES (?, ?, ?, ?)",
+                    (file_path, stat.st_size, stat.st_mtime_ns, json.dumps(tags))
+                )
+                self._dirty = True
+            except sqlite3.Error as e:
+                log_message(f"[WARNING] Failed to cache metadata for {os.path.basename(file_path)}: {str(e)}")
+
+    def commit(self):
+        """Write pending entries to disk in a single transaction."""
+        with self._lock:
+            if not self._dirty or not self._conn:
+                return
+            try:
+                self._conn.commit()
+                self._dirty = False
+            except sqlite3.Error as e:
+                log_message(f"[WARNING] Failed to save metadata cache: {str(e)}")
+
+# Global store shared by the table and the processing loop
+metadata_store = MetadataStore(Config.METADATA_CACHE_FILE)
+atexit.register(metadata_store.commit)
+
+def read_file_metadata(file_path, tag_names, get_audio_file, get_tag_value):
+    """
+    Get a file's tags from the persistent cache, reading the file only on a miss.
+
+    Args:
+        file_path: Path to the audio file
+        tag_names: Tag names to read
+        get_audio_file: Function to get audio file object
+        get_tag_value: Function to get tag value from audio file
+
+    Returns:
+        dict: Tag name to value, or None if the file could not be read
+    """
+    tags = metadata_store.get(file_path)
+    if tags is not None and all(tag in tags for tag in tag_names):
+        return tags
+
+    audio = get_audio_file(file_path)
+    if not audio:
+        return None
+    tags = {tag: get_tag_value(audio, tag) for tag in tag_names}
+    metadata_store.put(file_path, tags)
+    return tags
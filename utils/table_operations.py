@@ -1,5 +1,8 @@
 import os
-from config import Config
+from utils.metadata_store import metadata_store, read_file_metadata, CACHED_TAGS
+
+# Rows inserted between idle flushes when (re)populating the table
+INSERT_BATCH_SIZE = 500
 
 def auto_adjust_column_widths(file_table, columns):
     """Calculate and set optimal column widths based on content.
@@ -176,44 +179,37 @@ def update_table(file_table, apply_filter_func, file_count_var, columns):
     # Auto-adjust column widths after updating the table
     auto_adjust_column_widths(file_table, columns) 
 
-def apply_filter(file_table, filter_text, file_list, file_metadata_cache, get_audio_file, get_tag_value, updated_files, processed_files, file_count_var, columns):
-    """Filter table contents based on filter text.
+def insert_file_rows(file_table, file_paths, start_index, filter_text, file_metadata_cache, get_audio_file, get_tag_value, updated_files, processed_files):
+    """Append table rows for files that match the filter text.
     
     Args:
         file_table: The ttk.Treeview widget
+        file_paths: Files to add rows for, in display order
+        start_index: Position of the first file in the full file list (for row striping)
         filter_text: Text to filter by (lowercase)
-        file_list: List of files to display
         file_metadata_cache: Cache of file metadata
         get_audio_file: Function to get audio file object
         get_tag_value: Function to get tag value from audio file
         updated_files: Set of updated file paths
         processed_files: Set of processed file paths
-        file_count_var: StringVar for count display
-        columns: List of column names
+        
+    Returns:
+        int: Number of rows inserted
     """
-    # Clear the current table
-    file_table.delete(*file_table.get_children())
+    # Row tags ("updated"/"failed"/striping) are configured once by
+    # configure_table_tags, so each row only needs a single insert call
+    inserted = 0
     
-    # Repopulate with filtered items in the same order as file_list
-    for idx, file_path in enumerate(file_list):
+    for idx, file_path in enumerate(file_paths, start_index):
         # Skip files that no longer exist
         if not os.path.exists(file_path):
             continue
             
-        # Use cached metadata if available, otherwise read from file
+        # Use cached metadata if available, otherwise the persistent store or the file
         if file_path not in file_metadata_cache:
-            audio = get_audio_file(file_path)
-            if audio:
-                file_metadata_cache[file_path] = {
-                    "artist": get_tag_value(audio, "artist"),
-                    "title": get_tag_value(audio, "title"),
-                    "album": get_tag_value(audio, "album"),
-                    "albumartist": get_tag_value(audio, "albumartist"),
-                    "catalognumber": get_tag_value(audio, "catalognumber"),
-                    "date": get_tag_value(audio, "date"),
-                    "tracknumber": get_tag_value(audio, "tracknumber"),
-                    "genre": get_tag_value(audio, "genre")
-                }
+            metadata = read_file_metadata(file_path, CACHED_TAGS, get_audio_file, get_tag_value)
+            if metadata:
+                file_metadata_cache[file_path] = metadata
         
         metadata = file_metadata_cache.get(file_path)
         if metadata:
@@ -232,30 +228,55 @@ def apply_filter(file_table, filter_text, file_list, file_metadata_cache, get_au
             
             # Check if any value matches the filter (case-insensitive)
             if not filter_text or any(filter_text in str(value).lower() for value in data):
-                item = file_table.insert("", "end", values=data)
-                
-                # Apply alternating row colors
-                if idx % 2 == 0:
-                    file_table.item(item, tags=('evenrow',))
-                else:
-                    file_table.item(item, tags=('oddrow',))
-                
                 # Normalize the file path for comparison
                 normalized_path = os.path.normpath(file_path)
                 
-                # Apply appropriate tags based on file status
+                # Pick the row tag: file status wins over alternating row colors
                 if normalized_path in updated_files:
-                    file_table.tag_configure("updated", background=Config.COLORS["UPDATED_ROW"])
-                    file_table.item(item, tags=("updated",))
+                    tags = ("updated",)
                 elif normalized_path in processed_files:
-                    file_table.tag_configure("failed", background=Config.COLORS["FAILED_ROW"])
-                    file_table.item(item, tags=("failed",))
+                    tags = ("failed",)
+                else:
+                    tags = ('evenrow',) if idx % 2 == 0 else ('oddrow',)
+                
+                file_table.insert("", "end", values=data, tags=tags)
+                inserted += 1
+                
+                # Let Tk repaint between batches so large libraries don't freeze the window
+                if inserted % INSERT_BATCH_SIZE == 0:
+                    file_table.update_idletasks()
         else:
             # Only show error items if they match the filter or if there's no filter
             if not filter_text or "error" in filter_text.lower():
-                item = file_table.insert("", "end", values=["Error", "", "", "", "", "", "", "", ""])
-                file_table.tag_configure("failed", background=Config.COLORS["FAILED_ROW"])
-                file_table.item(item, tags=("failed",))
+                file_table.insert("", "end", values=["Error", "", "", "", "", "", "", "", ""], tags=("failed",))
+                inserted += 1
+    
+    return inserted
+
+def apply_filter(file_table, filter_text, file_list, file_metadata_cache, get_audio_file, get_tag_value, updated_files, processed_files, file_count_var, columns):
+    """Filter table contents based on filter text.
+    
+    Args:
+        file_table: The ttk.Treeview widget
+        filter_text: Text to filter by (lowercase)
+        file_list: List of files to display
+        file_metadata_cache: Cache of file metadata
+        get_audio_file: Function to get audio file object
+        get_tag_value: Function to get tag value from audio file
+        updated_files: Set of updated file paths
+        processed_files: Set of processed file paths
+        file_count_var: StringVar for count display
+        columns: List of column names
+    """
+    # Clear the current table
+    file_table.delete(*file_table.get_children())
+    
+    # Repopulate with filtered items in the same order as file_list
+    insert_file_rows(file_table, file_list, 0, filter_text, file_metadata_cache,
+                     get_audio_file, get_tag_value, updated_files, processed_files)
+    
+    # Persist any tags read from disk during this pass in one transaction
+    metadata_store.commit()
     
     # Update file count label
     selected_count = len(file_table.selection())